@@ -0,0 +1,9 @@
+from enum import Enum
+
+class AgentState(Enum):
+    """What an agent is doing; also picks its sprite."""
+    ACTIVE = 0
+    RESTING = 1
+    SLEEPING = 2
+    DEAD = 3
+    GREEDY = 4
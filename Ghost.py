@@ -1,25 +1,34 @@
-import random
+from AgentState import AgentState
 
 class Ghost:
+    __slots__ = ("id", "position_x", "position_y", "money", "captured", "state", "stamina", "known_loot_nodes")
+
     def __init__(self, ghost_id, position_x, position_y, money=0, captured=False, resting=False, stamina=100):
         self.id = ghost_id
         self.position_x = position_x
         self.position_y = position_y
         self.money = money
         self.captured = captured
-        self.resting = resting
+        self.state = AgentState.RESTING if resting else AgentState.ACTIVE
         self.stamina = stamina
 
+        # IDs of the nodes where this ghost has seen loot
+        self.known_loot_nodes = set()
+
+    @property
+    def resting(self):
+        return self.state is AgentState.RESTING
+
     def __repr__(self):
         return (f"Ghost(id={self.id}, x={self.position_x}, y={self.position_y}, "
                 f"money={self.money}, captured={self.captured}, "
-                f"resting={self.resting}, stamina={self.stamina})")
+                f"state={self.state.name}, stamina={self.stamina})")
 
     def rest(self):
-        self.resting = True
+        self.state = AgentState.RESTING
         self.stamina += self.stamina * 0.05
 
-    def captured(self):
+    def capture(self):
         self.captured = True
         self.stamina = 0
         self.money = 0
@@ -39,4 +48,4 @@ class Ghost:
             print("Not enough money to release.")
 
     def take_money(self, amount):
-        self.money += amount
\ No newline at end of file
+        self.money += amount
@@ -1,4 +1,8 @@
+from functools import lru_cache
+
 class Node:
+    __slots__ = ("id", "connections", "position_x", "position_y", "money", "ghosts", "sentinels")
+
     def __init__(self, node_id, connections=None, position_x=0, position_y=0, money=0, ghosts=None, sentinels=None):
         self.id = node_id
         self.connections = connections if connections is not None else []
@@ -19,4 +23,42 @@ class Connection:
         self.cost = cost
 
     def __repr__(self):
-        return (f"Connection(node_a={self.node_a}, node_b={self.node_b}, cost={self.cost})")
\ No newline at end of file
+        return (f"Connection(node_a={self.node_a}, node_b={self.node_b}, cost={self.cost})")
+
+@lru_cache(maxsize=None)
+def parse_node_id(node_id):
+    # node_id format: "x,y" -> (x, y); cached because ids are re-parsed every turn
+    x, y = node_id.split(',')
+    return int(x), int(y)
+
+class CompactNode(Node):
+    """
+    Thin view over one node of a CompactGraph. Money and connections live in the
+    graph arrays; only the agent lists are stored on the object.
+    """
+    __slots__ = ("graph", "index")
+
+    def __init__(self, graph, index, node_id, position_x=0, position_y=0, ghosts=None, sentinels=None):
+        self.graph = graph
+        self.index = index
+        self.id = node_id
+        self.position_x = position_x
+        self.position_y = position_y
+        self.ghosts = ghosts if ghosts is not None else []
+        self.sentinels = sentinels if sentinels is not None else []
+
+    @property
+    def connections(self):
+        # New Connection objects on every access, built from the CSR arrays:
+        # editing them does not change the graph (use Kore.set_edge_cost), and
+        # hot loops should walk graph.neighbors(index) instead
+        graph = self.graph
+        return [Connection(self.id, graph.ids[target], cost) for target, cost in graph.neighbors(self.index)]
+
+    @property
+    def money(self):
+        return self.graph.money[self.index]
+
+    @money.setter
+    def money(self, value):
+        self.graph.money[self.index] = value
@@ -1,26 +1,37 @@
+from AgentState import AgentState
+
 class Sentinel:
+    __slots__ = ("id", "position_x", "position_y", "money", "capturing", "state", "stamina",
+                 "visited_nodes", "unexplored_nodes")
+
     def __init__(self, sentinel_id, position_x, position_y, money=0, capturing=False, resting=False, stamina=100):
         self.id = sentinel_id
         self.position_x = position_x
         self.position_y = position_y
         self.money = money
         self.capturing = capturing
-        self.resting = resting
+        self.state = AgentState.RESTING if resting else AgentState.ACTIVE
         self.stamina = stamina
 
         # A set to store IDs of visited nodes of memory
         self.visited_nodes = set()
+        # node_id -> node for every node not visited yet, built on first perception
+        self.unexplored_nodes = None
+
+    @property
+    def resting(self):
+        return self.state is AgentState.RESTING
 
     def __repr__(self):
         return (f"Sentinel(id={self.id}, x={self.position_x}, y={self.position_y}, "
                 f"money={self.money}, capturing={self.capturing}, "
-                f"resting={self.resting}, stamina={self.stamina})")
+                f"state={self.state.name}, stamina={self.stamina})")
 
     def rest(self):
-        self.resting = True
+        self.state = AgentState.RESTING
         self.stamina += self.stamina * 0.05
 
-    def capturing(self):
+    def start_capture(self):
         self.capturing = True
 
     def move(self, dx, dy, cost):
@@ -31,5 +42,10 @@ class Sentinel:
         self.position_y = dy
         self.stamina -= cost
 
+    def visit(self, node_id):
+        self.visited_nodes.add(node_id)
+        if self.unexplored_nodes is not None:
+            self.unexplored_nodes.pop(node_id, None)
+
     def take_money(self, amount):
         self.money += amount
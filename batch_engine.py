@@ -0,0 +1,250 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only needed for BatchEngine
+    np = None
+
+from events import EventLog, NULL_LOG, INFO
+from Ghost import Ghost
+from path_cache import dijkstra
+from seeding import make_rng
+from simulation import game_over_message, winner_side
+
+class BatchEngine:
+    """
+    Plays whole phases as array operations over every ghost and sentinel at
+    once, for swarm-sized games. Agents live in NumPy arrays (node index of
+    kore.graph, stamina, money) and sync() writes them back to the Kore.
+
+    Rules follow ghost_turn and the command processors, with two differences
+    that make bulk updates possible: all agents of a phase decide from the
+    state at the start of the phase, and each sentinel captures on its node
+    or heads for the nearest ghost (else the nearest loot). When several
+    agents claim the same loot or capture, the first in grid order wins and
+    the others rest. Stuck ghosts escape with a random move drawn from rng,
+    so games match ghost_turn only in distribution. Only phase-level events
+    are logged.
+    """
+    def __init__(self, kore, max_turns=100, log=NULL_LOG, rng=None):
+        if np is None:
+            raise ImportError("BatchEngine requires NumPy")
+        self.kore = kore
+        # A null log of its own: step() stamps the turn on the log, and NULL_LOG is shared
+        self.log = EventLog() if log is NULL_LOG else log
+        self.rng = make_rng(rng)
+        self.max_turns = max_turns
+        self.turn = 1
+        self.winner = None
+
+        graph = kore.graph
+        self.graph = graph
+        size = len(graph)
+        nodes = [kore.nodes[index // graph.n][index % graph.n] for index in range(size)]
+        self.node_money = np.array([node.money for node in nodes], dtype=np.int64)
+        self.goal_col = len(kore.nodes[0]) - 1
+        self.goal_mask = np.arange(size) % graph.n == self.goal_col
+
+        # Goal field: next hop towards the goal column and the cost of that hop
+        dist, next_hop = kore.get_goal_field(self.goal_col)
+        self.goal_next, self.goal_step = self._step_field(dist, next_hop)
+
+        ghosts = [(g, node) for node in nodes for g in node.ghosts]
+        sentinels = [(s, node) for node in nodes for s in node.sentinels]
+        self.ghosts = [g for g, _ in ghosts]          # None for replicas made here
+        self.ghost_ids = [g.id for g, _ in ghosts]
+        self.ghost_pos = np.array([graph.index_of(node.id) for _, node in ghosts], dtype=np.int64)
+        self.ghost_stamina = np.array([g.stamina for g, _ in ghosts], dtype=np.int64)
+        self.ghost_money = np.array([g.money for g, _ in ghosts], dtype=np.int64)
+        self.sentinels = [s for s, _ in sentinels]
+        self.sentinel_pos = np.array([graph.index_of(node.id) for _, node in sentinels], dtype=np.int64)
+        self.sentinel_stamina = np.array([s.stamina for s, _ in sentinels], dtype=np.int64)
+        self.sentinel_money = np.array([s.money for s, _ in sentinels], dtype=np.int64)
+
+    @staticmethod
+    def _step_field(dist, next_hop):
+        # The cost of the hop u -> next[u] on a shortest-path tree is dist[u] - dist[next[u]]
+        dist = np.frombuffer(dist, dtype=np.float64)
+        next_hop = np.frombuffer(next_hop, dtype=np.int32).astype(np.int64)
+        has_next = next_hop >= 0
+        step = np.zeros(len(dist), dtype=np.int64)
+        step[has_next] = (dist[has_next] - dist[next_hop[has_next]]).astype(np.int64)
+        return next_hop, step
+
+    def _first_per_node(self, agents, positions):
+        # Keeps, among the selected agents, only the first one on each node
+        chosen = np.flatnonzero(agents)
+        _, first = np.unique(positions[chosen], return_index=True)
+        winners = np.zeros(len(agents), dtype=bool)
+        winners[chosen[first]] = True
+        return winners
+
+    @property
+    def finished(self):
+        return self.winner is not None
+
+    # --- Phases ---
+
+    def ghost_phase(self):
+        pos, money, stamina = self.ghost_pos, self.ghost_money, self.ghost_stamina
+        self.log.emit(INFO, "phase", phase="GHOST", agents=len(pos))
+
+        # Same priorities as ghost_turn: drop at the goal, replicate on turn 1,
+        # move towards the goal with loot, take loot underfoot, escape with a
+        # random affordable move when there is no next hop, rest
+        drop = self.goal_mask[pos] & (money > 0)
+        free = ~drop
+        replicate = free & (money > 1) if self.turn == 1 else np.zeros(len(pos), dtype=bool)
+        free &= ~replicate
+        next_hop = self.goal_next[pos]
+        step = self.goal_step[pos]
+        move = free & (money > 0) & (next_hop >= 0) & (stamina >= step)
+        free &= ~move
+        take = self._first_per_node(free & (self.node_money[pos] > 0), pos)
+        free &= ~take
+        escape_to, escape_cost = self._escape_moves(free & (next_hop < 0), pos, stamina)
+        escape = escape_to >= 0
+        rest = free & ~escape
+
+        taken = self.node_money[pos[take]]
+        self.node_money[pos[take]] = 0
+        money[take] += taken
+        np.add.at(self.node_money, pos[drop], money[drop])
+        money[drop] = 0
+        pos[move] = next_hop[move]
+        stamina[move] -= step[move]
+        pos[escape] = escape_to[escape]
+        stamina[escape] -= escape_cost[escape]
+        stamina[rest] = np.minimum(100, stamina[rest] + 10)
+
+        if replicate.any():
+            parents = np.flatnonzero(replicate)
+            replica_money = money[parents] - money[parents] // 2
+            money[parents] //= 2
+            self.ghosts.extend([None] * len(parents))
+            self.ghost_ids.extend(f"{self.ghost_ids[i]}_r{self.turn}" for i in parents)
+            self.ghost_pos = np.concatenate([pos, pos[parents]])
+            self.ghost_money = np.concatenate([money, replica_money])
+            self.ghost_stamina = np.concatenate([stamina, np.full(len(parents), 100, dtype=np.int64)])
+
+    def _escape_moves(self, stuck, pos, stamina):
+        # Random edge each stuck ghost can afford (ghost_turn's priority 5); -1 if none
+        graph, rng = self.graph, self.rng
+        target = np.full(len(pos), -1, dtype=np.int64)
+        cost = np.zeros(len(pos), dtype=np.int64)
+        for i in np.flatnonzero(stuck).tolist():
+            options = [(v, c) for v, c in graph.neighbors(int(pos[i])) if stamina[i] >= c]
+            if options:
+                target[i], cost[i] = rng.choice(options)
+        return target, cost
+
+    def sentinel_phase(self):
+        pos, stamina = self.sentinel_pos, self.sentinel_stamina
+        self.log.emit(INFO, "phase", phase="SENTINEL", agents=len(pos))
+        size = len(self.graph)
+
+        ghost_count = np.bincount(self.ghost_pos, minlength=size)
+        capture = self._first_per_node(ghost_count[pos] > 0, pos)
+        if capture.any():
+            loot = np.bincount(self.ghost_pos, weights=self.ghost_money, minlength=size).astype(np.int64)
+            self.sentinel_money[capture] += loot[pos[capture]]
+            captured = np.zeros(size, dtype=bool)
+            captured[pos[capture]] = True
+            self._remove_ghosts(captured[self.ghost_pos])
+
+        # One reverse search seeded with every target serves all sentinels
+        targets = np.flatnonzero(np.bincount(self.ghost_pos, minlength=size))
+        if not len(targets):
+            targets = np.flatnonzero(self.node_money > 0)
+        moving = ~capture
+        if len(targets):
+            cache = self.kore.get_path_cache()
+            if cache.reverse_graph is None:
+                cache.reverse_graph = self.graph.reverse()
+            next_hop, step = self._step_field(*dijkstra(cache.reverse_graph, targets.tolist()))
+            next_hop, step = next_hop[pos], step[pos]
+            move = moving & (next_hop >= 0) & (stamina >= step)
+            pos[move] = next_hop[move]
+            stamina[move] -= step[move]
+            moving &= ~move
+        stamina[moving] = np.minimum(100, stamina[moving] + 10)
+
+    def _remove_ghosts(self, removed):
+        for i in np.flatnonzero(removed):
+            if self.ghosts[i] is not None:
+                self.ghosts[i].captured = True
+                self.ghosts[i].money = 0
+        kept = ~removed
+        self.ghosts = [g for g, keep in zip(self.ghosts, kept) if keep]
+        self.ghost_ids = [g for g, keep in zip(self.ghost_ids, kept) if keep]
+        self.ghost_pos = self.ghost_pos[kept]
+        self.ghost_money = self.ghost_money[kept]
+        self.ghost_stamina = self.ghost_stamina[kept]
+
+    # --- Turn loop ---
+
+    def totals(self):
+        """(active ghosts, loot recovered by sentinels, loot secured at the goal)"""
+        return (len(self.ghost_pos), int(self.sentinel_money.sum()),
+                int(self.node_money[self.goal_mask].sum()))
+
+    def step(self):
+        if self.finished:
+            return self.winner
+        self.log.turn = self.turn
+        self.log.emit(INFO, "turn")
+        self.ghost_phase()
+        self.sentinel_phase()
+        self.winner = game_over_message(*self.totals(), self.turn, self.max_turns, self.log)
+        if self.winner:
+            self.log.emit(INFO, "game_over", winner=winner_side(self.winner), message=self.winner)
+        self.turn += 1
+        return self.winner
+
+    def run(self, max_turns=None):
+        played = 0
+        while not self.finished and (max_turns is None or played < max_turns):
+            self.step()
+            played += 1
+        return self.winner
+
+    def result(self):
+        """Same keys as Simulation.result()."""
+        active_ghosts, loot_recovered, loot_secured = self.totals()
+        return {
+            "winner": winner_side(self.winner),
+            "message": self.winner,
+            "turns": self.turn - 1,
+            "map": self.kore.fingerprint(),
+            "ghosts_left": active_ghosts,
+            "loot_recovered": loot_recovered,
+            "loot_secured": loot_secured,
+        }
+
+    def sync(self):
+        """
+        Writes agent positions, stamina, money and node money back to the
+        Kore, creating Ghost objects for replicas made by the engine.
+        """
+        kore, graph = self.kore, self.graph
+        nodes = [kore.nodes[index // graph.n][index % graph.n] for index in range(len(graph))]
+        for node, money in zip(nodes, self.node_money.tolist()):
+            node.ghosts = []
+            node.sentinels = []
+            node.money = money
+        for i, index in enumerate(self.ghost_pos.tolist()):
+            node = nodes[index]
+            ghost = self.ghosts[i]
+            if ghost is None:
+                ghost = self.ghosts[i] = Ghost(self.ghost_ids[i], node.position_x, node.position_y)
+            ghost.position_x, ghost.position_y = node.position_x, node.position_y
+            ghost.money = int(self.ghost_money[i])
+            ghost.stamina = int(self.ghost_stamina[i])
+            node.ghosts.append(ghost)
+        for i, index in enumerate(self.sentinel_pos.tolist()):
+            node = nodes[index]
+            sentinel = self.sentinels[i]
+            sentinel.position_x, sentinel.position_y = node.position_x, node.position_y
+            sentinel.money = int(self.sentinel_money[i])
+            sentinel.stamina = int(self.sentinel_stamina[i])
+            node.sentinels.append(sentinel)
+        kore.reindex_agents()
+        kore.reindex_money()
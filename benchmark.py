@@ -0,0 +1,354 @@
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+from kore import Kore
+from sentinel_method import a_star_search, sentinel_turn
+from ghost_method import a_star_search_for_ghost, ghost_turn
+from Ghost import Ghost
+from Sentinel import Sentinel
+from simulation import Simulation, check_game_over
+from parallel import ParallelDecider
+from batch_engine import BatchEngine, np
+from coordination import assign_targets
+from ghost_mcts import GhostModel, TreeNode, observe, search
+from hpa import hpa_search
+from search import kore_neighbors, path_cost
+
+# Grids (nodes per layer, layers); the big ones use the compact backend
+A_STAR_SIZES = [(15, 10), (100, 100), (500, 500)]
+COMPACT_FROM_NODES = 10000
+# (nodes per layer, layers, ghosts, sentinels) for the swarm benchmark
+SWARM_SIZES = [(100, 100, 1000, 100), (100, 100, 10000, 1000)]
+# (nodes per layer, layers, sentinels, ghosts) for the target assignment benchmark
+ASSIGNMENT_SIZES = [(15, 10, 10, 12), (50, 50, 100, 100), (50, 50, 200, 100)]
+# (nodes per layer, layers) for the MCTS rollout benchmark
+MCTS_SIZES = [(15, 10), (100, 100)]
+# (nodes per layer, layers) for HPA* against flat A*
+HPA_SIZES = [(100, 100), (300, 300)]
+# Regression suite: grids, and (ghosts, sentinels) placed on each
+SUITE_SIZES = [(15, 10), (100, 100)]
+SUITE_AGENTS = [(1, 1), (20, 20)]
+# A result is a regression when it is this much slower than its baseline
+REGRESSION_THRESHOLD = 0.25
+
+def build_kore(n, m, seed=0):
+    kore = Kore(n, m, compact=n * m >= COMPACT_FROM_NODES)
+    kore.create_connections(random.Random(seed))
+    return kore
+
+def bench_a_star(n, m, queries=5, seed=0):
+    """
+    Runs sentinel and ghost A* between random node pairs and reports node
+    expansions per second.
+    """
+    kore = build_kore(n, m, seed)
+    rng = random.Random(seed)
+    results = {}
+    for name in ("a_star_search", "a_star_search_for_ghost"):
+        stats = {"expanded": 0}
+        start = time.perf_counter()
+        for _ in range(queries):
+            start_node = kore.get_node_by_coords(rng.randrange(n), rng.randrange(m))
+            if name == "a_star_search":
+                goal_node = kore.get_node_by_coords(rng.randrange(n), rng.randrange(m))
+                a_star_search(kore, start_node, goal_node, stats)
+            else:
+                a_star_search_for_ghost(kore, start_node, n - 1, stats)
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "expanded": stats["expanded"],
+            "seconds": elapsed,
+            "expansions_per_second": stats["expanded"] / elapsed if elapsed else 0.0,
+        }
+    return results
+
+def swarm_kore(n, m, ghosts, sentinels, seed=0):
+    kore = build_kore(n, m, seed)
+    rng = random.Random(seed)
+    for i in range(ghosts):
+        node = kore.get_node_by_coords(0, rng.randrange(m))
+        kore.add_agent(Ghost(f"ghost_{i}", node.position_x, node.position_y, 1), node)
+    for i in range(sentinels):
+        node = kore.get_node_by_coords(n - 2, rng.randrange(m))
+        kore.add_agent(Sentinel(f"sentinel_{i}", node.position_x, node.position_y), node)
+    return kore
+
+def bench_swarm(n, m, ghosts, sentinels, turns=5, seed=0, engines=("simulation", "batch"), workers=None):
+    """
+    Plays a few turns with every ghost spawned on column 0 and reports agent
+    steps per second for the sequential Simulation, the NumPy BatchEngine
+    and, as "parallel", simultaneous moves decided by a pool of workers.
+    """
+    results = {}
+    for name in engines:
+        if name == "batch" and np is None:
+            continue
+        kore = swarm_kore(n, m, ghosts, sentinels, seed)
+        decider = ParallelDecider(workers) if name == "parallel" else None
+        if name == "batch":
+            engine = BatchEngine(kore, 10 ** 9, rng=seed)
+        else:
+            engine = Simulation(kore, max_turns=10 ** 9, seed=seed, decider=decider)
+        start = time.perf_counter()
+        engine.run(turns)
+        elapsed = time.perf_counter() - start
+        if decider is not None:
+            decider.close()
+        steps = (ghosts + sentinels) * turns
+        results[name] = {"steps": steps, "seconds": elapsed, "steps_per_second": steps / elapsed if elapsed else 0.0}
+    return results
+
+def bench_assignment(n, m, sentinels, ghosts, seed=0):
+    """
+    Times one cooperative assignment of sentinels to ghost nodes, split into
+    the cold call (Dijkstra trees built) and a warm call (trees cached).
+    """
+    kore = swarm_kore(n, m, 0, sentinels, seed)
+    rng = random.Random(seed)
+    starts = [kore.get_node_by_coords(rng.randrange(n), rng.randrange(m)) for _ in range(sentinels)]
+    targets = rng.sample([node for row in kore.nodes for node in row], ghosts)
+    results = {}
+    for name in ("cold", "warm"):
+        start = time.perf_counter()
+        assign_targets(kore, starts, targets)
+        results[name] = {"seconds": time.perf_counter() - start}
+    return results
+
+def bench_mcts(n, m, seconds=1.0, seed=0):
+    """
+    Rollouts per second of the ghost MCTS from a loaded ghost on column 0,
+    with a few sentinels chasing it.
+    """
+    kore = build_kore(n, m, seed)
+    rng = random.Random(seed)
+    node = kore.get_node_by_coords(0, m // 2)
+    ghost = Ghost("ghost", node.position_x, node.position_y, 50)
+    kore.add_agent(ghost, node)
+    for i in range(4):
+        sentinel_node = kore.get_node_by_coords(rng.randrange(2, min(n, 10)), rng.randrange(m))
+        kore.add_agent(Sentinel(f"sentinel_{i}", sentinel_node.position_x, sentinel_node.position_y), sentinel_node)
+    model = GhostModel(kore)
+    state = observe(kore, ghost, model)
+    root = TreeNode(state, model.actions(state), 0)
+    start = time.perf_counter()
+    rollouts = search(model, root, start + seconds, rng)
+    elapsed = time.perf_counter() - start
+    return {"rollouts": rollouts, "seconds": elapsed, "rollouts_per_second": rollouts / elapsed if elapsed else 0.0}
+
+def bench_hpa(n, m, queries=10, seed=0):
+    """
+    HPA* against flat A* between random node pairs: mean latency and path
+    cost over the optimum (from Dijkstra). HPA* is timed cold (in-cluster
+    searches run on first use) and warm (same queries again); building the
+    transitions and precomputing every cluster are timed apart.
+    """
+    kore = build_kore(n, m, seed)
+    rng = random.Random(seed)
+    pairs = [(kore.get_node_by_coords(rng.randrange(n), rng.randrange(m)),
+              kore.get_node_by_coords(rng.randrange(n), rng.randrange(m))) for _ in range(queries)]
+    graph, cache, neighbors = kore.graph, kore.get_path_cache(), kore_neighbors(kore)
+    optimum = [max(1, cache.tree_from(graph.index_of(a.id))[0][graph.index_of(b.id)]) for a, b in pairs]
+    start = time.perf_counter()
+    kore.get_hierarchy()
+    results = {"hierarchy_build": {"seconds": time.perf_counter() - start}}
+    for name, find in (("flat", a_star_search), ("hpa_cold", hpa_search), ("hpa_warm", hpa_search)):
+        start = time.perf_counter()
+        paths = [find(kore, a, b) for a, b in pairs]
+        elapsed = time.perf_counter() - start
+        ratios = [path_cost(path, neighbors) / best for path, best in zip(paths, optimum)]
+        results[name] = {
+            "seconds": elapsed,
+            "ms_per_query": elapsed / queries * 1000,
+            "mean_cost_ratio": sum(ratios) / queries,
+            "max_cost_ratio": max(ratios),
+        }
+    start = time.perf_counter()
+    kore.get_hierarchy().precompute()
+    results["hierarchy_precompute"] = {"seconds": time.perf_counter() - start}
+    return results
+
+# --- Regression suite ---
+
+def measure(func, repeat=5, min_seconds=0.02):
+    """
+    Seconds per call of func: the best of repeat rounds, each calling it
+    enough times to last at least min_seconds.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+def measure_turns(n, m, ghosts, sentinels, turns=10, repeat=5, seed=0):
+    # Seconds per headless turn, on a fresh game every round
+    best = float('inf')
+    for _ in range(repeat):
+        simulation = Simulation(swarm_kore(n, m, ghosts, sentinels, seed), max_turns=10 ** 9, seed=seed)
+        start = time.perf_counter()
+        played = 0
+        while played < turns and not simulation.finished:
+            simulation.step()
+            played += 1
+        best = min(best, (time.perf_counter() - start) / played)
+    return best
+
+def run_suite(sizes=SUITE_SIZES, agent_counts=SUITE_AGENTS, repeat=5, seed=0):
+    """
+    Times the engine and AI entry points on every grid size and agent count.
+    Returns {name: {"seconds": per call, "map": map fingerprint}}; names
+    read like "a_star_search/100x100" or "ghost_turn/100x100/20g20s".
+    """
+    results = {}
+
+    def record(name, fingerprint, func):
+        results[name] = {"seconds": measure(func, repeat), "map": fingerprint}
+
+    for n, m in sizes:
+        size = f"{n}x{m}"
+        compact = n * m >= COMPACT_FROM_NODES
+        kore = build_kore(n, m, seed)
+        fingerprint = kore.fingerprint()
+        rng = random.Random(seed)
+        record(f"kore_init/{size}", fingerprint, lambda: Kore(n, m, compact=compact))
+        record(f"kore_init+create_connections/{size}", fingerprint, lambda: build_kore(n, m, seed))
+
+        ids = itertools.cycle([f"{rng.randrange(n)},{rng.randrange(m)}" for _ in range(256)])
+        record(f"get_node_by_id/{size}", fingerprint, lambda: kore.get_node_by_id(next(ids)))
+        positions = itertools.cycle([(rng.randrange(n), rng.randrange(m)) for _ in range(256)])
+        record(f"get_node_by_position/{size}", fingerprint, lambda: kore.get_node_by_position(*next(positions)))
+
+        node = kore.get_node_by_coords(0, 0)
+        ghost = Ghost("bench_ghost", node.position_x, node.position_y)
+        kore.add_agent(ghost, node)
+        record(f"get_agent_by_id/{size}", fingerprint, lambda: kore.get_agent_by_id("bench_ghost"))
+        hops = itertools.cycle([("0,0", "1,0"), ("1,0", "0,0")])
+
+        def move():
+            ghost.stamina = 100
+            kore.move(*next(hops), "bench_ghost")
+        record(f"move/{size}", fingerprint, move)
+
+        pairs = itertools.cycle([(kore.get_node_by_coords(rng.randrange(n), rng.randrange(m)),
+                                  kore.get_node_by_coords(rng.randrange(n), rng.randrange(m))) for _ in range(8)])
+        record(f"a_star_search/{size}", fingerprint, lambda: a_star_search(kore, *next(pairs)))
+        starts = itertools.cycle([kore.get_node_by_coords(0, rng.randrange(m)) for _ in range(8)])
+        record(f"a_star_search_for_ghost/{size}", fingerprint,
+               lambda: a_star_search_for_ghost(kore, next(starts), n - 1))
+
+        for ghosts, sentinels in agent_counts:
+            agents = f"{size}/{ghosts}g{sentinels}s"
+            kore = swarm_kore(n, m, ghosts, sentinels, seed)
+            ghost_ids = itertools.cycle([f"ghost_{i}" for i in range(ghosts)])
+            sentinel_ids = itertools.cycle([f"sentinel_{i}" for i in range(sentinels)])
+            record(f"ghost_turn/{agents}", fingerprint, lambda: ghost_turn(next(ghost_ids), kore, 2, rng))
+            record(f"sentinel_turn/{agents}", fingerprint, lambda: sentinel_turn(next(sentinel_ids), kore))
+            record(f"check_game_over/{agents}", fingerprint, lambda: check_game_over(kore, 2))
+            results[f"turn/{agents}"] = {"seconds": measure_turns(n, m, ghosts, sentinels, repeat=repeat, seed=seed),
+                                         "map": fingerprint}
+    return results
+
+def environment():
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "system": platform.system()}
+
+def save_baseline(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+
+def load_baseline(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Regressions of results against a baseline dict (as saved by save_baseline):
+    (name, baseline seconds, seconds, ratio) for every benchmark more than
+    threshold slower. Benchmarks measured on a different map are skipped.
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        base = baseline["results"].get(name)
+        if base is None or base["map"] != result["map"] or not base["seconds"]:
+            continue
+        ratio = result["seconds"] / base["seconds"]
+        if ratio > 1 + threshold:
+            regressions.append((name, base["seconds"], result["seconds"], ratio))
+    return regressions
+
+def print_suite(results):
+    for name, result in results.items():
+        print(f"{name}: {result['seconds'] * 1e6:.1f} us")
+
+# --- Scaling report ---
+
+def report():
+    for n, m in A_STAR_SIZES:
+        for name, result in bench_a_star(n, m).items():
+            print(f"{n}x{m} {name}: {result['expanded']} expanded in {result['seconds']:.3f}s "
+                  f"({result['expansions_per_second']:.0f}/s)")
+    for n, m, ghosts, sentinels in SWARM_SIZES:
+        engines = ("simulation", "parallel", "batch") if ghosts <= 1000 else ("batch",)
+        for name, result in bench_swarm(n, m, ghosts, sentinels, engines=engines).items():
+            print(f"{n}x{m} {ghosts}g/{sentinels}s {name}: {result['steps']} agent steps in "
+                  f"{result['seconds']:.3f}s ({result['steps_per_second']:.0f}/s)")
+    for n, m, sentinels, ghosts in ASSIGNMENT_SIZES:
+        for name, result in bench_assignment(n, m, sentinels, ghosts).items():
+            print(f"{n}x{m} assign {sentinels} sentinels to {ghosts} ghost nodes ({name}): {result['seconds']:.3f}s")
+    for n, m in MCTS_SIZES:
+        result = bench_mcts(n, m)
+        print(f"{n}x{m} ghost MCTS: {result['rollouts']} rollouts in {result['seconds']:.3f}s "
+              f"({result['rollouts_per_second']:.0f}/s)")
+    for n, m in HPA_SIZES:
+        results = bench_hpa(n, m)
+        print(f"{n}x{m} HPA* transitions in {results.pop('hierarchy_build')['seconds']:.3f}s, "
+              f"every cluster precomputed in {results.pop('hierarchy_precompute')['seconds']:.3f}s")
+        for name, result in results.items():
+            print(f"{n}x{m} {name}: {result['ms_per_query']:.1f} ms/query, cost x{result['mean_cost_ratio']:.3f} "
+                  f"(worst x{result['max_cost_ratio']:.3f})")
+
+def main():
+    parser = argparse.ArgumentParser(description="GhostGrid benchmarks.")
+    parser.add_argument("--suite", action="store_true",
+                        help="run the regression suite instead of the scaling report")
+    parser.add_argument("--save", metavar="PATH", help="write the suite results as a JSON baseline")
+    parser.add_argument("--check", metavar="PATH", help="compare the suite against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="allowed slowdown before a result counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not (args.suite or args.save or args.check):
+        report()
+        return
+    results = run_suite(repeat=args.repeat)
+    print_suite(results)
+    if args.save:
+        save_baseline(results, args.save)
+    if args.check:
+        baseline = load_baseline(args.check)
+        if baseline.get("environment") != environment():
+            print("warning: baseline recorded on a different environment", baseline.get("environment"))
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {before * 1e6:.1f} us -> {after * 1e6:.1f} us (x{ratio:.2f})")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
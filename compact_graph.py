@@ -0,0 +1,161 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only needed for as_numpy()
+    np = None
+
+# Same order Kore.create_connections uses, so a seeded map is identical in both backends
+DIRECTIONS = [
+    (1, 0), (-1, 0),
+    (0, 1), (1, 1), (-1, 1),
+    (0, -1), (1, -1), (-1, -1)
+]
+
+class CompactGraph:
+    """
+    Integer-indexed graph of a Kore grid in CSR form.
+    Node index = layer * n + col. The outgoing edges of node i are
+    targets[offsets[i]:offsets[i + 1]] with the matching costs.
+    """
+    def __init__(self, n, m):
+        self.n = n
+        self.m = m
+        size = n * m
+        self.ids = [f"{index % n},{index // n}" for index in range(size)]
+        self.offsets = array('i', [0]) * (size + 1)
+        self.targets = array('i')
+        self.costs = array('H')
+        # Per-node dynamic state
+        self.money = array('l', [0]) * size
+        self.ghost_count = array('I', [0]) * size
+        self.sentinel_count = array('I', [0]) * size
+
+    def __len__(self):
+        return self.n * self.m
+
+    @classmethod
+    def random(cls, n, m, rng):
+        """
+        Builds the 8-neighbour layered grid with random costs 1-10, drawing
+        costs in the same order as Kore.create_connections.
+        """
+        graph = cls(n, m)
+        offsets, targets, costs = graph.offsets, graph.targets, graph.costs
+        for b in range(m):
+            for a in range(n):
+                for dx, dy in DIRECTIONS:
+                    na, nb = a + dx, b + dy
+                    if 0 <= na < n and 0 <= nb < m:
+                        targets.append(nb * n + na)
+                        costs.append(rng.randint(1, 10))
+                offsets[b * n + a + 1] = len(targets)
+        return graph
+
+    @classmethod
+    def from_kore(cls, kore):
+        """
+        Copies the topology and the current money/occupancy of a Kore.
+        """
+        graph = cls(kore.n, kore.m)
+        for b, row in enumerate(kore.nodes):
+            for a, node in enumerate(row):
+                for conn in node.connections:
+                    graph.targets.append(graph.index_of(conn.node_b))
+                    graph.costs.append(conn.cost)
+                graph.offsets[b * kore.n + a + 1] = len(graph.targets)
+        graph.sync_state(kore)
+        return graph
+
+    def sync_state(self, kore):
+        """
+        Refreshes money and occupancy arrays from the Kore nodes.
+        """
+        for b, row in enumerate(kore.nodes):
+            for a, node in enumerate(row):
+                index = b * self.n + a
+                self.money[index] = node.money
+                self.ghost_count[index] = len(node.ghosts)
+                self.sentinel_count[index] = len(node.sentinels)
+
+    # --- Index helpers ---
+
+    def index(self, col, layer):
+        return layer * self.n + col
+
+    def coords(self, index):
+        return index % self.n, index // self.n
+
+    def index_of(self, node_id):
+        x, y = node_id.split(',')
+        return int(y) * self.n + int(x)
+
+    # --- Edges ---
+
+    def neighbors(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return zip(self.targets[start:end], self.costs[start:end])
+
+    def edge_cost(self, a, b):
+        for i in range(self.offsets[a], self.offsets[a + 1]):
+            if self.targets[i] == b:
+                return self.costs[i]
+        return None
+
+    def set_edge_cost(self, a, b, cost):
+        for i in range(self.offsets[a], self.offsets[a + 1]):
+            if self.targets[i] == b:
+                self.costs[i] = cost
+                return True
+        return False
+
+    def num_edges(self):
+        return len(self.targets)
+
+    def reverse(self):
+        """
+        Returns the transposed graph (edge b -> a for every a -> b), used by
+        searches that run backwards from a goal. Dynamic state arrays are shared.
+        """
+        size = len(self)
+        counts = [0] * (size + 1)
+        for target in self.targets:
+            counts[target + 1] += 1
+        for i in range(size):
+            counts[i + 1] += counts[i]
+        rev = CompactGraph.__new__(CompactGraph)
+        rev.n, rev.m, rev.ids = self.n, self.m, self.ids
+        rev.money, rev.ghost_count, rev.sentinel_count = self.money, self.ghost_count, self.sentinel_count
+        rev.offsets = array('i', counts)
+        rev.targets = array('i', [0]) * len(self.targets)
+        rev.costs = array('H', [0]) * len(self.costs)
+        fill = counts[:size]
+        for source in range(size):
+            for i in range(self.offsets[source], self.offsets[source + 1]):
+                target = self.targets[i]
+                slot = fill[target]
+                rev.targets[slot] = source
+                rev.costs[slot] = self.costs[i]
+                fill[target] += 1
+        return rev
+
+    # --- Export ---
+
+    def as_numpy(self):
+        """
+        Zero-copy NumPy views of the arrays, for vectorized algorithms.
+        """
+        if np is None:
+            raise ImportError("as_numpy() requires NumPy")
+        return {
+            "offsets": np.frombuffer(self.offsets, dtype=np.int32),
+            "targets": np.frombuffer(self.targets, dtype=np.int32),
+            "costs": np.frombuffer(self.costs, dtype=np.uint16),
+            "money": np.frombuffer(self.money, dtype=np.dtype(f"i{self.money.itemsize}")),
+            "ghost_count": np.frombuffer(self.ghost_count, dtype=np.uint32),
+            "sentinel_count": np.frombuffer(self.sentinel_count, dtype=np.uint32),
+        }
+
+    def memory_bytes(self):
+        arrays = (self.offsets, self.targets, self.costs, self.money, self.ghost_count, self.sentinel_count)
+        return sum(a.itemsize * len(a) for a in arrays)
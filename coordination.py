@@ -0,0 +1,128 @@
+from path_cache import INF
+
+# Stand-in cost for unreachable pairs, so the matching stays finite
+UNREACHABLE = 10 ** 9
+
+def hungarian(cost):
+    """
+    Minimum-cost assignment on a rectangular cost matrix (list of rows), with
+    the potentials form of the Hungarian algorithm in O(rows^2 * cols).
+    Returns the column of every row, or -1 for rows left over when there are
+    more rows than columns.
+    """
+    rows = len(cost)
+    if not rows:
+        return []
+    cols = len(cost[0])
+    if rows > cols:
+        # Every column gets a row; solve the transposed problem
+        assignment = [-1] * rows
+        for col, row in enumerate(hungarian([list(column) for column in zip(*cost)])):
+            assignment[row] = col
+        return assignment
+
+    u = [0] * (rows + 1)
+    v = [0] * (cols + 1)
+    owner = [0] * (cols + 1)   # row (1-based) matched to each column, 0 if free
+    way = [0] * (cols + 1)
+    for i in range(1, rows + 1):
+        owner[0] = i
+        j0 = 0
+        minv = [INF] * (cols + 1)
+        used = [False] * (cols + 1)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            row = cost[i0 - 1]
+            ui0 = u[i0]
+            delta = INF
+            j1 = 0
+            for j in range(1, cols + 1):
+                if not used[j]:
+                    reduced = row[j - 1] - ui0 - v[j]
+                    if reduced < minv[j]:
+                        minv[j] = reduced
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(cols + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    assignment = [-1] * rows
+    for j in range(1, cols + 1):
+        if owner[j]:
+            assignment[owner[j] - 1] = j - 1
+    return assignment
+
+def cost_matrix(kore, start_nodes, target_nodes, deadline=None):
+    """
+    Path cost from every start node to every target. Runs one Dijkstra per
+    distinct node on the smaller side (forward from starts or reverse from
+    targets), taken from and kept in the Kore distance cache. Under a
+    deadline, a tree that is not cached is only built while the time left
+    exceeds what the last build took; the other rows or columns get the
+    Chebyshev distance as an estimate instead.
+    """
+    cache = kore.get_path_cache()
+    graph = kore.graph
+    starts = [graph.index_of(node.id) for node in start_nodes]
+    targets = [graph.index_of(node.id) for node in target_nodes]
+    matrix = [[UNREACHABLE] * len(targets) for _ in starts]
+    if len(set(starts)) <= len(set(targets)):
+        for r, start in enumerate(starts):
+            if deadline is not None and start not in cache.from_trees and not fits(cache, deadline):
+                matrix[r] = [estimate(graph, start, t) for t in targets]
+                continue
+            dist = cache.tree_from(start)[0]
+            matrix[r] = [UNREACHABLE if dist[t] == INF else dist[t] for t in targets]
+    else:
+        for c, target in enumerate(targets):
+            if deadline is not None and target not in cache.to_trees and not fits(cache, deadline):
+                for r, start in enumerate(starts):
+                    matrix[r][c] = estimate(graph, start, target)
+                continue
+            dist = cache.tree_to(target)[0]
+            for r, start in enumerate(starts):
+                if dist[start] != INF:
+                    matrix[r][c] = dist[start]
+    return matrix
+
+def fits(cache, deadline):
+    return deadline.remaining_ms() > cache.last_build_ms
+
+def estimate(graph, a, b):
+    # Every move covers at most one step per axis and costs at least 1
+    (ax, ay), (bx, by) = graph.coords(a), graph.coords(b)
+    return max(abs(ax - bx), abs(ay - by))
+
+def assign_targets(kore, start_nodes, target_nodes, deadline=None):
+    """
+    Cooperative targets for a group of sentinels: the assignment of sentinels
+    to target nodes with the least total path cost. When there are more
+    sentinels than targets, the ones left over chase their closest target.
+    Returns one target node per start node, or None if there are no targets.
+    The deadline bounds the path searches behind the costs (see cost_matrix).
+    """
+    if not target_nodes:
+        return [None] * len(start_nodes)
+    matrix = cost_matrix(kore, start_nodes, target_nodes, deadline)
+    assignment = hungarian(matrix)
+    targets = []
+    for row, col in zip(matrix, assignment):
+        if col < 0:
+            col = min(range(len(row)), key=row.__getitem__)
+        targets.append(target_nodes[col])
+    return targets
@@ -0,0 +1,61 @@
+import time
+
+class Deadline:
+    """
+    Wall-clock instant (perf_counter seconds) by which an answer is due,
+    budget_ms from now and never later than the parent's. A budget of None
+    never expires on its own.
+    """
+    __slots__ = ("start", "at")
+
+    def __init__(self, budget_ms=None, parent=None):
+        self.start = time.perf_counter()
+        self.at = float('inf') if budget_ms is None else self.start + budget_ms / 1000.0
+        if parent is not None and parent.at < self.at:
+            self.at = parent.at
+
+    def child(self, budget_ms=None):
+        return Deadline(budget_ms, self)
+
+    def expired(self):
+        return time.perf_counter() >= self.at
+
+    def remaining_ms(self):
+        return max(0.0, (self.at - time.perf_counter()) * 1000.0)
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.start) * 1000.0
+
+class DeadlineMetrics:
+    """
+    Time spent against deadlines, per kind of decision ("ghost", "sentinel",
+    "assignment", phases...): how many were taken, how many finished late
+    and by how much.
+    """
+    def __init__(self):
+        self.kinds = {}
+
+    def record(self, kind, deadline):
+        """Books a finished decision. Returns how late it was in ms (0 if on time)."""
+        now = time.perf_counter()
+        overrun_ms = max(0.0, (now - deadline.at) * 1000.0)
+        stats = self.kinds.get(kind)
+        if stats is None:
+            stats = self.kinds[kind] = {"decisions": 0, "overruns": 0, "total_ms": 0.0,
+                                        "max_ms": 0.0, "max_overrun_ms": 0.0}
+        elapsed_ms = (now - deadline.start) * 1000.0
+        stats["decisions"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        if overrun_ms > 0:
+            stats["overruns"] += 1
+            stats["max_overrun_ms"] = max(stats["max_overrun_ms"], overrun_ms)
+        return overrun_ms
+
+    @property
+    def overruns(self):
+        return sum(stats["overruns"] for stats in self.kinds.values())
+
+    def summary(self):
+        return {kind: dict(stats, mean_ms=stats["total_ms"] / stats["decisions"])
+                for kind, stats in self.kinds.items()}
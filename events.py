@@ -0,0 +1,114 @@
+import json
+from collections import deque
+
+# Event levels
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100
+
+# Human-readable lines for ConsoleSink, keyed by event kind
+CONSOLE_TEMPLATES = {
+    "turn": "\n===== INICIO DEL TURNO {turn} =====",
+    "phase": "--- FASE {phase} --- ({agents} activos)",
+    "decision": "  - {agent_type} '{agent}' decide: {command}",
+    "spawn": "-> {agent_type} '{agent}' añadido en el nodo {node} (Capa {layer})",
+    "move": "Moved {agent} from {origin} to {dest}: {moved}",
+    "rest": "{agent} rested. Stamina: {stamina}",
+    "drop": "{agent} dropped {amount} money.",
+    "take": "{agent} took {amount} money.",
+    "replicate": "      -> ¡ACCIÓN! {agent} se ha replicado en {replica} en el nodo {node}.",
+    "capture": "{agent} captured {ghost} at {node}.",
+    "invalid": "{reason}",
+    "overrun": "{what} {agent} overran its deadline by {ms} ms",
+    "turn_limit": "FIN DEL JUEGO POR LÍMITE DE TURNOS ({max_turns}).",
+    "game_over": "\n########################################\n{message}\n########################################",
+}
+
+class EventLog:
+    """
+    Structured game events fanned out to sinks. Events below the level are
+    dropped before anything is built; callers on hot paths guard with
+    enabled() so a disabled log costs one comparison.
+    """
+    def __init__(self, sinks=(), level=INFO):
+        self.sinks = list(sinks)
+        self.level = level if self.sinks else OFF
+        self.turn = 0
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def emit(self, level, kind, **fields):
+        if level < self.level:
+            return
+        event = {"turn": self.turn, "level": level, "kind": kind}
+        event.update(fields)
+        for sink in self.sinks:
+            sink.write(event)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+class ConsoleSink:
+    """Prints events the way the turn loop used to."""
+    def write(self, event):
+        template = CONSOLE_TEMPLATES.get(event["kind"])
+        print(template.format(**event) if template else event)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class JsonlSink:
+    """
+    Appends events as JSON lines, written in batches of batch_size.
+    """
+    def __init__(self, path, batch_size=1000):
+        self.file = open(path, "a", encoding="utf-8")
+        self.batch_size = batch_size
+        self.buffer = []
+
+    def write(self, event):
+        self.buffer.append(event)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in self.buffer))
+            self.buffer = []
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+class RingBufferSink:
+    """Keeps the last capacity events in memory."""
+    def __init__(self, capacity=10000):
+        self.events = deque(maxlen=capacity)
+
+    def write(self, event):
+        self.events.append(event)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+def read_events(path):
+    """Loads a JsonlSink file back into a list of event dicts."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+# Shared silent log, the default for the engine
+NULL_LOG = EventLog()
@@ -0,0 +1,316 @@
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from seeding import make_rng
+from ghost_method import get_move_command, ghost_turn
+
+# Non-move actions; moves are indexes into the node's neighbour list
+REST = -1
+TAKE = -2
+DROP = -3
+
+HORIZON = 20            # turns simulated past the root
+EXPLORATION = 1.0       # UCT exploration constant, rewards are in [0, 1]
+CARRIED_WEIGHT = 0.5    # value of loot still carried when a rollout ends
+SENTINEL_RADIUS = 12    # sentinels farther away (Chebyshev) are left out of the model
+
+class GhostModel:
+    """
+    Static data the lookahead needs about one map: neighbour lists, node
+    coordinates and the goal field (next hop and its cost towards the goal column).
+    """
+    def __init__(self, kore):
+        graph = kore.graph
+        self.ids = graph.ids
+        self.coords = [graph.coords(index) for index in range(len(graph))]
+        self.neighbors = [list(graph.neighbors(index)) for index in range(len(graph))]
+        self.goal_col = len(kore.nodes[0]) - 1
+        dist, next_hop = kore.get_goal_field(self.goal_col)
+        self.goal_next = list(next_hop)
+        self.goal_step = [dist[i] - dist[j] if j >= 0 else 0 for i, j in enumerate(self.goal_next)]
+
+    def chebyshev(self, a, b):
+        (ax, ay), (bx, by) = self.coords[a], self.coords[b]
+        return max(abs(ax - bx), abs(ay - by))
+
+    # --- Transition model ---
+
+    def actions(self, state):
+        if state.captured:
+            return []
+        actions = [i for i, (_, cost) in enumerate(self.neighbors[state.pos]) if state.stamina >= cost]
+        actions.append(REST)
+        if state.loot.get(state.pos, 0) > 0:
+            actions.append(TAKE)
+        if state.money > 0 and self.coords[state.pos][0] == self.goal_col:
+            actions.append(DROP)
+        return actions
+
+    def apply(self, state, action):
+        """
+        Next state after the ghost plays action and every chasing sentinel
+        takes one greedy step towards it (sentinels move after ghosts). The
+        ghost is caught on a chaser's node or on a guarded one.
+        """
+        pos, stamina, money, secured, loot = state.pos, state.stamina, state.money, state.secured, state.loot
+        if action >= 0:
+            pos, cost = self.neighbors[pos][action]
+            stamina -= cost
+        elif action == REST:
+            stamina = min(100, stamina + 10)
+        elif action == TAKE:
+            money += loot[pos]
+            loot = dict(loot)
+            del loot[pos]
+        elif action == DROP:
+            secured += money
+            money = 0
+        sentinels = tuple(self.chase(s, pos) for s in state.sentinels)
+        captured = pos in sentinels or pos in state.guarded
+        return GhostState(pos, stamina, money, secured, sentinels, state.guarded, state.stake, loot, captured)
+
+    def chase(self, sentinel, target):
+        # One step to the neighbour closest to the target, ignoring stamina
+        best, best_distance = sentinel, self.chebyshev(sentinel, target)
+        for neighbor, _ in self.neighbors[sentinel]:
+            distance = self.chebyshev(neighbor, target)
+            if distance < best_distance:
+                best, best_distance = neighbor, distance
+        return best
+
+    def reward(self, state):
+        # Share of the stake (loot carried or in reach at the root) kept
+        carried = 0 if state.captured else state.money * CARRIED_WEIGHT
+        return min(1.0, (state.secured + carried) / state.stake)
+
+    def rollout_action(self, state, rng):
+        # Cheap version of ghost_turn's priorities
+        pos = state.pos
+        if state.money > 0 and self.coords[pos][0] == self.goal_col:
+            return DROP
+        if state.money > 0:
+            next_hop = self.goal_next[pos]
+            if next_hop >= 0 and state.stamina >= self.goal_step[pos]:
+                return next(i for i, (target, _) in enumerate(self.neighbors[pos]) if target == next_hop)
+        if state.loot.get(pos, 0) > 0:
+            return TAKE
+        actions = self.actions(state)
+        return rng.choice(actions)
+
+class GhostState:
+    """
+    What the lookahead tracks for one ghost: its node, stamina and money, the
+    loot it has secured, the sentinels chasing it, the nodes other sentinels
+    hold, and the loot left on nodes.
+    """
+    __slots__ = ("pos", "stamina", "money", "secured", "sentinels", "guarded", "stake", "loot", "captured")
+
+    def __init__(self, pos, stamina, money, secured, sentinels, guarded, stake, loot, captured=False):
+        self.pos = pos
+        self.stamina = stamina
+        self.money = money
+        self.secured = secured
+        self.sentinels = sentinels
+        self.guarded = guarded
+        self.stake = stake
+        self.loot = loot
+        self.captured = captured
+
+    def key(self):
+        return self.pos, self.stamina, self.money, self.sentinels, self.guarded
+
+def observe(kore, ghost, model):
+    """
+    The GhostState of a live ghost. Nearby sentinels whose closest ghost node
+    is this ghost's chase it; the others are taken to hold their node.
+    """
+    graph = kore.graph
+    node = kore.get_agent_node(ghost.id)
+    pos = graph.index_of(node.id)
+    chasers, guarded = [], []
+    for agent, sentinel_node in kore.agent_index.values():
+        if agent in sentinel_node.sentinels:
+            index = graph.index_of(sentinel_node.id)
+            if model.chebyshev(index, pos) > SENTINEL_RADIUS:
+                continue
+            if kore.ghost_index.nearest(*model.coords[index]) == node.id:
+                chasers.append(index)
+            else:
+                guarded.append(index)
+    loot = {graph.index_of(node_id): n.money for node_id, n in kore.money_nodes.items()}
+    stake = max(1, ghost.money + max(loot.values(), default=0))
+    return GhostState(pos, ghost.stamina, ghost.money, 0, tuple(sorted(chasers)), frozenset(guarded), stake, loot)
+
+# --- Search ---
+
+class TreeNode:
+    __slots__ = ("state", "children", "untried", "visits", "value", "depth")
+
+    def __init__(self, state, actions, depth):
+        self.state = state
+        self.children = {}
+        self.untried = actions
+        self.visits = 0
+        self.value = 0.0
+        self.depth = depth
+
+def search(model, root, deadline, rng, max_iterations=None):
+    """
+    Runs UCT iterations from root until the deadline (perf_counter seconds),
+    or until every root action is known to end in a capture. Returns the
+    number of rollouts played.
+    """
+    rollouts = 0
+    log = math.log
+    while time.perf_counter() < deadline and (max_iterations is None or rollouts < max_iterations):
+        if not root.untried and all(child.state.captured for child in root.children.values()):
+            break
+        node = root
+        path = [node]
+        # Selection
+        while not node.untried and node.children and node.depth < HORIZON:
+            scale = EXPLORATION * math.sqrt(log(node.visits))
+            node = max(node.children.values(),
+                       key=lambda child: child.value / child.visits + scale / math.sqrt(child.visits))
+            path.append(node)
+        # Expansion
+        if node.untried and node.depth < HORIZON:
+            action = node.untried.pop(rng.randrange(len(node.untried)))
+            state = model.apply(node.state, action)
+            child = TreeNode(state, model.actions(state), node.depth + 1)
+            node.children[action] = child
+            node = child
+            path.append(node)
+        # Rollout
+        state = node.state
+        for _ in range(HORIZON - node.depth):
+            if state.captured:
+                break
+            state = model.apply(state, model.rollout_action(state, rng))
+        reward = model.reward(state)
+        for visited in path:
+            visited.visits += 1
+            visited.value += reward
+        rollouts += 1
+    return rollouts
+
+def root_statistics(root):
+    return {action: (child.visits, child.value) for action, child in root.children.items()}
+
+# Root parallelism: every worker keeps the model it was started with
+_worker_model = None
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+def _search_worker(state, budget_ms, seed):
+    model = _worker_model
+    root = TreeNode(state, model.actions(state), 0)
+    rollouts = search(model, root, time.perf_counter() + budget_ms / 1000.0, make_rng(seed))
+    return root_statistics(root), rollouts
+
+class MCTSPlanner:
+    """
+    Ghost policy with the same signature as ghost_turn, choosing moves by
+    Monte Carlo Tree Search within budget_ms per ghost. Sentinels are modelled
+    as greedy chasers. Each ghost's subtree is kept and reused next turn when
+    the observed state matches the one predicted. With workers > 1 the search
+    is root-parallel over a process pool (trees are then not reused).
+    Replication on turn 1 follows ghost_turn, since the model has no replicas.
+    A deadline from the engine cuts the search short of budget_ms.
+    """
+    def __init__(self, budget_ms=50, workers=1, seed=None):
+        self.budget_ms = budget_ms
+        self.workers = workers
+        self.rng = make_rng(seed)
+        self.model = None
+        self.fingerprint = None
+        self.executor = None
+        self.trees = {}
+        self.rollouts = 0
+        self.seconds = 0.0
+
+    def model_for(self, kore):
+        fingerprint = kore.fingerprint()
+        if fingerprint != self.fingerprint:
+            self.model = GhostModel(kore)
+            self.fingerprint = fingerprint
+            self.trees.clear()
+            self.close()
+        return self.model
+
+    def __call__(self, ghost_id, kore, current_turn=1, rng=None, deadline=None):
+        ghost = kore.get_agent_by_id(ghost_id)
+        if not ghost or (current_turn == 1 and ghost.money > 1):
+            return ghost_turn(ghost_id, kore, current_turn, rng, deadline)
+        model = self.model_for(kore)
+        state = observe(kore, ghost, model)
+        actions = model.actions(state)
+        if not actions:
+            return "rest"
+
+        start = time.perf_counter()
+        budget_ms = self.budget_ms if deadline is None else min(self.budget_ms, deadline.remaining_ms())
+        if self.workers > 1:
+            statistics = self.parallel_search(model, state, budget_ms)
+        else:
+            root = self.trees.get(ghost_id)
+            if root is None or root.state.key() != state.key():
+                root = TreeNode(state, actions, 0)
+            else:
+                root.state = state
+            self.rollouts += search(model, root, start + budget_ms / 1000.0, self.rng)
+            statistics = root_statistics(root)
+        self.seconds += time.perf_counter() - start
+
+        action = max(statistics, key=lambda a: (statistics[a][0], statistics[a][1]), default=None)
+        if action is None or statistics[action][1] <= 0:
+            # No line keeps any loot: the lookahead has nothing to say
+            self.trees.pop(ghost_id, None)
+            return ghost_turn(ghost_id, kore, current_turn, rng, deadline)
+        if self.workers <= 1:
+            self.trees[ghost_id] = self._rebase(root.children[action])
+        return self.command(model, state, action, kore)
+
+    @staticmethod
+    def _rebase(node):
+        # The chosen child becomes next turn's root; depths shift by one
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            current.depth -= 1
+            stack.extend(current.children.values())
+        return node
+
+    def parallel_search(self, model, state, budget_ms):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(model,))
+        seeds = [self.rng.randrange(2 ** 31) for _ in range(self.workers)]
+        futures = [self.executor.submit(_search_worker, state, budget_ms, seed) for seed in seeds]
+        merged = {}
+        for future in futures:
+            statistics, rollouts = future.result()
+            self.rollouts += rollouts
+            for action, (visits, value) in statistics.items():
+                total = merged.get(action, (0, 0.0))
+                merged[action] = (total[0] + visits, total[1] + value)
+        return merged
+
+    def command(self, model, state, action, kore):
+        if action == REST:
+            return "rest"
+        if action == TAKE:
+            return f"take-{state.loot[state.pos]}"
+        if action == DROP:
+            return f"drop-{state.money}"
+        target, _ = model.neighbors[state.pos][action]
+        return get_move_command(kore.get_node_by_id(model.ids[state.pos]), model.ids[target])
+
+    def rollouts_per_second(self):
+        return self.rollouts / self.seconds if self.seconds else 0.0
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
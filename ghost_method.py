@@ -1,6 +1,6 @@
-import heapq
-import math
-import random
+from Node import parse_node_id
+from seeding import make_rng
+from search import a_star, anytime_a_star, kore_neighbors
 
 # --- Perception Functions ---
 
@@ -11,9 +11,6 @@ def perceive_world_for_ghost(ghost_id, kore):
 
     current_node = kore.get_node_by_position(ghost_agent.position_x, ghost_agent.position_y)
 
-    if not hasattr(ghost_agent, "known_loot_nodes"):
-        ghost_agent.known_loot_nodes = set()
-
     if current_node.money > 0 and current_node.id not in ghost_agent.known_loot_nodes:
         ghost_agent.known_loot_nodes.add(current_node.id)
 
@@ -32,52 +29,49 @@ def perceive_world_for_ghost(ghost_id, kore):
 # --- A* Pathfinding Algorithm (Corrected) ---
 
 def ghost_heuristic(node_a, goal_layer_index, kore):
-    x1, y1 = map(int, node_a.id.split(','))
-    distance_to_goal_layer = abs(goal_layer_index - x1)
-    return distance_to_goal_layer + (y1 * 0.1)
-
-def a_star_search_for_ghost(kore, start_node, goal_layer_index):
-    open_set = []
-    initial_heuristic = ghost_heuristic(start_node, goal_layer_index, kore)
-    heapq.heappush(open_set, (initial_heuristic, start_node.id))
-
-    came_from = {}
-    g_score = {node.id: float('inf') for row in kore.nodes for node in row}
-    g_score[start_node.id] = 0
-
-    while open_set:
-        _, current_id = heapq.heappop(open_set)
-        current_node = kore.get_node_by_id(current_id)
-
-        if current_node.position_x == goal_layer_index:
-            return reconstruct_path(came_from, current_id)
-
-        for conn in current_node.connections:
-            neighbor_id = conn.node_b
-            neighbor_node = kore.get_node_by_id(neighbor_id)
-            if not neighbor_node:
-                continue
-
-            tentative_g_score = g_score[current_id] + conn.cost
-            if tentative_g_score < g_score.get(neighbor_id, float('inf')):
-                came_from[neighbor_id] = current_id  # <- corregido
-                g_score[neighbor_id] = tentative_g_score
-                f_score = tentative_g_score + ghost_heuristic(neighbor_node, goal_layer_index, kore)
-                heapq.heappush(open_set, (f_score, neighbor_id))
-    return None
-
-def reconstruct_path(came_from, current_id):
-    total_path = [current_id]
-    while current_id in came_from:
-        current_id = came_from[current_id]
-        total_path.insert(0, current_id)
-    return total_path
+    # Every move changes the column by at most one and costs at least 1,
+    # so the column distance never overestimates (admissible and consistent)
+    x1, y1 = parse_node_id(node_a.id)
+    return abs(goal_layer_index - x1)
+
+def a_star_search_for_ghost(kore, start_node, goal_layer_index, stats=None, deadline=None):
+    search = a_star if deadline is None else anytime_a_star
+    return search(start_node.id,
+                  lambda node_id: parse_node_id(node_id)[0] == goal_layer_index,
+                  kore_neighbors(kore),
+                  lambda node_id: ghost_heuristic(kore.get_node_by_id(node_id), goal_layer_index, kore),
+                  deadline=deadline, stats=stats)
+
+def next_step_to_goal(kore, current_node, goal_layer_index, deadline=None):
+    """
+    Returns (next_node_id, cost) on the cheapest route to the goal layer, or
+    (None, None) if the ghost is already there or cannot reach it. Reads the
+    precomputed goal field when the map has one and runs A* otherwise. Under
+    a deadline the field is only read once built; until then anytime A* answers.
+    """
+    get_goal_field = getattr(kore, "get_goal_field", None)
+    if deadline is not None and get_goal_field and not kore.has_goal_field(goal_layer_index):
+        get_goal_field = None
+    field = get_goal_field(goal_layer_index) if get_goal_field else None
+    if field is None:
+        path = a_star_search_for_ghost(kore, current_node, goal_layer_index, deadline=deadline)
+        if not path or len(path) <= 1:
+            return None, None
+        cost = next((conn.cost for conn in current_node.connections if conn.node_b == path[1]), None)
+        return path[1], cost
+
+    graph = kore.graph
+    current = graph.index_of(current_node.id)
+    next_index = field[1][current]
+    if next_index < 0:
+        return None, None
+    return graph.ids[next_index], graph.edge_cost(current, next_index)
 
 # --- Move Decision ---
 
 def get_move_command(current_node, next_node_id):
-    cx, cy = map(int, current_node.id.split(','))
-    nx, ny = map(int, next_node_id.split(','))
+    cx, cy = parse_node_id(current_node.id)
+    nx, ny = parse_node_id(next_node_id)
 
     h_move = nx - cx
     v_move = ny - cy
@@ -91,10 +85,11 @@ def get_move_command(current_node, next_node_id):
 
 # --- Ghost Turn Logic ---
 
-def ghost_turn(ghost_id, kore, current_turn=1):
+def ghost_turn(ghost_id, kore, current_turn=1, rng=None, deadline=None):
     """
     Lógica de decisión mejorada para un agente Ghost, con un comportamiento más
-    estratégico y alineado con las reglas del proyecto.
+    estratégico y alineado con las reglas del proyecto. La búsqueda de ruta
+    respeta el deadline (ver next_step_to_goal).
     """
     # 1. PERCEPCIÓN
     ghost, current_node, visible_loot, target_layer = perceive_world_for_ghost(ghost_id, kore)
@@ -105,7 +100,8 @@ def ghost_turn(ghost_id, kore, current_turn=1):
 
     # PRIORIDAD 1: CONDICIÓN DE VICTORIA
     # Si el Ghost está en la capa final y tiene botín, su única prioridad es depositarlo.
-    if current_node.position_x == target_layer and ghost.money > 0:
+    current_layer = parse_node_id(current_node.id)[0]
+    if current_layer == target_layer and ghost.money > 0:
         return f"drop-{ghost.money}"
 
     # PRIORIDAD 2: EXPANSIÓN INICIAL
@@ -115,14 +111,11 @@ def ghost_turn(ghost_id, kore, current_turn=1):
 
     # PRIORIDAD 3: MOVIMIENTO HACIA EL OBJETIVO
     # Si el Ghost tiene botín, su principal objetivo es moverse hacia la capa final.
-    if ghost.money > 0:
-        path = a_star_search_for_ghost(kore, current_node, target_layer)
-        if path and len(path) > 1:
-            next_node_id = path[1]
-            # Verifica si tiene suficiente estamina para el siguiente paso en la ruta óptima
-            for conn in current_node.connections:
-                if conn.node_b == next_node_id and ghost.stamina >= conn.cost:
-                    return get_move_command(current_node, next_node_id)
+    next_node_id, step_cost = next_step_to_goal(kore, current_node, target_layer, deadline)
+    if ghost.money > 0 and next_node_id:
+        # Verifica si tiene suficiente estamina para el siguiente paso en la ruta óptima
+        if ghost.stamina >= step_cost:
+            return get_move_command(current_node, next_node_id)
     
     # PRIORIDAD 4: RECOLECCIÓN DE RECURSOS
     # Si no se está moviendo hacia la meta (porque no tiene botín o no puede moverse),
@@ -133,11 +126,10 @@ def ghost_turn(ghost_id, kore, current_turn=1):
     
     # PRIORIDAD 5: DESATASCARSE (MOVIMIENTO EXPLORATORIO)
     # Si no tiene una ruta clara a la meta (posiblemente atrapado), hará un movimiento aleatorio.
-    path_to_goal = a_star_search_for_ghost(kore, current_node, target_layer)
-    if not path_to_goal or len(path_to_goal) <= 1:
+    if not next_node_id:
         possible_moves = [conn for conn in current_node.connections if ghost.stamina >= conn.cost]
         if possible_moves:
-            random_connection = random.choice(possible_moves)
+            random_connection = make_rng(rng).choice(possible_moves)
             return get_move_command(current_node, random_connection.node_b)
 
     # PRIORIDAD 6: DESCANSO ESTRATÉGICO (ÚLTIMO RECURSO)
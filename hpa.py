@@ -0,0 +1,155 @@
+import heapq
+from search import a_star, kore_neighbors, manhattan_to
+
+# Side of the square blocks of the grid the abstraction is built on
+CLUSTER_SIZE = 16
+# Transitions kept per cluster border and direction (cheapest edge of each stretch)
+ENTRANCES_PER_SIDE = 3
+
+class Hierarchy:
+    """
+    Two-level abstraction of a CompactGraph for HPA*. The grid is cut into
+    square clusters; on each border between two clusters the cheapest
+    crossing edge of every stretch becomes a transition, whose ends are the
+    abstract nodes (exits on one side, entries on the other). Costs from an
+    entry to the exits of its cluster come from a Dijkstra kept inside the
+    cluster, run the first time a search reaches it and then kept, parent
+    pointers included, so refining an abstract path is a walk back.
+    """
+    def __init__(self, graph, cluster_size=CLUSTER_SIZE):
+        self.graph = graph
+        self.size = cluster_size
+        self.width = -(-graph.n // cluster_size)   # clusters per layer band
+        self.crossings = {}        # exit -> [(entry, cost)] in neighbouring clusters
+        self.exits = {}            # cluster -> exits in it
+        self.entries = set()
+        self.reached = {}          # entry -> (dist, parent) inside its cluster
+        self._build_transitions()
+
+    def cluster(self, index):
+        n, size = self.graph.n, self.size
+        return (index // n) // size * self.width + (index % n) // size
+
+    def _build_transitions(self):
+        graph, size = self.graph, self.size
+        stretch = max(1, size // ENTRANCES_PER_SIDE)
+        best = {}   # (from cluster, to cluster, stretch) -> (cost, exit, entry)
+        for index in range(len(graph)):
+            col, layer = graph.coords(index)
+            if 0 < col % size < size - 1 and 0 < layer % size < size - 1:
+                continue  # not on a cluster border
+            here = self.cluster(index)
+            for target, cost in graph.neighbors(index):
+                there = self.cluster(target)
+                if there == here:
+                    continue
+                tcol, tlayer = graph.coords(target)
+                if tcol // size == col // size:
+                    along = col       # vertical neighbours: the border runs along the columns
+                elif tlayer // size == layer // size:
+                    along = layer
+                else:
+                    along = 0         # corner
+                key = (here, there, along // stretch)
+                if key not in best or cost < best[key][0]:
+                    best[key] = (cost, index, target)
+        for (here, _, _), (cost, exit_node, entry) in sorted(best.items()):
+            self.crossings.setdefault(exit_node, []).append((entry, cost))
+            exits = self.exits.setdefault(here, [])
+            if exit_node not in exits:
+                exits.append(exit_node)
+            self.entries.add(entry)
+
+    def reach(self, source):
+        """(dist, parent) dicts of a Dijkstra from source that never leaves its cluster."""
+        cached = self.reached.get(source)
+        if cached is not None:
+            return cached
+        graph = self.graph
+        offsets, targets, costs = graph.offsets, graph.targets, graph.costs
+        n, size, width = graph.n, self.size, self.width
+        cluster = self.cluster(source)
+        dist, parent = {source: 0}, {}
+        heap = [(0, source)]
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while heap:
+            d, u = heappop(heap)
+            if d > dist[u]:
+                continue  # stale entry
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if (v // n) // size * width + (v % n) // size != cluster:
+                    continue
+                nd = d + costs[i]
+                if nd < dist.get(v, nd + 1):
+                    dist[v] = nd
+                    parent[v] = u
+                    heappush(heap, (nd, v))
+        if source in self.entries:
+            self.reached[source] = (dist, parent)
+        return dist, parent
+
+    def precompute(self):
+        """Runs the in-cluster search of every entry now instead of on first use."""
+        for entry in self.entries:
+            self.reach(entry)
+
+    def path(self, source, target, stats=None):
+        """
+        Node indexes from source to target: A* over the abstract graph (with
+        source and target linked in), then refined inside each cluster.
+        Returns None if the abstraction finds no route.
+        """
+        if source == target:
+            return [source]
+        graph = self.graph
+        goal_cluster = self.cluster(target)
+        gx, gy = graph.coords(target)
+
+        def neighbors(u):
+            edges = list(self.crossings.get(u, ()))
+            if u == source or u in self.entries:
+                dist = self.reach(u)[0]
+                cluster = self.cluster(u)
+                edges.extend((e, dist[e]) for e in self.exits.get(cluster, ()) if e != u and e in dist)
+                if cluster == goal_cluster and target in dist:
+                    edges.append((target, dist[target]))
+            return edges
+
+        def heuristic(u):
+            # Manhattan distance, as the flat A* uses (see search.manhattan_to)
+            x, y = graph.coords(u)
+            return abs(x - gx) + abs(y - gy)
+
+        abstract = a_star(source, lambda u: u == target, neighbors, heuristic, stats)
+        if abstract is None:
+            return None
+        path = [source]
+        for u, v in zip(abstract, abstract[1:]):
+            if self.cluster(u) != self.cluster(v):
+                path.append(v)
+                continue
+            parent = self.reach(u)[1]
+            segment = [v]
+            while segment[-1] != u:
+                segment.append(parent[segment[-1]])
+            path.extend(reversed(segment[:-1]))
+        return path
+
+def hpa_search(kore, start_node, goal_node, stats=None):
+    """
+    Same interface as sentinel_method.a_star_search, answered by HPA* over
+    the Kore's cluster hierarchy. Paths are near-optimal rather than optimal.
+    Falls back to flat A* when the map has no graph or the abstraction
+    misses a route.
+    """
+    get_hierarchy = getattr(kore, "get_hierarchy", None)
+    hierarchy = get_hierarchy() if get_hierarchy else None
+    if hierarchy is not None:
+        graph = hierarchy.graph
+        path = hierarchy.path(graph.index_of(start_node.id), graph.index_of(goal_node.id), stats)
+        if path is not None:
+            return [graph.ids[index] for index in path]
+    goal_id = goal_node.id
+    return a_star(start_node.id, lambda node_id: node_id == goal_id,
+                  kore_neighbors(kore), manhattan_to(goal_id), stats)
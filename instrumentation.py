@@ -0,0 +1,251 @@
+import cProfile
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+# Kore lookups counted while instruments are attached to a map
+LOOKUPS = ("get_node_by_id", "get_node_by_position", "get_node_by_coords", "get_agent_by_id", "get_agent_node")
+
+NULL_TIMER = nullcontext()
+
+class Timer:
+    __slots__ = ("add", "name", "start")
+
+    def __init__(self, add, name):
+        self.add = add      # add(name, seconds)
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.add(self.name, time.perf_counter() - self.start)
+        return False
+
+class Instruments:
+    """
+    Timers and counters for the turn loop, kept per turn. Disabled
+    instruments hand out a shared no-op timer and drop counts, so hooks on
+    hot paths cost an attribute check. Engine code that has no reference to
+    the simulation (A*, the distance cache) reports to the installed
+    instance, ACTIVE, which a Simulation installs only while its turn()
+    runs. Work outside the turn loop, such as drawing on another thread,
+    goes in per-frame series (frame_timer) kept apart from the turns. With
+    profile_turn set, that turn runs under cProfile and its stats are
+    written to profile_path (readable by pstats, snakeviz or flameprof).
+    """
+    def __init__(self, enabled=True, profile_turn=None, profile_path="turn.prof"):
+        self.enabled = enabled
+        self.profile_turn = profile_turn
+        self.profile_path = profile_path
+        self.profiler = None
+        self.turns = []       # closed per-turn records
+        self.record = None    # record of the turn in progress
+        self.frames = {}      # name -> milliseconds of every frame
+        self.kore = None
+        self.cache_counts = (0, 0)
+
+    def timer(self, name):
+        if not self.enabled:
+            return NULL_TIMER
+        return Timer(self.add_time, name)
+
+    def frame_timer(self, name):
+        if not self.enabled:
+            return NULL_TIMER
+        return Timer(self.add_frame_time, name)
+
+    def add_frame_time(self, name, seconds):
+        self.frames.setdefault(name, []).append(seconds * 1000.0)
+
+    def add_time(self, name, seconds):
+        record = self.record
+        if record is None:
+            return
+        record["ms"][name] = record["ms"].get(name, 0.0) + seconds * 1000.0
+        record["calls"][name] = record["calls"].get(name, 0) + 1
+
+    def count(self, name, amount=1):
+        record = self.record
+        if record is not None:
+            record["counts"][name] = record["counts"].get(name, 0) + amount
+
+    # --- Turns ---
+
+    @contextmanager
+    def turn(self, turn):
+        """Records turn and installs these instruments as ACTIVE while it runs."""
+        if not self.enabled:
+            yield self
+            return
+        self.begin_turn(turn)
+        try:
+            with installed(self):
+                yield self
+        finally:
+            self.end_turn()
+
+    def begin_turn(self, turn):
+        if not self.enabled:
+            return
+        self.end_turn()
+        self.record = {"turn": turn, "ms": {}, "calls": {}, "counts": {}}
+        self.cache_counts = self._cache_counts()
+        if turn == self.profile_turn:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def end_turn(self):
+        record = self.record
+        if record is None:
+            return
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile_path)
+            self.profiler = None
+        hits, misses = self._cache_counts()
+        # A cache replaced during the turn starts again from zero
+        if hits > self.cache_counts[0]:
+            self.count("cache_hits", hits - self.cache_counts[0])
+        if misses > self.cache_counts[1]:
+            self.count("cache_misses", misses - self.cache_counts[1])
+        self.turns.append(record)
+        self.record = None
+
+    def _cache_counts(self):
+        cache = getattr(self.kore, "path_cache", None)
+        return (cache.hits, cache.misses) if cache is not None else (0, 0)
+
+    # --- Kore lookups ---
+
+    def attach(self, kore):
+        """Counts kore's lookups by shadowing them on the instance; detach() undoes it."""
+        self.detach()
+        self.kore = kore
+        if not self.enabled:
+            return
+        for name in LOOKUPS:
+            setattr(kore, name, self._counting(getattr(kore, name), name))
+
+    def _counting(self, lookup, name):
+        count = self.count
+
+        def counted(*args):
+            count(name)
+            return lookup(*args)
+        return counted
+
+    def detach(self):
+        if self.kore is not None:
+            for name in LOOKUPS:
+                self.kore.__dict__.pop(name, None)
+            self.kore = None
+
+    def close(self):
+        """Ends the current turn, restores the Kore lookups and uninstalls these instruments."""
+        self.end_turn()
+        self.detach()
+        if ACTIVE is self:
+            install(NULL_INSTRUMENTS)
+
+    # --- Reports ---
+
+    def values(self, name):
+        """Per-turn milliseconds of a timer (or totals of a counter), for the turns it ran in."""
+        return [record["ms"].get(name, record["counts"].get(name))
+                for record in self.turns if name in record["ms"] or name in record["counts"]]
+
+    def names(self):
+        timers, counters = set(), set()
+        for record in self.turns:
+            timers.update(record["ms"])
+            counters.update(record["counts"])
+        return sorted(timers), sorted(counters)
+
+    def histogram(self, name, bins=10):
+        """(low, high, turns) buckets of equal width over the per-turn values of name."""
+        values = self.values(name)
+        if not values:
+            return []
+        low, high = min(values), max(values)
+        width = (high - low) / bins or 1.0
+        counts = [0] * bins
+        for value in values:
+            counts[min(bins - 1, int((value - low) / width))] += 1
+        return [(low + i * width, low + (i + 1) * width, counts[i]) for i in range(bins)]
+
+    def summary(self):
+        result = {}
+        for name in sum(self.names(), []):
+            values = sorted(self.values(name))
+            result[name] = dict(stats(values), turns=len(values))
+        return result
+
+    def frame_summary(self):
+        return {name: stats(sorted(values)) for name, values in self.frames.items()}
+
+    def report(self, bins=8, width=30):
+        """Text report: percentiles of every timer (ms per turn), counter and frame series, then histograms."""
+        self.end_turn()
+        summary = self.summary()
+        timers, counters = self.names()
+        lines = [f"{len(self.turns)} turns instrumented"]
+        for title, names in (("timers (ms per turn)", timers), ("counters (per turn)", counters)):
+            lines.append(title)
+            lines.extend(stats_line(name, summary[name]) for name in names)
+        if self.frames:
+            lines.append("frames (ms per frame)")
+            lines.extend(stats_line(name, values) for name, values in sorted(self.frame_summary().items()))
+        for name in timers:
+            buckets = self.histogram(name, bins)
+            most = max(count for _, _, count in buckets)
+            lines.append(f"{name} (ms)")
+            for low, high, count in buckets:
+                bar = "#" * (count * width // most if most else 0)
+                lines.append(f"  {low:>10.3f} - {high:>10.3f} | {bar} {count}")
+        return "\n".join(lines)
+
+    def write_jsonl(self, path):
+        """One JSON line per turn with its timers, call counts and counters."""
+        self.end_turn()
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.turns:
+                f.write(json.dumps(record) + "\n")
+
+def stats(sorted_values):
+    return {
+        "count": len(sorted_values),
+        "mean": sum(sorted_values) / len(sorted_values),
+        "p50": percentile(sorted_values, 50),
+        "p90": percentile(sorted_values, 90),
+        "p99": percentile(sorted_values, 99),
+        "max": sorted_values[-1],
+    }
+
+def stats_line(name, stats):
+    return (f"  {name:<22} mean {stats['mean']:>10.3f}  p50 {stats['p50']:>10.3f}  "
+            f"p90 {stats['p90']:>10.3f}  p99 {stats['p99']:>10.3f}  max {stats['max']:>10.3f}")
+
+def percentile(sorted_values, q):
+    index = min(len(sorted_values) - 1, int(round(q / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+NULL_INSTRUMENTS = Instruments(enabled=False)
+
+# Instance the engine internals report to; Simulation installs its own when enabled
+ACTIVE = NULL_INSTRUMENTS
+
+def install(instruments):
+    """Makes instruments ACTIVE and returns the instance it replaces."""
+    global ACTIVE
+    previous, ACTIVE = ACTIVE, instruments
+    return previous
+
+@contextmanager
+def installed(instruments):
+    previous = install(instruments)
+    try:
+        yield instruments
+    finally:
+        install(previous)
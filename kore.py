@@ -1,25 +1,60 @@
-from Node import Node, Connection
-import random
+from Node import Node, Connection, CompactNode, parse_node_id
+from Ghost import Ghost
+from compact_graph import CompactGraph
+from path_cache import DistanceCache
+from hpa import Hierarchy
+from visibility import CellView, Visibility
+from spatial_index import GridBuckets
+import hashlib
+from seeding import make_rng
 
 class Kore:
-    def __init__(self, n, m):
+    def __init__(self, n, m, compact=False):
         self.n = n  # nodes per layer
         self.m = m  # number of layers
+        self.compact = compact  # store edges and money only in CSR arrays
+        self.graph = CompactGraph(n, m) if compact else None
+        self.path_cache = None
+        self.hierarchy = None       # cluster abstraction for HPA*, built on first use
+        self.visibility = None      # cached visible areas, built on first use
         self.nodes = []
+        # Persistent indexes so lookups do not depend on the grid size
+        self.node_index = {}        # node_id -> node
+        self.position_index = {}    # (position_x, position_y) -> node
+        self.agent_index = {}       # agent_id -> (agent, node)
+        # Live summaries of the world, kept up to date by move/add/remove/add_money
+        self.ghost_nodes = {}       # node_id -> node, nodes holding ghosts
+        self.money_nodes = {}       # node_id -> node, nodes holding money
+        # Spatial indexes over the same nodes for nearest-target queries
+        self.ghost_index = GridBuckets(n, m)
+        self.money_index = GridBuckets(n, m)
         for layer in range(m):
             layer_nodes = []
             for position in range(n):
-                node_id = f"{position},{layer}"
-                node = Node(
-                    node_id,
-                    connections=[],
-                    position_x=position,
-                    position_y=layer
-                )
+                if compact:
+                    index = layer * n + position
+                    node_id = self.graph.ids[index]
+                    node = CompactNode(self.graph, index, node_id, position_x=position, position_y=layer)
+                else:
+                    node_id = f"{position},{layer}"
+                    node = Node(
+                        node_id,
+                        connections=[],
+                        position_x=position,
+                        position_y=layer
+                    )
                 layer_nodes.append(node)
+                self.node_index[node_id] = node
             self.nodes.append(layer_nodes)
+        self.reindex_positions()
 
-    def create_connections(self):
+    def create_connections(self, rng=None):
+        rng = make_rng(rng)
+        if self.compact:
+            graph = CompactGraph.random(self.n, self.m, rng)
+            self.graph.offsets, self.graph.targets, self.graph.costs = graph.offsets, graph.targets, graph.costs
+            self.invalidate_paths()
+            return
         directions = [
             (1, 0), (-1, 0),
             (0, 1), (1, 1), (-1, 1),
@@ -32,67 +67,232 @@ class Kore:
                     na, nb = a + dx, b + dy
                     if 0 <= na < self.n and 0 <= nb < self.m:
                         neighbor = self.nodes[nb][na]
-                        cost = random.randint(1, 10)
+                        cost = rng.randint(1, 10)
                         connection = Connection(node.id, neighbor.id, cost)
                         node.connections.append(connection)
+        self.rebuild_graph()
+
+    def fingerprint(self):
+        # Stable id of the map topology and edge costs, for keying cached tables across runs
+        if self.graph is None:
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.n}x{self.m}".encode())
+        for values in (self.graph.offsets, self.graph.targets, self.graph.costs):
+            digest.update(values.tobytes())
+        return digest.hexdigest()
+
+    def rebuild_graph(self):
+        # Re-reads the Connection objects; call after editing them by hand
+        self.graph = CompactGraph.from_kore(self)
+        self.path_cache = None
+        self.hierarchy = None
+        self.visibility = None
+
+    def set_edge_cost(self, node_a_id, node_b_id, cost):
+        node = self.get_node_by_id(node_a_id)
+        if not node or self.graph is None:
+            return False
+        if not self.compact:
+            connection = next((conn for conn in node.connections if conn.node_b == node_b_id), None)
+            if not connection:
+                return False
+            connection.cost = cost
+        if not self.graph.set_edge_cost(self.graph.index_of(node_a_id), self.graph.index_of(node_b_id), cost):
+            return False
+        self.invalidate_paths()
+        return True
+
+    def invalidate_paths(self):
+        # Hook for anything that caches paths over the current edge costs
+        self.hierarchy = None
+        self.visibility = None
+        if self.path_cache is not None:
+            self.path_cache.invalidate()
+
+    def share_paths(self, cache):
+        # Starts from the trees of a Kore with the same topology and costs; the
+        # cache is forked over this Kore's graph, so later cost edits on either
+        # side never reach the other
+        self.path_cache = cache.fork(self.graph)
+
+    def get_path_cache(self):
+        if self.graph is None:
+            return None
+        if self.path_cache is None:
+            self.path_cache = DistanceCache(self.graph)
+        return self.path_cache
+
+    def get_hierarchy(self):
+        if self.graph is None:
+            return None
+        if self.hierarchy is None:
+            self.hierarchy = Hierarchy(self.graph)
+        return self.hierarchy
+
+    def get_visibility(self):
+        if self.graph is None:
+            return None
+        if self.visibility is None:
+            self.visibility = Visibility(self.graph)
+        return self.visibility
+
+    def get_goal_field(self, col=None):
+        # Cost to reach the ghosts' goal layer (last column by default) and next hop, per node
+        cache = self.get_path_cache()
+        if cache is None:
+            return None
+        return cache.tree_to_column(self.n - 1 if col is None else col)
+
+    def has_goal_field(self, col=None):
+        # True once get_goal_field(col) is a lookup rather than a search
+        cache = self.path_cache
+        return cache is not None and (self.n - 1 if col is None else col) in cache.layer_trees
+
+    # --- Indexes ---
+
+    def reindex_positions(self):
+        # Must be called after node positions are rewritten (e.g. to pixel coordinates)
+        self.position_index = {(node.position_x, node.position_y): node for row in self.nodes for node in row}
+
+    def add_agent(self, agent, node):
+        if agent in node.sentinels or agent in node.ghosts:
+            return
+        if isinstance(agent, Ghost):
+            node.ghosts.append(agent)
+        else:
+            node.sentinels.append(agent)
+        self.agent_index[agent.id] = (agent, node)
+        self._update_occupancy(node)
+
+    def remove_agent(self, agent_id):
+        entry = self.agent_index.pop(agent_id, None)
+        if not entry:
+            return None
+        agent, node = entry
+        if agent in node.ghosts:
+            node.ghosts.remove(agent)
+        elif agent in node.sentinels:
+            node.sentinels.remove(agent)
+        self._update_occupancy(node)
+        return agent
+
+    def reindex_agents(self):
+        # Rebuilds the registry from the grid, for agents placed without add_agent
+        self.agent_index = {}
+        self.ghost_nodes = {}
+        self.ghost_index.clear()
+        for row in self.nodes:
+            for node in row:
+                for agent in node.ghosts + node.sentinels:
+                    self.agent_index.setdefault(agent.id, (agent, node))
+                self._update_occupancy(node)
+
+    def _update_occupancy(self, node):
+        if node.ghosts:
+            self.ghost_nodes[node.id] = node
+            self.ghost_index.add(node.id, *parse_node_id(node.id))
+        elif node.id in self.ghost_nodes:
+            del self.ghost_nodes[node.id]
+            self.ghost_index.remove(node.id)
+        if self.graph is not None:
+            index = self.graph.index_of(node.id)
+            self.graph.ghost_count[index] = len(node.ghosts)
+            self.graph.sentinel_count[index] = len(node.sentinels)
+
+    def add_money(self, node, amount):
+        # All money changes go through here so money_nodes stays current
+        node.money += amount
+        self._update_money(node)
+        return node.money
+
+    def _update_money(self, node):
+        if self.graph is not None and not self.compact:
+            self.graph.money[self.graph.index_of(node.id)] = node.money
+        if node.money > 0:
+            self.money_nodes[node.id] = node
+            self.money_index.add(node.id, *parse_node_id(node.id))
+        elif node.id in self.money_nodes:
+            del self.money_nodes[node.id]
+            self.money_index.remove(node.id)
+
+    def reindex_money(self):
+        # For money written straight onto nodes
+        self.money_nodes = {}
+        self.money_index.clear()
+        for row in self.nodes:
+            for node in row:
+                self._update_money(node)
+
+    def nearest_node(self, col, layer, predicate):
+        # Scans diamonds of growing Manhattan radius, each in grid order, and
+        # returns the first node accepted by predicate
+        for distance in range(self.n + self.m - 1):
+            for dy in range(-distance, distance + 1):
+                y = layer + dy
+                if not 0 <= y < self.m:
+                    continue
+                rest = distance - abs(dy)
+                for x in ((col - rest, col + rest) if rest else (col,)):
+                    if 0 <= x < self.n and predicate(self.nodes[y][x]):
+                        return self.nodes[y][x]
+        return None
+
+    def grid_order(self, nodes):
+        # Sorts nodes as a row-by-row scan of self.nodes would visit them
+        return sorted(nodes, key=lambda node: parse_node_id(node.id)[::-1])
+
+    def get_agent_node(self, agent_id):
+        entry = self.agent_index.get(agent_id)
+        return entry[1] if entry else None
+
+    # --- Queries ---
 
     def get_position(self, node_id, limit):
-        result = []
-        all_nodes = [node for row in self.nodes for node in row]
-        node = next((n for n in all_nodes if n.id == node_id), None)
-        if not node:
-            return result
-        for connection in node.connections:
-            neighbor_id = connection.node_b if connection.node_a == node_id else connection.node_a
-            neighbor = next((n for n in all_nodes if n.id == neighbor_id), None)
-            if not neighbor:
-                continue
-            if connection.cost > limit:
-                node_copy = Node(
-                    node_id=neighbor.id,
-                    connections=[],
-                    position_x=neighbor.position_x,
-                    position_y=neighbor.position_y,
-                    money=0,
-                    ghosts=[],
-                    sentinels=[]
-                )
-            else:
-                node_copy = Node(
-                    node_id=neighbor.id,
-                    connections=[],
-                    position_x=neighbor.position_x,
-                    position_y=neighbor.position_y,
-                    money=neighbor.money,
-                    ghosts=neighbor.ghosts.copy(),
-                    sentinels=neighbor.sentinels.copy()
-                )
-            result.append(node_copy)
-        return result
+        # Neighbours of node_id as read-only views; those behind an edge dearer than limit are fogged
+        node = self.get_node_by_id(node_id)
+        if not node or self.graph is None:
+            return []
+        n, nodes = self.n, self.nodes
+        return [CellView(nodes[target // n][target % n], cost, cost <= limit)
+                for target, cost in self.graph.neighbors(self.graph.index_of(node_id))]
+
+    def visible(self, node_id, hops=None, budget=None):
+        # Views of what an agent on node_id sees: nodes within hops edges (one by
+        # default) or within a path cost budget. Query API only: the turn's
+        # perception still goes through get_position and its stamina fog
+        return self.visible_batch([node_id], hops, budget)[0]
+
+    def visible_batch(self, node_ids, hops=None, budget=None):
+        # One list of views per node id, in grid order; each distinct node is searched once
+        visibility = self.get_visibility()
+        if visibility is None:
+            return [[] for _ in node_ids]
+        graph, n, nodes = self.graph, self.n, self.nodes
+        areas = visibility.batch([graph.index_of(node_id) for node_id in node_ids], hops, budget)
+        return [[CellView(nodes[index // n][index % n], cost) for index, cost in area] for area in areas]
 
     def get_node_by_id(self, node_id):
-        all_nodes = [node for row in self.nodes for node in row]
-        return next((n for n in all_nodes if n.id == node_id), None)
+        return self.node_index.get(node_id)
+
+    def get_node_by_coords(self, col, layer):
+        if 0 <= col < self.n and 0 <= layer < self.m:
+            return self.nodes[layer][col]
+        return None
 
     def get_node_by_position(self, position_x, position_y):
-        all_nodes = [node for row in self.nodes for node in row]
-        return next((n for n in all_nodes if n.position_x == position_x and n.position_y == position_y), None)
+        # Rewriting node positions must be followed by reindex_positions()
+        return self.position_index.get((position_x, position_y))
 
     def get_agent_by_id(self, agent_id):
-        all_nodes = [node for row in self.nodes for node in row]
-        for node in all_nodes:
-            agent = next((g for g in node.ghosts if g.id == agent_id), None)
-            if agent:
-                return agent
-            agent = next((s for s in node.sentinels if s.id == agent_id), None)
-            if agent:
-                return agent
-        return None
+        # Agents placed without add_agent are only found after reindex_agents()
+        entry = self.agent_index.get(agent_id)
+        return entry[0] if entry else None
 
     def get_node_by_move(self, node_id, vertical, horizontal):
         # node_id format: "x,y"
         try:
-            x, y = map(int, node_id.split(','))
+            x, y = parse_node_id(node_id)
             new_x = x + horizontal
             new_y = y + vertical
             new_id = f"{new_x},{new_y}"
@@ -102,7 +302,7 @@ class Kore:
 
     def get_id_by_move(self, node_id, vertical, horizontal):
         try:
-            x, y = map(int, node_id.split(','))
+            x, y = parse_node_id(node_id)
             new_x = x + horizontal
             new_y = y + vertical
             new_id = f"{new_x},{new_y}"
@@ -111,40 +311,40 @@ class Kore:
             return None
 
     def move(self, node_origin_id, node_dest_id, agent_id):
-        all_nodes = [node for row in self.nodes for node in row]
-        origin = next((n for n in all_nodes if n.id == node_origin_id), None)
-        dest = next((n for n in all_nodes if n.id == node_dest_id), None)
+        origin = self.get_node_by_id(node_origin_id)
+        dest = self.get_node_by_id(node_dest_id)
         if not origin or not dest:
             return False
 
         # get the cost of the connection
-        connection = next((conn for conn in origin.connections if conn.node_b == node_dest_id or conn.node_a == node_dest_id), None)
-
-        if not any(conn.node_b == node_dest_id or conn.node_a == node_dest_id for conn in origin.connections):
+        if self.graph is None:
+            # Connections added by hand, before rebuild_graph()
+            connection = next((conn for conn in origin.connections
+                               if conn.node_b == node_dest_id or conn.node_a == node_dest_id), None)
+            cost = connection.cost if connection else None
+        else:
+            cost = self.graph.edge_cost(self.graph.index_of(node_origin_id), self.graph.index_of(node_dest_id))
+        if cost is None:
             return False  # Not connected
 
         # Verify agent exists in origin node
-        if not any(g.id == agent_id for g in origin.ghosts) and not any(s.id == agent_id for s in origin.sentinels):
+        agent = self.get_agent_by_id(agent_id)
+        if not agent or self.agent_index[agent_id][1] is not origin:
             return False
 
-        # Try to move ghost
-        agent = next((g for g in origin.ghosts if g.id == agent_id), None)
-        if agent and connection and agent.stamina >= connection.cost:
+        if agent.stamina < cost:
+            return False
+
+        if agent in origin.ghosts:
             origin.ghosts.remove(agent)
             dest.ghosts.append(agent)
-            agent.position_x = dest.position_x
-            agent.position_y = dest.position_y
-            agent.stamina -= connection.cost
-            return True
-
-        # Try to move sentinel
-        agent = next((s for s in origin.sentinels if s.id == agent_id), None)
-        if agent and connection and agent.stamina >= connection.cost:
+        else:
             origin.sentinels.remove(agent)
             dest.sentinels.append(agent)
-            agent.position_x = dest.position_x
-            agent.position_y = dest.position_y
-            agent.stamina -= connection.cost
-            return True
-
-        return False
\ No newline at end of file
+        agent.position_x = dest.position_x
+        agent.position_y = dest.position_y
+        agent.stamina -= cost
+        self.agent_index[agent_id] = (agent, dest)
+        self._update_occupancy(origin)
+        self._update_occupancy(dest)
+        return True
@@ -0,0 +1,129 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from ghost_method import perceive_world_for_ghost
+from sentinel_method import perceive_world
+from simulation import sentinel_command
+from snapshot import Snapshot
+
+class FrozenKore:
+    """
+    Read-only snapshot of a Kore (Snapshot.to_bytes) in a shared memory
+    block, so workers restore it without it going through a pipe. The
+    creator unlinks it with close().
+    """
+    def __init__(self, kore):
+        data = Snapshot.of(kore).to_bytes()
+        self.size = len(data)
+        self.memory = shared_memory.SharedMemory(create=True, size=self.size)
+        self.memory.buf[:self.size] = data
+        self.name = self.memory.name
+
+    def close(self):
+        self.memory.close()
+        self.memory.unlink()
+
+# --- Worker side ---
+
+# Last snapshot restored by this process, and the distance caches of the
+# topologies seen, so trees built in one turn serve the next ones
+_frozen = {"name": None, "kore": None}
+_paths = {}
+
+def thaw(name, size):
+    """Kore of the shared snapshot name, restored once per process and snapshot."""
+    if _frozen["name"] == name:
+        return _frozen["kore"]
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        snap = Snapshot.from_bytes(memory.buf[:size])
+    finally:
+        memory.close()
+    kore = snap.restore()
+    fingerprint = kore.fingerprint()
+    if fingerprint in _paths:
+        kore.share_paths(_paths[fingerprint])
+    else:
+        _paths.clear()
+    _paths[fingerprint] = kore.get_path_cache()
+    _frozen.update(name=name, kore=kore)
+    return kore
+
+def agent_rng(seed, agent_id):
+    # Per-agent stream: the same draws whichever process decides the agent
+    return random.Random(f"{seed}:{agent_id}")
+
+def decide_ghosts(kore, ghost_ids, policy, turn, seed):
+    return [policy(ghost_id, kore, turn, agent_rng(seed, ghost_id)) for ghost_id in ghost_ids]
+
+def decide_sentinels(kore, jobs):
+    """Commands for (sentinel_id, target node id or None) jobs."""
+    commands = []
+    for sentinel_id, target_id in jobs:
+        target = kore.get_node_by_id(target_id) if target_id is not None else None
+        commands.append(sentinel_command(sentinel_id, kore, kore.get_agent_node(sentinel_id), target))
+    return commands
+
+def _ghost_task(name, size, ghost_ids, policy, turn, seed):
+    return decide_ghosts(thaw(name, size), ghost_ids, policy, turn, seed)
+
+def _sentinel_task(name, size, jobs):
+    return decide_sentinels(thaw(name, size), jobs)
+
+# --- Parent side ---
+
+class ParallelDecider:
+    """
+    Simultaneous-move decisions for Simulation(decider=...). Every agent of
+    a phase decides on the state frozen at the start of the phase: the
+    parent first runs the agents' perception (their memories live in the
+    parent), then freezes the Kore and splits the agents in contiguous
+    chunks across a process pool. Ghost policies get a per-agent rng seeded
+    from the phase seed, so the commands do not depend on the number of
+    workers; workers=1 decides in this process on the live (unchanged) Kore.
+    The policy must be picklable, i.e. a module-level function.
+    """
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+
+    def ghost_commands(self, kore, ghosts, policy, turn, seed):
+        ghost_ids = [ghost.id for ghost in ghosts]
+        for ghost_id in ghost_ids:
+            perceive_world_for_ghost(ghost_id, kore)
+        if self.workers <= 1 or len(ghost_ids) < 2:
+            return decide_ghosts(kore, ghost_ids, policy, turn, seed)
+        return self._map(kore, _ghost_task, ghost_ids, policy, turn, seed)
+
+    def sentinel_commands(self, kore, jobs):
+        for sentinel_id, target_id in jobs:
+            if target_id is None:
+                perceive_world(sentinel_id, kore)
+        if self.workers <= 1 or len(jobs) < 2:
+            return decide_sentinels(kore, jobs)
+        return self._map(kore, _sentinel_task, jobs)
+
+    def _map(self, kore, task, items, *args):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers)
+        chunk = -(-len(items) // self.workers)
+        frozen = FrozenKore(kore)
+        try:
+            futures = [self.executor.submit(task, frozen.name, frozen.size, items[i:i + chunk], *args)
+                       for i in range(0, len(items), chunk)]
+            return [command for future in futures for command in future.result()]
+        finally:
+            frozen.close()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
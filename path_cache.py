@@ -0,0 +1,204 @@
+import heapq
+import time
+from array import array
+from collections import OrderedDict
+import instrumentation
+
+INF = float('inf')
+
+# Maps up to this many nodes keep a tree for every target (all-pairs)
+ALL_PAIRS_LIMIT = 1024
+# Memory the trees of one direction may take on bigger maps; a tree is a
+# float64 distance plus an int32 next hop or parent per node
+MEMORY_BUDGET = 64 * 1024 * 1024
+TREE_BYTES_PER_NODE = 12
+# Trees kept per direction however big the map, so a route still fits
+MIN_CAPACITY = 4
+
+def default_capacity(size):
+    """Trees kept per direction for a graph of size nodes."""
+    if size <= ALL_PAIRS_LIMIT:
+        return size
+    return max(MIN_CAPACITY, MEMORY_BUDGET // (TREE_BYTES_PER_NODE * size))
+
+def dijkstra(graph, sources):
+    """
+    Multi-source Dijkstra over a CompactGraph.
+    Returns (dist, parent) arrays indexed by node; parent is -1 for the
+    sources and for unreachable nodes.
+    """
+    size = len(graph)
+    dist = array('d', [INF]) * size
+    parent = array('i', [-1]) * size
+    offsets, targets, costs = graph.offsets, graph.targets, graph.costs
+    heap = []
+    for source in sources:
+        dist[source] = 0
+        heap.append((0, source))
+    heapq.heapify(heap)
+    heappop, heappush = heapq.heappop, heapq.heappush
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue  # stale entry
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            nd = d + costs[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                heappush(heap, (nd, v))
+    return dist, parent
+
+class DistanceCache:
+    """
+    Shortest-path trees over a CompactGraph, filled lazily and kept in LRU order.
+    tree_to(t) is a reverse search: for every node it gives the cost to reach t
+    and the next hop towards t, so all agents heading to one target share it.
+    """
+    def __init__(self, graph, capacity=None):
+        self.graph = graph
+        if capacity is None:
+            capacity = default_capacity(len(graph))
+        self.capacity = capacity
+        self.reverse_graph = None
+        self.to_trees = OrderedDict()
+        self.from_trees = OrderedDict()
+        self.layer_trees = {}
+        self.hits = 0
+        self.misses = 0
+        # Duration of the last tree built, so callers on a deadline can tell if another fits
+        self.last_build_ms = 0.0
+
+    def invalidate(self):
+        """
+        Drops every cached tree. Must be called whenever an edge cost changes.
+        """
+        self.reverse_graph = None
+        self.to_trees.clear()
+        self.from_trees.clear()
+        self.layer_trees.clear()
+
+    def fork(self, graph):
+        """
+        New cache over graph, a copy with the same topology and costs, that
+        starts with the trees built so far. Trees are never modified once
+        built, so they are shared; later builds and invalidations are not.
+        """
+        child = DistanceCache(graph, self.capacity)
+        child.reverse_graph = self.reverse_graph
+        child.to_trees = OrderedDict(self.to_trees)
+        child.from_trees = OrderedDict(self.from_trees)
+        child.layer_trees = dict(self.layer_trees)
+        return child
+
+    def _lookup(self, trees, key, build):
+        tree = trees.get(key)
+        if tree is not None:
+            trees.move_to_end(key)
+            self.hits += 1
+            return tree
+        self.misses += 1
+        start = time.perf_counter()
+        tree = build(key)
+        self.last_build_ms = (time.perf_counter() - start) * 1000.0
+        if instrumentation.ACTIVE.enabled:
+            instrumentation.ACTIVE.add_time("dijkstra", self.last_build_ms / 1000.0)
+        trees[key] = tree
+        if len(trees) > self.capacity:
+            trees.popitem(last=False)
+        return tree
+
+    def _build_to(self, target):
+        if self.reverse_graph is None:
+            self.reverse_graph = self.graph.reverse()
+        return dijkstra(self.reverse_graph, [target])
+
+    def _build_from(self, source):
+        return dijkstra(self.graph, [source])
+
+    def tree_to(self, target):
+        """(dist, next_hop) arrays towards target."""
+        return self._lookup(self.to_trees, target, self._build_to)
+
+    def tree_from(self, source):
+        """(dist, parent) arrays from source."""
+        return self._lookup(self.from_trees, source, self._build_from)
+
+    def tree_to_column(self, col):
+        """
+        (dist, next_hop) arrays towards the nearest node of column col, from a
+        single reverse search seeded with the whole column. This is the ghosts'
+        goal field: one pass serves every ghost for the whole game.
+        """
+        tree = self.layer_trees.get(col)
+        if tree is not None:
+            self.hits += 1
+            return tree
+        self.misses += 1
+        if self.reverse_graph is None:
+            self.reverse_graph = self.graph.reverse()
+        graph = self.graph
+        tree = dijkstra(self.reverse_graph, [graph.index(col, layer) for layer in range(graph.m)])
+        self.layer_trees[col] = tree
+        return tree
+
+    def precompute_all(self):
+        """
+        Fills the all-pairs table. Only sensible for small maps.
+        """
+        self.capacity = max(self.capacity, len(self.graph))
+        for target in range(len(self.graph)):
+            self.tree_to(target)
+
+    # --- Queries by node index ---
+
+    def distance(self, source, target):
+        return self.tree_to(target)[0][source]
+
+    def next_hop(self, source, target):
+        """Next node from source towards target, or -1 if there is none."""
+        return self.tree_to(target)[1][source]
+
+    def path(self, source, target):
+        dist, next_hop = self.tree_to(target)
+        if dist[source] == INF:
+            return None
+        path = [source]
+        while path[-1] != target:
+            path.append(next_hop[path[-1]])
+        return path
+
+    def path_from(self, source, target):
+        """Same as path(), read from the forward tree of source."""
+        dist, parent = self.tree_from(source)
+        if dist[target] == INF:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
+
+    def route(self, source, target):
+        """
+        Path from source to target read from whichever of the two trees is
+        already cached, so callers that filled one side pay no new search.
+        """
+        if target not in self.to_trees and source in self.from_trees:
+            return self.path_from(source, target)
+        return self.path(source, target)
+
+    def has_route(self, source, target):
+        """True when route() can answer without a new search."""
+        return target in self.to_trees or source in self.from_trees
+
+    # --- Queries by node id ---
+
+    def path_ids(self, start_id, goal_id):
+        """Same format as sentinel_method.a_star_search: list of node ids or None."""
+        graph = self.graph
+        path = self.path(graph.index_of(start_id), graph.index_of(goal_id))
+        if path is None:
+            return None
+        return [graph.ids[index] for index in path]
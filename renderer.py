@@ -0,0 +1,216 @@
+import pygame
+from map import draw_grid
+from Node import parse_node_id
+from AgentState import AgentState
+
+BACKGROUND = (0, 0, 0)
+ID_COLOR = (255, 255, 255)
+COST_COLOR = (255, 255, 0)
+MONEY_COLOR = (0, 0, 0)
+
+# Sprite per agent state; states not listed use the plain sprite
+GHOST_IMAGES = {AgentState.DEAD: "deathghost", AgentState.SLEEPING: "sleepingghost"}
+SENTINEL_IMAGES = {AgentState.RESTING: "restingsentinel", AgentState.GREEDY: "greedysentinel"}
+
+BAR_WIDTH = 6
+BAR_OFFSET = -20
+
+class Renderer:
+    """
+    Draws a Kore onto a cached frame. Grid lines are pre-rendered once on a
+    static layer, text is rendered once per distinct label, and after every
+    turn only the cells whose agents or money changed are redrawn. Cells are
+    drawn from their signatures, so a runner.Frame published by another
+    thread can be shown (show_frame) without touching the live Kore.
+    """
+    def __init__(self, size, kore, images, cell_width, cell_height, font, grid_cols, grid_rows):
+        self.kore = kore
+        self.images = images
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.font = font
+        self.glyphs = {}
+
+        self.static = pygame.Surface(size)
+        self.static.fill(BACKGROUND)
+        draw_grid(grid_cols, grid_rows, cell_width, cell_height, size[0], size[1], self.static)
+        self.frame = self.static.copy()
+
+        # Node ids by (col, layer), and every undirected edge once with the
+        # cost of the direction met first in row-major order
+        self.cells = {parse_node_id(node.id): node for row in kore.nodes for node in row}
+        self.edges_by_cell = {cell: [] for cell in self.cells}
+        drawn_connections = set()
+        for row in kore.nodes:
+            for node in row:
+                for conn in node.connections:
+                    pair = tuple(sorted([node.id, conn.node_b]))
+                    if pair in drawn_connections:
+                        continue
+                    drawn_connections.add(pair)
+                    neighbor = kore.get_node_by_id(conn.node_b)
+                    if not neighbor:
+                        continue
+                    mid = ((node.position_x + neighbor.position_x) // 2, (node.position_y + neighbor.position_y) // 2)
+                    edge = (parse_node_id(node.id), parse_node_id(neighbor.id), mid, conn.cost)
+                    self.edges_by_cell[edge[0]].append(edge)
+                    self.edges_by_cell[edge[1]].append(edge)
+
+        self.signatures = {}
+        for cell in self.cells:
+            self.signatures[cell] = self.signature(self.cells[cell])
+        for cell in self.cells:
+            self.redraw_cell(cell)
+
+    def glyph(self, text, color):
+        key = (text, color)
+        surface = self.glyphs.get(key)
+        if surface is None:
+            surface = self.font.render(text, True, color)
+            self.glyphs[key] = surface
+        return surface
+
+    # --- Change detection ---
+
+    def signature(self, node):
+        # Everything drawn for a cell that can change between turns
+        if not node.ghosts and not node.sentinels and node.money <= 0:
+            return None
+        return (
+            node.money,
+            tuple((self.ghost_image_key(g), g.stamina, g.money) for g in node.ghosts),
+            tuple((self.sentinel_image_key(s), s.stamina, s.money) for s in node.sentinels),
+        )
+
+    def is_active(self, cell):
+        return self.signatures.get(cell) is not None
+
+    def update(self, *_):
+        """
+        Redraws the cells that changed since the previous call. Usable as a
+        Simulation observer.
+        """
+        return self.apply({cell: self.signature(node) for cell, node in self.cells.items()})
+
+    def show_frame(self, frame):
+        """
+        Redraws the cells that differ in frame (a runner.Frame). Only cells
+        active before or in the frame are looked at.
+        """
+        n = frame.n
+        ghosts, sentinels, money = {}, {}, dict(frame.loot)
+        for index, state, stamina, agent_money in frame.ghosts:
+            ghosts.setdefault(index, []).append((GHOST_IMAGES.get(state, "ghost"), stamina, agent_money))
+        for index, state, stamina, agent_money in frame.sentinels:
+            sentinels.setdefault(index, []).append((SENTINEL_IMAGES.get(state, "sentinel"), stamina, agent_money))
+        signatures = {cell: None for cell, signature in self.signatures.items() if signature is not None}
+        for index in set(money) | set(ghosts) | set(sentinels):
+            signatures[(index % n, index // n)] = (money.get(index, 0), tuple(ghosts.get(index, ())),
+                                                   tuple(sentinels.get(index, ())))
+        return self.apply(signatures)
+
+    def apply(self, signatures):
+        # Stores the new signatures of some cells and redraws those that changed
+        dirty = []
+        for cell, signature in signatures.items():
+            if signature != self.signatures[cell]:
+                self.signatures[cell] = signature
+                dirty.append(cell)
+        for cell in dirty:
+            self.redraw_cell(cell)
+        return dirty
+
+    def show(self, kore):
+        """
+        Switches to another Kore of the same map, e.g. a restored snapshot or
+        replay frame, and redraws the cells that differ from the last one.
+        """
+        self.kore = kore
+        self.cells = {parse_node_id(node.id): node for row in kore.nodes for node in row}
+        return self.update()
+
+    # --- Drawing ---
+
+    @staticmethod
+    def ghost_image_key(ghost):
+        return GHOST_IMAGES.get(ghost.state, "ghost")
+
+    @staticmethod
+    def sentinel_image_key(sentinel):
+        return SENTINEL_IMAGES.get(sentinel.state, "sentinel")
+
+    def cell_rect(self, cell):
+        node = self.cells[cell]
+        return pygame.Rect(node.position_x - self.cell_width // 2, node.position_y - self.cell_height // 2,
+                           self.cell_width, self.cell_height)
+
+    def redraw_cell(self, cell):
+        """
+        Repaints the area a cell can touch: the cell plus half a cell around it,
+        where its edge-cost labels sit. Neighbouring cells overlapping that
+        area are redrawn under a clip so the result matches a full redraw.
+        """
+        area = self.cell_rect(cell).inflate(self.cell_width, self.cell_height)
+        frame = self.frame
+        frame.set_clip(area)
+        frame.blit(self.static, area, area)
+        col, layer = cell
+        around = [(col + dx, layer + dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (col + dx, layer + dy) in self.cells]
+        for other in around:
+            self.draw_contents(other)
+        labels = set()
+        for other in around:
+            for edge in self.edges_by_cell[other]:
+                if edge not in labels and (self.is_active(edge[0]) or self.is_active(edge[1])):
+                    labels.add(edge)
+                    surface = self.glyph(str(edge[3]), COST_COLOR)
+                    frame.blit(surface, surface.get_rect(center=edge[2]))
+        for other in around:
+            node = self.cells[other]
+            surface = self.glyph(str(node.id), ID_COLOR)
+            rect = surface.get_rect()
+            rect.topleft = (node.position_x - self.cell_width // 2 + 4,
+                            node.position_y + self.cell_height // 2 - rect.height - 4)
+            frame.blit(surface, rect)
+        frame.set_clip(None)
+
+    def draw_contents(self, cell):
+        signature = self.signatures.get(cell)
+        if signature is None:
+            return
+        money, ghosts, sentinels = signature
+        node = self.cells[cell]
+        sprite_x = node.position_x - self.cell_width // 2
+        sprite_y = node.position_y - self.cell_height // 2
+        for image_key, stamina, agent_money in ghosts + sentinels:
+            self.draw_agent(self.images[image_key], stamina, agent_money, sprite_x, sprite_y)
+        if money > 0:
+            self.frame.blit(self.images["money"], (sprite_x, sprite_y))
+            surface = self.glyph(str(money), MONEY_COLOR)
+            self.frame.blit(surface, surface.get_rect(center=(node.position_x, node.position_y + self.cell_height // 6)))
+
+    def draw_agent(self, img, stamina, money, sprite_x, sprite_y):
+        frame = self.frame
+        bar_height = self.cell_height
+        frame.blit(img, (sprite_x, sprite_y))
+
+        # Draw stamina (red) and money (green) bars
+        stamina = max(0, min(stamina, 100))
+        money = max(0, min(money, 100))
+        bar_x = sprite_x + img.get_width() + BAR_OFFSET
+        bar_y = sprite_y
+
+        # Stamina bar (red)
+        stamina_bar_height = int(bar_height * (stamina / 100))
+        pygame.draw.rect(frame, (255, 0, 0),
+                         (bar_x, bar_y + bar_height - stamina_bar_height, BAR_WIDTH, stamina_bar_height))
+        pygame.draw.rect(frame, (100, 100, 100), (bar_x, bar_y, BAR_WIDTH, bar_height), 1)
+
+        # Money bar (green)
+        money_bar_height = int(bar_height * (money / 100))
+        pygame.draw.rect(frame, (0, 200, 0), (
+            bar_x + BAR_WIDTH + 2, bar_y + bar_height - money_bar_height, BAR_WIDTH, money_bar_height))
+        pygame.draw.rect(frame, (100, 100, 100), (bar_x + BAR_WIDTH + 2, bar_y, BAR_WIDTH, bar_height), 1)
+
+    def draw(self, screen):
+        screen.blit(self.frame, (0, 0))
@@ -0,0 +1,191 @@
+import json
+from snapshot import Snapshot
+from simulation import command_processor
+
+MAGIC = b"GGRPLY1\0"
+TURN = 1
+KEYFRAME = 2
+AGENT_TYPES = ["ghost", "sentinel"]
+
+# --- Varint helpers ---
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+def write_text(out, text):
+    encoded = text.encode("utf-8")
+    write_varint(out, len(encoded))
+    out += encoded
+
+def read_text(data, offset):
+    size, offset = read_varint(data, offset)
+    return bytes(data[offset:offset + size]).decode("utf-8"), offset + size
+
+def zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+def unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+# --- Recording ---
+
+class ReplayRecorder:
+    """
+    Simulation observer that streams every turn's commands to a replay file,
+    after the initial snapshot and seed. Agent ids and command strings are
+    interned on first use; each entry is the zigzag delta of the agent number
+    from the previous entry plus the command number, all as varints. A full
+    snapshot is written every keyframe_every turns so players can seek.
+    """
+    def __init__(self, path, simulation, seed=None, keyframe_every=50):
+        self.file = open(path, "wb")
+        self.keyframe_every = keyframe_every
+        self.agents = {}
+        self.commands = {}
+        header = bytearray(MAGIC)
+        write_varint(header, keyframe_every)
+        write_text(header, json.dumps(seed if isinstance(seed, (int, str)) else None))
+        self.file.write(header)
+        self.write_keyframe(simulation.turn - 1, simulation.kore)
+        simulation.add_observer(self)
+
+    def write_keyframe(self, turn, kore):
+        out = bytearray([KEYFRAME])
+        write_varint(out, turn)
+        data = Snapshot.of(kore).to_bytes()
+        write_varint(out, len(data))
+        self.file.write(out)
+        self.file.write(data)
+
+    def _intern(self, table, key, new):
+        number = table.get(key)
+        if number is None:
+            number = table[key] = len(table)
+            new.append(key)
+        return number
+
+    def __call__(self, simulation):
+        turn = simulation.turn - 1
+        new_agents, new_commands, entries = [], [], bytearray()
+        previous = 0
+        for agent_id, agent_type, command, replica_id in simulation.commands:
+            agent = self._intern(self.agents, (agent_id, agent_type), new_agents)
+            write_varint(entries, zigzag(agent - previous))
+            write_varint(entries, self._intern(self.commands, command, new_commands))
+            if command == "replicate":
+                # Replica number + 1, 0 when the replication failed
+                replica = 0 if replica_id is None else self._intern(self.agents, (replica_id, "ghost"), new_agents) + 1
+                write_varint(entries, replica)
+            previous = agent
+
+        out = bytearray([TURN])
+        write_varint(out, turn)
+        write_varint(out, len(new_agents))
+        for agent_id, agent_type in new_agents:
+            out.append(AGENT_TYPES.index(agent_type))
+            write_text(out, agent_id)
+        write_varint(out, len(new_commands))
+        for command in new_commands:
+            write_text(out, command)
+        write_varint(out, len(simulation.commands))
+        self.file.write(out)
+        self.file.write(entries)
+        if turn % self.keyframe_every == 0 or simulation.finished:
+            self.write_keyframe(turn, simulation.kore)
+        if simulation.finished:
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+# --- Playback ---
+
+class ReplayPlayer:
+    """
+    Plays a replay file back by re-applying the recorded commands with
+    command_processor; the AI is never run. seek(turn) restores the closest
+    keyframe at or before turn and applies only the turns after it.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a GhostGrid replay")
+        offset = len(MAGIC)
+        self.keyframe_every, offset = read_varint(data, offset)
+        seed, offset = read_text(data, offset)
+        self.seed = json.loads(seed)
+        self.keyframes = {}   # turn -> snapshot bytes (state after that turn)
+        self.turns = {}       # turn -> [(agent_id, agent_type, command, replica_id)]
+        agents, commands = [], []
+        view = memoryview(data)
+        while offset < len(data):
+            kind = data[offset]
+            turn, offset = read_varint(data, offset + 1)
+            if kind == KEYFRAME:
+                size, offset = read_varint(data, offset)
+                self.keyframes[turn] = view[offset:offset + size]
+                offset += size
+                continue
+            count, offset = read_varint(data, offset)
+            for _ in range(count):
+                agent_type = AGENT_TYPES[data[offset]]
+                agent_id, offset = read_text(data, offset + 1)
+                agents.append((agent_id, agent_type))
+            count, offset = read_varint(data, offset)
+            for _ in range(count):
+                command, offset = read_text(data, offset)
+                commands.append(command)
+            count, offset = read_varint(data, offset)
+            entries = []
+            agent = 0
+            for _ in range(count):
+                delta, offset = read_varint(data, offset)
+                agent += unzigzag(delta)
+                number, offset = read_varint(data, offset)
+                command = commands[number]
+                replica_id = None
+                if command == "replicate":
+                    replica, offset = read_varint(data, offset)
+                    replica_id = agents[replica - 1][0] if replica else None
+                entries.append(agents[agent] + (command, replica_id))
+            self.turns[turn] = entries
+        self.last_turn = max(list(self.turns) + list(self.keyframes))
+        self.kore = None
+        self.turn = None
+
+    def seek(self, turn):
+        """Returns the Kore as it was at the end of turn (0 is the initial state)."""
+        turn = max(0, min(turn, self.last_turn))
+        if self.turn is None or turn < self.turn or self._keyframe_before(turn) > self.turn:
+            start = self._keyframe_before(turn)
+            self.kore = Snapshot.from_bytes(self.keyframes[start]).restore()
+            self.turn = start
+        while self.turn < turn:
+            self.step()
+        return self.kore
+
+    def _keyframe_before(self, turn):
+        return max(t for t in self.keyframes if t <= turn)
+
+    def step(self):
+        """Applies the next recorded turn."""
+        if self.kore is None:
+            self.seek(0)
+        self.turn += 1
+        for agent_id, agent_type, command, replica_id in self.turns.get(self.turn, ()):
+            command_processor(agent_id, agent_type, command, self.kore, replica_id=replica_id)
+        return self.kore
@@ -0,0 +1,105 @@
+import threading
+import time
+from Node import parse_node_id
+
+class Frame:
+    """
+    What the renderer needs of one turn, copied out of the Kore by the
+    simulation thread: loot as (node index, money) and agents as (node
+    index, state, stamina, money), each node's agents in drawing order.
+    Built from the Kore's live summaries, so it costs O(agents + loot
+    nodes) rather than O(grid). Never modified once published.
+    """
+    __slots__ = ("turn", "n", "loot", "ghosts", "sentinels")
+
+    def __init__(self, turn, n, loot, ghosts, sentinels):
+        self.turn = turn
+        self.n = n
+        self.loot = loot
+        self.ghosts = ghosts
+        self.sentinels = sentinels
+
+    @classmethod
+    def of(cls, kore, turn):
+        n = kore.n
+
+        def index(node):
+            col, layer = parse_node_id(node.id)
+            return layer * n + col
+
+        loot = tuple(sorted((index(node), node.money) for node in kore.money_nodes.values() if node.money > 0))
+        occupied = {node.id: node for _, node in kore.agent_index.values()}
+        ghosts = tuple((index(node), g.state, g.stamina, g.money)
+                       for node in occupied.values() for g in node.ghosts)
+        sentinels = tuple((index(node), s.state, s.stamina, s.money)
+                          for node in occupied.values() for s in node.sentinels)
+        return cls(turn, n, loot, ghosts, sentinels)
+
+class FrameBuffer:
+    """
+    Latest Frame published by the simulation thread. The writer builds the
+    next frame on its own and swaps it in under a lock, so a reader keeps
+    drawing the frame it holds while the next one is being made and never
+    sees a partial one. Every swap bumps version, letting readers skip
+    frames they already have.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.frame = None
+        self.version = 0
+
+    def publish(self, frame):
+        with self.lock:
+            self.frame = frame
+            self.version += 1
+
+    def read(self, since=None):
+        """(version, frame), or None if the buffer is empty or still at version since."""
+        with self.lock:
+            if self.frame is None or self.version == since:
+                return None
+            return self.version, self.frame
+
+class SimulationThread(threading.Thread):
+    """
+    Plays a Simulation on its own thread, one turn every turn_interval
+    seconds (0 runs unthrottled, as does fast_forward), publishing a Frame
+    to buffer after every turn. A slow turn delays the next one instead of
+    the display; turns the reader did not get to are skipped.
+    Observers of the simulation run on this thread.
+    """
+    def __init__(self, simulation, turn_interval=1.0, buffer=None):
+        super().__init__(name="simulation", daemon=True)
+        self.simulation = simulation
+        self.turn_interval = turn_interval
+        self.fast_forward = False
+        self.buffer = buffer or FrameBuffer()
+        self.stopping = threading.Event()
+        self.finished = False
+        self.publish()
+
+    def publish(self):
+        self.buffer.publish(Frame.of(self.simulation.kore, self.simulation.turn))
+
+    def run(self):
+        next_turn = time.perf_counter() + self.turn_interval
+        try:
+            while not self.stopping.is_set():
+                if self.turn_interval and not self.fast_forward:
+                    wait = next_turn - time.perf_counter()
+                    if wait > 0 and self.stopping.wait(wait):
+                        break
+                    # Behind schedule after a slow turn: carry on, without catching up
+                    next_turn = max(next_turn, time.perf_counter()) + self.turn_interval
+                game_over = self.simulation.step()
+                self.publish()
+                if game_over:
+                    break
+        finally:
+            self.finished = True
+
+    def stop(self, timeout=None):
+        """Stops after the turn in progress and waits for the thread."""
+        self.stopping.set()
+        if self.is_alive():
+            self.join(timeout)
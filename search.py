@@ -0,0 +1,136 @@
+import heapq
+import time
+import instrumentation
+from Node import parse_node_id
+
+# --- Shared A* ---
+
+# Expansions between two looks at the clock
+DEADLINE_CHECK = 8
+# Heuristic weights tried in turn by anytime_a_star, ending with plain A*
+ANYTIME_WEIGHTS = (3.0, 1.5, 1.0)
+
+def a_star(start_id, is_goal, neighbors, heuristic, stats=None, deadline=None, weight=1.0):
+    """
+    A* over node ids with a lazily-deleted binary heap.
+    neighbors(node_id) yields (neighbor_id, cost) pairs and heuristic(node_id)
+    estimates the remaining cost. Improved nodes are pushed again instead of
+    searched for in the heap; outdated entries are skipped when popped.
+    Returns the list of node ids from start to goal, or None.
+    If a stats dict is given, the number of expanded nodes is added to stats["expanded"].
+    With weight > 1 the heuristic is inflated (weighted A*): fewer expansions,
+    paths at most weight times the optimum. If the deadline expires first, the
+    path to the expanded node with the lowest heuristic is returned instead.
+    """
+    return _search(start_id, is_goal, neighbors, heuristic, stats, deadline, weight)[0]
+
+def _search(start_id, is_goal, neighbors, heuristic, stats, deadline, weight):
+    # Returns (path, complete); complete is False for a best-so-far path
+    probe = instrumentation.ACTIVE
+    started = time.perf_counter() if probe.enabled else 0.0
+    open_set = [(heuristic(start_id), start_id)]
+    came_from = {}
+    g_score = {start_id: 0}
+    closed = set()
+    expanded = 0
+    heappop, heappush = heapq.heappop, heapq.heappush
+    inf = float('inf')
+    best_id, best_h = start_id, open_set[0][0]
+    path, complete = None, True
+
+    while open_set:
+        _, current_id = heappop(open_set)
+        if current_id in closed:
+            continue  # outdated entry, a cheaper one was already expanded
+        closed.add(current_id)
+        expanded += 1
+
+        if is_goal(current_id):
+            path = reconstruct_path(came_from, current_id)
+            break
+
+        if deadline is not None:
+            h = heuristic(current_id)
+            if h < best_h:
+                best_id, best_h = current_id, h
+            if expanded % DEADLINE_CHECK == 0 and deadline.expired():
+                path, complete = reconstruct_path(came_from, best_id), False
+                break
+
+        current_g = g_score[current_id]
+        for neighbor_id, cost in neighbors(current_id):
+            tentative_g_score = current_g + cost
+            if tentative_g_score < g_score.get(neighbor_id, inf):
+                came_from[neighbor_id] = current_id
+                g_score[neighbor_id] = tentative_g_score
+                # Reopen if needed: the heuristics used here are not always consistent
+                closed.discard(neighbor_id)
+                heappush(open_set, (tentative_g_score + weight * heuristic(neighbor_id), neighbor_id))
+
+    if stats is not None:
+        stats["expanded"] = stats.get("expanded", 0) + expanded
+    if probe.enabled:
+        probe.add_time("a_star", time.perf_counter() - started)
+        probe.count("expanded", expanded)
+    return path, complete
+
+def anytime_a_star(start_id, is_goal, neighbors, heuristic, deadline, stats=None, weights=ANYTIME_WEIGHTS):
+    """
+    Restarting weighted A*: a quick, greedy pass first and then passes with
+    smaller weights while the deadline allows, keeping the cheapest complete
+    path found. If not even the first pass completes, its best-so-far partial
+    path is returned; the result is None only when the goal is unreachable.
+    """
+    best, best_cost, partial = None, float('inf'), None
+    for weight in weights:
+        path, complete = _search(start_id, is_goal, neighbors, heuristic, stats, deadline, weight)
+        if not complete:
+            partial = partial or path
+            break
+        if path is None:
+            return None
+        cost = path_cost(path, neighbors)
+        if cost < best_cost:
+            best, best_cost = path, cost
+        if deadline.expired():
+            break
+    return best if best is not None else partial
+
+def path_cost(path, neighbors):
+    return sum(dict(neighbors(a))[b] for a, b in zip(path, path[1:]))
+
+def reconstruct_path(came_from, current_id):
+    total_path = [current_id]
+    while current_id in came_from:
+        current_id = came_from[current_id]
+        total_path.append(current_id)
+    total_path.reverse()
+    return total_path
+
+def kore_neighbors(kore):
+    """
+    Neighbor function for a_star over a Kore (or any object with the same
+    node interface). Compact maps are read straight from the CSR arrays.
+    """
+    graph = getattr(kore, "graph", None)
+    if graph is not None and getattr(kore, "compact", False):
+        ids, index_of = graph.ids, graph.index_of
+
+        def neighbors(node_id):
+            return [(ids[target], cost) for target, cost in graph.neighbors(index_of(node_id))]
+        return neighbors
+
+    get_node_by_id = kore.get_node_by_id
+
+    def neighbors(node_id):
+        node = get_node_by_id(node_id)
+        return [(conn.node_b, conn.cost) for conn in node.connections if get_node_by_id(conn.node_b)]
+    return neighbors
+
+def manhattan_to(goal_id):
+    gx, gy = parse_node_id(goal_id)
+
+    def heuristic(node_id):
+        x, y = parse_node_id(node_id)
+        return abs(x - gx) + abs(y - gy)
+    return heuristic
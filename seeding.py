@@ -0,0 +1,13 @@
+import random
+
+def make_rng(seed=None):
+    """
+    Normalizes a seed argument: None keeps the global random module, a plain
+    seed value creates a new random.Random, and an existing generator
+    (a random.Random or the random module itself) is used as is.
+    """
+    if seed is None:
+        return random
+    if isinstance(seed, (int, float, str, bytes, bytearray)):
+        return random.Random(seed)
+    return seed
@@ -1,5 +1,5 @@
-import heapq
-import math
+from Node import parse_node_id
+from search import a_star, anytime_a_star, kore_neighbors, manhattan_to
 
 # --- Perception Functions ---
 
@@ -12,7 +12,22 @@ def perceive_world(sentinel_id, kore):
         return None, None, [], [], []
 
     current_node = kore.get_node_by_position(sentinel_agent.position_x, sentinel_agent.position_y)
-    
+
+    if hasattr(kore, "ghost_nodes") and hasattr(sentinel_agent, "visit"):
+        # Incremental path: Kore keeps the ghost and money summaries live and
+        # the sentinel keeps its unexplored set as the complement of its memory
+        if sentinel_agent.unexplored_nodes is None:
+            sentinel_agent.unexplored_nodes = {
+                node.id: node for row in kore.nodes for node in row if node.id not in sentinel_agent.visited_nodes
+            }
+        if current_node:
+            sentinel_agent.visit(current_node.id)
+        # Live views, in no particular order; find_nearest_target answers the
+        # grid-ordered nearest query from Kore's spatial indexes
+        ghost_locations = kore.ghost_nodes.values()
+        money_locations = kore.money_nodes.values()
+        return sentinel_agent, current_node, ghost_locations, money_locations, sentinel_agent.unexplored_nodes.values()
+
     # Update memory
     if current_node:
         sentinel_agent.visited_nodes.add(current_node.id)
@@ -38,58 +53,38 @@ def heuristic(node_a, node_b):
     Calculates the Manhattan distance between two nodes.
     Used as the heuristic for the A* algorithm.
     """
-    x1, y1 = map(int, node_a.id.split(','))
-    x2, y2 = map(int, node_b.id.split(','))
+    x1, y1 = parse_node_id(node_a.id)
+    x2, y2 = parse_node_id(node_b.id)
     return abs(x1 - x2) + abs(y1 - y2)
 
-def a_star_search(kore, start_node, goal_node):
+def a_star_search(kore, start_node, goal_node, stats=None, deadline=None):
     """
     Finds the shortest path from start_node to goal_node using the A* algorithm.
+    With a deadline it runs anytime A* and may return a best-so-far path.
     """
-    open_set = []
-    heapq.heappush(open_set, (0, start_node.id))
-    
-    came_from = {}
-    g_score = {node.id: float('inf') for row in kore.nodes for node in row}
-    g_score[start_node.id] = 0
-    
-    f_score = {node.id: float('inf') for row in kore.nodes for node in row}
-    f_score[start_node.id] = heuristic(start_node, goal_node)
-    
-    while open_set:
-        _, current_id = heapq.heappop(open_set)
-        current_node = kore.get_node_by_id(current_id)
-
-        if current_id == goal_node.id:
-            return reconstruct_path(came_from, current_id)
+    goal_id = goal_node.id
+    search = a_star if deadline is None else anytime_a_star
+    return search(start_node.id, lambda node_id: node_id == goal_id,
+                  kore_neighbors(kore), manhattan_to(goal_id), deadline=deadline, stats=stats)
 
-        for conn in current_node.connections:
-            neighbor_id = conn.node_b
-            neighbor_node = kore.get_node_by_id(neighbor_id)
-            
-            if not neighbor_node:
-                continue
-                
-            tentative_g_score = g_score[current_id] + conn.cost
-            
-            if tentative_g_score < g_score[neighbor_id]:
-                came_from[neighbor_id] = current_id
-                g_score[neighbor_id] = tentative_g_score
-                f_score[neighbor_id] = g_score[neighbor_id] + heuristic(neighbor_node, goal_node)
-                if neighbor_id not in [i[1] for i in open_set]:
-                    heapq.heappush(open_set, (f_score[neighbor_id], neighbor_id))
-                    
-    return None # No path found
-
-def reconstruct_path(came_from, current_id):
+def find_path(kore, start_node, goal_node, deadline=None):
     """
-    Reconstructs the path from the came_from dictionary.
+    Shortest path from start_node to goal_node. Uses the Kore distance cache
+    when the map provides one, so repeated queries become table lookups,
+    and falls back to A* otherwise. Under a deadline the cache is only read
+    when it already holds a tree for the pair; a full Dijkstra could overrun,
+    so anytime A* answers instead.
     """
-    total_path = [current_id]
-    while current_id in came_from:
-        current_id = came_from[current_id]
-        total_path.insert(0, current_id)
-    return total_path
+    get_path_cache = getattr(kore, "get_path_cache", None)
+    cache = get_path_cache() if get_path_cache else None
+    if cache is None:
+        return a_star_search(kore, start_node, goal_node, deadline=deadline)
+    graph = kore.graph
+    source, target = graph.index_of(start_node.id), graph.index_of(goal_node.id)
+    if deadline is not None and not cache.has_route(source, target):
+        return a_star_search(kore, start_node, goal_node, deadline=deadline)
+    path = cache.route(source, target)
+    return None if path is None else [graph.ids[index] for index in path]
 
 # --- Decision Making & Main Turn Function ---
 
@@ -111,12 +106,27 @@ def find_best_target(sentinel_node, ghosts, money, unexplored):
     closest_target = min(targets, key=lambda target: heuristic(sentinel_node, target))
     return closest_target
 
+def find_nearest_target(kore, sentinel, sentinel_node):
+    """
+    Same priority and tie-breaking as find_best_target, answered from the
+    Kore spatial indexes instead of a scan over every candidate.
+    """
+    col, layer = parse_node_id(sentinel_node.id)
+    if kore.ghost_nodes:
+        return kore.ghost_nodes[kore.ghost_index.nearest(col, layer)]
+    if kore.money_nodes:
+        return kore.money_nodes[kore.money_index.nearest(col, layer)]
+    unexplored = sentinel.unexplored_nodes
+    if unexplored:
+        return kore.nearest_node(col, layer, lambda node: node.id in unexplored)
+    return None
+
 def get_move_command(current_node, next_node_id):
     """
     Translates a move from the current node to the next node into a command string.
     """
-    cx, cy = map(int, current_node.id.split(','))
-    nx, ny = map(int, next_node_id.split(','))
+    cx, cy = parse_node_id(current_node.id)
+    nx, ny = parse_node_id(next_node_id)
     
     h_move = nx - cx
     v_move = ny - cy
@@ -135,9 +145,10 @@ def get_move_command(current_node, next_node_id):
     return move_map.get((v_move, h_move), "rest")
 
 
-def sentinel_turn(sentinel_id, kore):
+def sentinel_turn(sentinel_id, kore, deadline=None):
     """
-    Main logic function for a sentinel's turn.
+    Main logic function for a sentinel's turn. The path search honours the
+    deadline (see find_path).
     """
     # 1. Perceive the world
     sentinel, current_node, ghosts, money, unexplored = perceive_world(sentinel_id, kore)
@@ -152,12 +163,15 @@ def sentinel_turn(sentinel_id, kore):
         return "capture"
 
     # 3. Decision Making: Find a target and a path
-    target_node = find_best_target(current_node, ghosts, money, unexplored)
+    if hasattr(kore, "ghost_index") and sentinel.unexplored_nodes is not None:
+        target_node = find_nearest_target(kore, sentinel, current_node)
+    else:
+        target_node = find_best_target(current_node, ghosts, money, unexplored)
     
     if not target_node:
         return "rest" # No targets found, rest to regain stamina
 
-    path = a_star_search(kore, current_node, target_node)
+    path = find_path(kore, current_node, target_node, deadline)
     
     # 4. Execute action
     if path and len(path) > 1:
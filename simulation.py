@@ -0,0 +1,590 @@
+from kore import Kore
+from seeding import make_rng
+from events import EventLog, NULL_LOG, DEBUG, INFO, WARNING
+from AgentState import AgentState
+from Ghost import Ghost
+from Sentinel import Sentinel
+from ghost_method import get_move_command, ghost_turn
+from sentinel_method import find_path, sentinel_turn
+from coordination import assign_targets
+from deadline import Deadline, DeadlineMetrics
+from instrumentation import NULL_INSTRUMENTS
+
+def gen_name(kind="ghost", rng=None):
+    rng = make_rng(rng)
+    if kind == "ghost":
+        ADJECTIVES = [
+            "Spooky", "Misty", "Creepy", "Silent", "Ghastly", "Shadow", "Eerie", "Phantom", "Wailing", "Flickering"
+        ]
+        NOUNS = [
+            "Wisp", "Shade", "Specter", "Spirit", "Apparition", "Haunt", "Poltergeist", "Banshee", "Revenant", "Shade"
+        ]
+    elif kind == "sentinel":
+        ADJECTIVES = [
+            "Iron", "Brave", "Steadfast", "Vigilant", "Bold", "Silent", "Stalwart", "Fierce", "Lone", "Swift"
+        ]
+        NOUNS = [
+            "Guardian", "Watcher", "Protector", "Warden", "Sentinel", "Defender", "Keeper", "Patroller", "Scout", "Shield"
+        ]
+    else:
+        raise ValueError("Unknown kind for name generation")
+    adjective = rng.choice(ADJECTIVES)
+    noun = rng.choice(NOUNS)
+    number = rng.randint(1, 99)
+    return f"{adjective}{noun}{number}"
+
+def testing_set(kore, rng=None):
+    rng = make_rng(rng)
+    all_nodes = [node for row in kore.nodes for node in row]
+    ghost_nodes = rng.sample(all_nodes, 12)
+    for node in ghost_nodes:
+        ghost = Ghost(gen_name("ghost", rng), node.position_x, node.position_y, 0, False, False, 100)
+        kore.add_agent(ghost, node)
+    money_left = 100
+    for i, node in enumerate(ghost_nodes):
+        if i == 4:
+            kore.add_money(node, money_left)
+        else:
+            amount = rng.randint(0, money_left)
+            kore.add_money(node, amount)
+            money_left -= amount
+    sleeping_ghosts = rng.choices(ghost_nodes, k=2)
+    for node in sleeping_ghosts:
+        node.ghosts[0].state = AgentState.SLEEPING
+
+    deathghosts = rng.choices(ghost_nodes, k=2)
+    for node in deathghosts:
+        node.ghosts[0].state = AgentState.DEAD
+
+    sentinel_nodes = rng.choices(all_nodes, k=10)
+    for node in sentinel_nodes:
+        sentinel = Sentinel(gen_name("sentinel", rng), node.position_x, node.position_y, 0, False, False, 100)
+        kore.add_agent(sentinel, node)
+
+    if len(sentinel_nodes) >= 4:
+        # Resting wins over greedy when both land on the same sentinel
+        sentinel_nodes[2].sentinels[0].state = AgentState.GREEDY
+        sentinel_nodes[3].sentinels[0].state = AgentState.GREEDY
+        sentinel_nodes[0].sentinels[0].state = AgentState.RESTING
+        sentinel_nodes[1].sentinels[0].state = AgentState.RESTING
+
+    money_nodes = rng.sample(all_nodes, 5)
+    for node in money_nodes:
+        kore.add_money(node, rng.randint(10, 50))
+
+
+def test_agent(kore, agent_type, num_agents=1, rng=None, log=NULL_LOG):
+    """
+    Crea un número específico de agentes de un tipo y los coloca en sus
+    capas de inicio correctas, distribuyéndolos aleatoriamente dentro de esa capa.
+    """
+    rng = make_rng(rng)
+    if agent_type == "ghost":
+        # REGLA 1: Los Ghosts solo pueden aparecer en la capa 0.
+        layer_index = 0
+        spawn_nodes = [row[layer_index] for row in kore.nodes]
+        
+        # Reparte el botín inicial entre el número de Ghosts a crear.
+        initial_money = 100 // num_agents if num_agents > 0 else 100
+
+        for i in range(num_agents):
+            # Elige un nodo aleatorio DIFERENTE para cada Ghost dentro de la capa 0.
+            node = rng.choice(spawn_nodes)
+            ghost_id = f"ghost_{i+1}"
+            ghost = Ghost(ghost_id, node.position_x, node.position_y, initial_money)
+            kore.add_agent(ghost, node)
+            log.emit(INFO, "spawn", agent_type="Ghost", agent=ghost_id, node=node.id, layer=layer_index)
+
+    elif agent_type == "sentinel":
+        # REGLA 2: Los Sentinels solo pueden aparecer en la capa n-1.
+        # El índice de la penúltima capa. Se resta 2 porque los índices empiezan en 0.
+        layer_index = len(kore.nodes[0]) - 2 
+        
+        # Nos aseguramos de que el índice no sea negativo si el mapa es muy pequeño.
+        if layer_index < 0:
+            layer_index = 0
+            
+        spawn_nodes = [row[layer_index] for row in kore.nodes]
+
+        for i in range(num_agents):
+            # Elige un nodo aleatorio DIFERENTE para cada Sentinel dentro de su capa.
+            node = rng.choice(spawn_nodes)
+            sentinel_id = f"sentinel_{i+1}"
+            sentinel = Sentinel(sentinel_id, node.position_x, node.position_y)
+            kore.add_agent(sentinel, node)
+            log.emit(INFO, "spawn", agent_type="Sentinel", agent=sentinel_id, node=node.id, layer=layer_index)
+
+def ghost_command_processor(agent, command, kore, log=NULL_LOG):
+    current_agent = kore.get_agent_by_id(agent)
+    current_node = kore.get_node_by_position(current_agent.position_x, current_agent.position_y)
+
+    move_map = {
+        "move-r": (0, 1),
+        "move-l": (0, -1),
+        "move-d": (1, 0),
+        "move-u": (-1, 0),
+        "move-ur": (-1, 1),
+        "move-dr": (1, 1),
+        "move-ul": (-1, -1),
+        "move-ud": (1, -1),
+        "move-dl": (1, -1),
+    }
+
+    if command in move_map:
+        v, h = move_map[command]
+        dest_node = kore.get_node_by_move(current_node.id, v, h)
+        if dest_node:
+            moved = kore.move(current_node.id, dest_node.id, current_agent.id)
+            if log.enabled(INFO):
+                log.emit(INFO, "move", agent=current_agent.id, origin=current_node.id, dest=dest_node.id, moved=moved)
+        else:
+            log.emit(WARNING, "invalid", agent=current_agent.id, command=command, reason="Invalid move.")
+    elif command == "rest":
+        current_agent.stamina = min(100, current_agent.stamina + 10)
+        if log.enabled(INFO):
+            log.emit(INFO, "rest", agent=current_agent.id, stamina=current_agent.stamina)
+    elif command.startswith("drop-"):
+        try:
+            amount = int(command.split("-")[1])
+            if current_agent.money >= amount:
+                current_agent.money -= amount
+                kore.add_money(current_node, amount)
+                log.emit(INFO, "drop", agent=current_agent.id, node=current_node.id, amount=amount)
+            else:
+                log.emit(WARNING, "invalid", agent=current_agent.id, command=command, reason="Not enough money to drop.")
+        except Exception:
+            log.emit(WARNING, "invalid", agent=current_agent.id, command=command, reason="Invalid drop command.")
+    elif command.startswith("take-"):
+        try:
+            amount = int(command.split("-")[1])
+            if current_node.money >= amount:
+                kore.add_money(current_node, -amount)
+                current_agent.money += amount
+                log.emit(INFO, "take", agent=current_agent.id, node=current_node.id, amount=amount)
+            else:
+                log.emit(WARNING, "invalid", agent=current_agent.id, command=command, reason="Not enough money in node.")
+        except Exception:
+            log.emit(WARNING, "invalid", agent=current_agent.id, command=command, reason="Invalid take command.")
+    else:
+        log.emit(WARNING, "invalid", agent=current_agent.id, command=command, reason="Unknown command.")
+
+def sentinel_command_processor(agent, command, kore, log=NULL_LOG):
+    current_agent = kore.get_agent_by_id(agent)
+    current_node = kore.get_node_by_position(current_agent.position_x, current_agent.position_y)
+
+    move_map = {
+        "move-r": (0, 1),
+        "move-l": (0, -1),
+        "move-d": (1, 0),
+        "move-u": (-1, 0),
+        "move-ur": (-1, 1),
+        "move-dr": (1, 1),
+        "move-ul": (-1, -1),
+        "move-ud": (1, -1),
+        "move-dl": (1, -1),
+    }
+
+    if command in move_map:
+        v, h = move_map[command]
+        dest_node = kore.get_node_by_move(current_node.id, v, h)
+        if dest_node:
+            moved = kore.move(current_node.id, dest_node.id, current_agent.id)
+            if log.enabled(INFO):
+                log.emit(INFO, "move", agent=current_agent.id, origin=current_node.id, dest=dest_node.id, moved=moved)
+        else:
+            log.emit(WARNING, "invalid", agent=current_agent.id, command=command, reason="Invalid move.")
+    elif command == "rest":
+        current_agent.stamina = min(100, current_agent.stamina + 10)
+        if log.enabled(INFO):
+            log.emit(INFO, "rest", agent=current_agent.id, stamina=current_agent.stamina)
+    elif command.startswith("drop-"):
+        try:
+            amount = int(command.split("-")[1])
+            if current_agent.money >= amount:
+                current_agent.money -= amount
+                kore.add_money(current_node, amount)
+                log.emit(INFO, "drop", agent=current_agent.id, node=current_node.id, amount=amount)
+            else:
+                log.emit(WARNING, "invalid", agent=current_agent.id, command=command, reason="Not enough money to drop.")
+        except Exception:
+            log.emit(WARNING, "invalid", agent=current_agent.id, command=command, reason="Invalid drop command.")
+    elif command.startswith("take-"):
+        try:
+            amount = int(command.split("-")[1])
+            if current_node.money >= amount:
+                kore.add_money(current_node, -amount)
+                current_agent.money += amount
+                log.emit(INFO, "take", agent=current_agent.id, node=current_node.id, amount=amount)
+            else:
+                log.emit(WARNING, "invalid", agent=current_agent.id, command=command, reason="Not enough money in node.")
+        except Exception:
+            log.emit(WARNING, "invalid", agent=current_agent.id, command=command, reason="Invalid take command.")
+    elif command == "capture":
+        # Game rule, not in the original command set (where "capture" was an
+        # unknown command): every ghost on the sentinel's node is removed and
+        # its loot goes to the sentinel. This ends games that used to run to
+        # max_turns, so results differ from the original engine.
+        for ghost in list(current_node.ghosts):
+            ghost.captured = True
+            current_agent.money += ghost.money
+            ghost.money = 0
+            kore.remove_agent(ghost.id)
+            log.emit(INFO, "capture", agent=current_agent.id, ghost=ghost.id, node=current_node.id)
+    else:
+        log.emit(WARNING, "invalid", agent=current_agent.id, command=command, reason="Unknown command.")
+
+def command_processor(agent_id, agent_type, command, kore, rng=None, log=NULL_LOG, replica_id=None):
+    """
+    Procesa un comando para un agente específico, manejando acciones especiales
+    como la replicación antes de delegar a los procesadores específicos.
+    Devuelve el id de la réplica creada por 'replicate' (None en otro caso);
+    replica_id lo fija en lugar de sortearlo, para reproducir partidas.
+    """
+    # --- MANEJO DE COMANDOS ESPECIALES ---
+    
+    # El comando 'replicate' es manejado aquí directamente porque altera
+    # el estado del juego creando un nuevo agente.
+    if command == "replicate" and agent_type == "ghost":
+        ghost = kore.get_agent_by_id(agent_id)
+        # Verifica que el Ghost exista y tenga suficiente botín para dividirse
+        if ghost and ghost.money > 1:
+            # Divide el botín entre el original y la réplica
+            original_money = ghost.money // 2
+            replica_money = ghost.money - original_money
+            ghost.money = original_money
+
+            # Crea la nueva réplica con un ID único
+            if replica_id is None:
+                replica_id = f"{ghost.id}_r{make_rng(rng).randint(1, 999)}"
+            replica = Ghost(replica_id, ghost.position_x, ghost.position_y, replica_money)
+            
+            # Añade la réplica al mismo nodo en el que se encuentra el original
+            current_node = kore.get_agent_node(ghost.id)
+            if current_node:
+                kore.add_agent(replica, current_node)
+                log.emit(INFO, "replicate", agent=ghost.id, replica=replica_id, node=current_node.id)
+                return replica_id
+        
+        # Una vez manejada la replicación, no se hace nada más en este turno.
+        return None
+
+    # --- DELEGACIÓN A PROCESADORES ESPECÍFICOS ---
+    
+    # Si el comando no es uno especial, se delega al procesador correspondiente.
+    if agent_type == "ghost":
+        ghost_command_processor(agent_id, command, kore, log)
+    elif agent_type == "sentinel":
+        sentinel_command_processor(agent_id, command, kore, log)
+    return None
+
+def sentinel_command(sentinel_id, kore, start_node, target_node, deadline=None):
+    """
+    Comando de un Sentinel dado el objetivo que le tocó en el reparto
+    cooperativo (None si no hay Ghosts a la vista).
+    """
+    if target_node is start_node:
+        # Ya está sobre su objetivo: captura a los Ghosts que queden
+        return "capture" if start_node.ghosts else "rest"
+    if target_node:
+        # Ruta al objetivo ASIGNADO, leída del árbol usado para el coste
+        path = find_path(kore, start_node, target_node, deadline)
+        if path and len(path) > 1:
+            # Si hay ruta, se genera el comando de movimiento
+            return get_move_command(start_node, path[1])
+        return "rest" # Comando por defecto si no se puede hacer nada
+    # Si no hay Ghosts, cada Sentinel usa su propia lógica individual
+    # (buscar botín, explorar, etc.)
+    return sentinel_turn(sentinel_id, kore, deadline)
+
+def resolve_commands(decisions, agent_type, kore, rng=None, log=NULL_LOG):
+    """
+    Aplica de una vez los comandos decididos en simultáneo (sobre el mismo
+    estado congelado), en el orden dado. Reglas de conflicto: el botín de un
+    nodo es del primero que lo toma; los siguientes descansan en su lugar.
+    Devuelve (agent_id, agent_type, command, replica_id) de cada comando aplicado.
+    """
+    applied = []
+    for agent_id, command in decisions:
+        if kore.get_agent_by_id(agent_id) is None:
+            continue
+        if command.startswith("take-"):
+            node = kore.get_agent_node(agent_id)
+            amount = command.split("-")[1]
+            if amount.isdigit() and node.money < int(amount):
+                command = "rest"
+        if log.enabled(DEBUG):
+            log.emit(DEBUG, "decision", agent_type=agent_type.capitalize(), agent=agent_id, command=command)
+        replica_id = command_processor(agent_id, agent_type, command, kore, rng, log)
+        applied.append((agent_id, agent_type, command, replica_id))
+    return applied
+
+def game_totals(kore):
+    """
+    Escanea el estado actual del juego: Ghosts activos, botín recuperado por
+    los Sentinels y botín asegurado por los Ghosts en la capa final.
+    """
+    active_ghosts = [g for row in kore.nodes for node in row for g in node.ghosts if not g.captured]
+    total_loot_sentinels = sum(s.money for row in kore.nodes for node in row for s in node.sentinels)
+    
+    # --- CÓDIGO CORREGIDO ---
+    # Se calcula el índice de la capa final (última columna)
+    final_layer_index = len(kore.nodes[0]) - 1
+    # Se obtienen todos los nodos de esa última capa (columna)
+    final_layer_nodes = [row[final_layer_index] for row in kore.nodes]
+    # Se suma el botín solo de los nodos en esa capa
+    total_loot_ghosts_goal = sum(node.money for node in final_layer_nodes)
+    return active_ghosts, total_loot_sentinels, total_loot_ghosts_goal
+
+def check_game_over(kore, turn_count, max_turns=100, log=NULL_LOG):
+    """
+    Verifica si se ha cumplido alguna condición de fin de juego.
+    Versión corregida para evitar el IndexError.
+    """
+    active_ghosts, total_loot_sentinels, total_loot_ghosts_goal = game_totals(kore)
+    return game_over_message(len(active_ghosts), total_loot_sentinels, total_loot_ghosts_goal,
+                             turn_count, max_turns, log)
+
+def game_over_message(active_ghosts, total_loot_sentinels, total_loot_ghosts_goal, turn_count, max_turns=100, log=NULL_LOG):
+    """
+    The game-over rules on plain totals, shared by every engine.
+    """
+    # Condición 1: Sentinels ganan por captura total
+    if not active_ghosts:
+        return "¡VICTORIA PARA LOS SENTINELS! (Todos los Ghosts capturados)"
+
+    # Condición 2: Sentinels ganan por recuperar la mayoría del botín
+    if total_loot_sentinels > 50:
+        return f"¡VICTORIA PARA LOS SENTINELS! (Han recuperado {total_loot_sentinels} de botín)"
+
+    # Condición 3: Ghosts ganan por asegurar la mayoría del botín
+    if total_loot_ghosts_goal > 50:
+        return f"¡VICTORIA PARA LOS GHOSTS! (Han asegurado {total_loot_ghosts_goal} de botín en la meta)"
+
+    # Condición 4: El juego termina por límite de turnos
+    if turn_count >= max_turns:
+        # Se determina el ganador por puntos al final de los turnos
+        log.emit(INFO, "turn_limit", max_turns=max_turns)
+        if total_loot_sentinels > total_loot_ghosts_goal:
+            return f"VICTORIA PARA SENTINELS POR PUNTOS ({total_loot_sentinels} vs {total_loot_ghosts_goal})"
+        elif total_loot_ghosts_goal > total_loot_sentinels:
+            return f"VICTORIA PARA GHOSTS POR PUNTOS ({total_loot_ghosts_goal} vs {total_loot_sentinels})"
+        else:
+            return f"¡EMPATE! ({total_loot_sentinels} vs {total_loot_ghosts_goal})"
+
+    # Si no se cumple ninguna condición, el juego continúa
+    return None
+
+def winner_side(message):
+    """
+    Maps a check_game_over message to "ghosts", "sentinels", "draw" or None.
+    """
+    if not message:
+        return None
+    if "SENTINELS" in message:
+        return "sentinels"
+    if "GHOSTS" in message:
+        return "ghosts"
+    return "draw"
+
+def build_kore(grid_cols, grid_rows, rng=None):
+    """
+    Creates a connected map without agents. Position rewrites (e.g. to pixel
+    coordinates) must happen before agents are placed, since agents copy the
+    position of their node.
+    """
+    kore = Kore(grid_cols, grid_rows)
+    kore.create_connections(rng)
+    return kore
+
+class Simulation:
+    """
+    Owns a Kore and runs the game rules turn by turn, with no display
+    dependency. Observers are called with the simulation after every step.
+    ghost_policy decides each ghost's command and has ghost_turn's signature,
+    (ghost_id, kore, turn, rng); it is also passed deadline= when budgets are set.
+    decision_budget_ms bounds every agent decision and phase_budget_ms each
+    whole phase; planners then return their best answer so far, and late
+    decisions are counted in metrics. Without budgets nothing is timed.
+    Enabled instruments time the phases, decisions, command processing and
+    game-over check of every turn and count the Kore lookups; they are
+    installed for the engine internals only while step() plays a turn.
+    With a decider (parallel.ParallelDecider) moves are simultaneous: every
+    agent of a phase decides on the same frozen state and the commands are
+    then resolved together (see resolve_commands); budgets only bound the
+    sentinel assignment.
+    Sentinels capture every ghost on their node (see
+    sentinel_command_processor), so SENTINELS can win before max_turns.
+    """
+    def __init__(self, kore, max_turns=100, seed=None, log=NULL_LOG, ghost_policy=ghost_turn,
+                 decision_budget_ms=None, phase_budget_ms=None, instruments=NULL_INSTRUMENTS, decider=None):
+        self.kore = kore
+        self.rng = make_rng(seed)
+        # A null log of its own: step() stamps the turn on the log, and NULL_LOG is shared
+        self.log = EventLog() if log is NULL_LOG else log
+        self.max_turns = max_turns
+        self.turn = 1
+        self.winner = None
+        self.observers = []
+        self.ghost_policy = ghost_policy
+        self.decision_budget_ms = decision_budget_ms
+        self.phase_budget_ms = phase_budget_ms
+        self.metrics = DeadlineMetrics()
+        if decision_budget_ms is not None or phase_budget_ms is not None:
+            self.warm_up()
+        # (agent_id, agent_type, command, replica_id) applied during the last step
+        self.commands = []
+        self.instruments = instruments
+        self.decider = decider
+        if instruments.enabled:
+            instruments.attach(kore)
+
+    def add_observer(self, observer):
+        self.observers.append(observer)
+
+    @property
+    def finished(self):
+        return self.winner is not None
+
+    # --- Deadlines ---
+
+    def warm_up(self):
+        # The goal field is built once per map; build it before the clock starts
+        get_goal_field = getattr(self.kore, "get_goal_field", None)
+        if get_goal_field:
+            get_goal_field()
+
+    def phase_deadline(self):
+        if self.decision_budget_ms is None and self.phase_budget_ms is None:
+            return None
+        return Deadline(self.phase_budget_ms)
+
+    def decision_deadline(self, phase):
+        return None if phase is None else phase.child(self.decision_budget_ms)
+
+    def book(self, kind, deadline, agent=None):
+        if deadline is None:
+            return
+        overrun_ms = self.metrics.record(kind, deadline)
+        if overrun_ms and self.log.enabled(WARNING):
+            self.log.emit(WARNING, "overrun", what=kind, agent=agent, ms=round(overrun_ms, 3))
+
+    # --- Phases ---
+
+    def ghost_phase(self):
+        kore, log = self.kore, self.log
+        active_ghosts = [g for row in kore.nodes for node in row for g in node.ghosts]
+        log.emit(INFO, "phase", phase="GHOST", agents=len(active_ghosts))
+        timer = self.instruments.timer
+        if self.decider is not None:
+            seed = self.rng.getrandbits(32)
+            with timer("ghost_turn"):
+                commands = self.decider.ghost_commands(kore, active_ghosts, self.ghost_policy, self.turn, seed)
+            with timer("commands"):
+                decisions = zip([ghost.id for ghost in active_ghosts], commands)
+                self.commands.extend(resolve_commands(decisions, "ghost", kore, self.rng, log))
+            return
+        phase = self.phase_deadline()
+        for ghost in active_ghosts:
+            deadline = self.decision_deadline(phase)
+            with timer("ghost_turn"):
+                if deadline is None:
+                    command = self.ghost_policy(ghost.id, kore, self.turn, self.rng)
+                else:
+                    command = self.ghost_policy(ghost.id, kore, self.turn, self.rng, deadline=deadline)
+            self.book("ghost", deadline, ghost.id)
+            if log.enabled(DEBUG):
+                log.emit(DEBUG, "decision", agent_type="Ghost", agent=ghost.id, command=command)
+            with timer("commands"):
+                replica_id = command_processor(ghost.id, "ghost", command, kore, self.rng, log)
+            self.commands.append((ghost.id, "ghost", command, replica_id))
+        self.book("ghost_phase", phase)
+
+    def sentinel_phase(self):
+        kore, log = self.kore, self.log
+        active_sentinels = [s for row in kore.nodes for node in row for s in node.sentinels]
+        log.emit(INFO, "phase", phase="SENTINEL", agents=len(active_sentinels))
+
+        # Identificar objetivos primarios (nodos con Ghosts)
+        ghost_nodes_as_targets = kore.grid_order(kore.ghost_nodes.values())
+        start_nodes = [kore.get_agent_node(sentinel.id) for sentinel in active_sentinels]
+        # Reparto cooperativo: el emparejamiento de menor coste total
+        phase = self.phase_deadline()
+        deadline = self.decision_deadline(phase)
+        timer = self.instruments.timer
+        with timer("assignment"):
+            assigned_targets = assign_targets(kore, start_nodes, ghost_nodes_as_targets, deadline)
+        self.book("assignment", deadline)
+
+        if self.decider is not None:
+            jobs = [(sentinel.id, target.id if target else None)
+                    for sentinel, target in zip(active_sentinels, assigned_targets)]
+            with timer("sentinel_turn"):
+                commands = self.decider.sentinel_commands(kore, jobs)
+            with timer("commands"):
+                decisions = zip([sentinel.id for sentinel in active_sentinels], commands)
+                self.commands.extend(resolve_commands(decisions, "sentinel", kore, self.rng, log))
+            return
+
+        for sentinel, start_node, target_node in zip(active_sentinels, start_nodes, assigned_targets):
+            deadline = self.decision_deadline(phase)
+
+            with timer("sentinel_turn"):
+                command = sentinel_command(sentinel.id, kore, start_node, target_node, deadline)
+            self.book("sentinel", deadline, sentinel.id)
+
+            if log.enabled(DEBUG):
+                log.emit(DEBUG, "decision", agent_type="Sentinel", agent=sentinel.id, command=command)
+            with timer("commands"):
+                command_processor(sentinel.id, "sentinel", command, kore, self.rng, log)
+            self.commands.append((sentinel.id, "sentinel", command, None))
+        self.book("sentinel_phase", phase)
+
+    def step(self):
+        """
+        Plays one full turn: ghost phase, sentinel phase and the game-over check.
+        Returns the winner message, or None while the game goes on.
+        """
+        if self.finished:
+            return self.winner
+        self.log.turn = self.turn
+        self.log.emit(INFO, "turn")
+        self.commands = []
+        instruments = self.instruments
+        with instruments.turn(self.turn):
+            with instruments.timer("ghost_phase"):
+                self.ghost_phase()
+            with instruments.timer("sentinel_phase"):
+                self.sentinel_phase()
+            with instruments.timer("game_over"):
+                self.winner = check_game_over(self.kore, self.turn, self.max_turns, self.log)
+        if self.winner:
+            self.log.emit(INFO, "game_over", winner=winner_side(self.winner), message=self.winner)
+        self.turn += 1
+        for observer in self.observers:
+            observer(self)
+        return self.winner
+
+    def result(self):
+        """
+        Summary of the current game for tooling: winner side, turns played and loot totals.
+        """
+        active_ghosts, total_loot_sentinels, total_loot_ghosts_goal = game_totals(self.kore)
+        return {
+            "winner": winner_side(self.winner),
+            "message": self.winner,
+            "turns": self.turn - 1,
+            "map": self.kore.fingerprint(),
+            "ghosts_left": len(active_ghosts),
+            "loot_recovered": total_loot_sentinels,
+            "loot_secured": total_loot_ghosts_goal,
+        }
+
+    def run(self, max_turns=None):
+        """
+        Steps until the game is over or max_turns more turns have been played.
+        """
+        played = 0
+        while not self.finished and (max_turns is None or played < max_turns):
+            self.step()
+            played += 1
+        return self.winner
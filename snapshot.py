@@ -0,0 +1,213 @@
+import mmap
+import struct
+import sys
+from array import array
+from AgentState import AgentState
+from Ghost import Ghost
+from Node import Connection
+from Sentinel import Sentinel
+from compact_graph import CompactGraph
+from kore import Kore
+
+MAGIC = b"GGSNAP1\0"
+HEADER = struct.Struct("<8sIIB")
+ARRAY_HEADER = struct.Struct("<cQ")
+
+# State values in a stable order for the state column
+STATES = list(AgentState)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+class Snapshot:
+    """
+    Flat copy of a Kore and its agents: grid dims, CSR edge arrays, node money
+    and positions, and per-side agent columns (node index, stamina, money,
+    state, captured/capturing flag, ids and remembered node indexes).
+    Serializes to a compact little-endian binary form.
+    """
+    ARRAYS = ("offsets", "targets", "costs", "money", "position_x", "position_y",
+              "ghost_node", "ghost_stamina", "ghost_money", "ghost_state", "ghost_flag",
+              "ghost_memory_offsets", "ghost_memory",
+              "sentinel_node", "sentinel_stamina", "sentinel_money", "sentinel_state", "sentinel_flag",
+              "sentinel_memory_offsets", "sentinel_memory")
+
+    def __init__(self, n, m, compact=False):
+        self.n = n
+        self.m = m
+        self.compact = compact
+        self.offsets = array('i')
+        self.targets = array('i')
+        self.costs = array('H')
+        self.money = array('q')
+        self.position_x = array('i')
+        self.position_y = array('i')
+        self.ghost_ids = []
+        self.sentinel_ids = []
+        for side in ("ghost", "sentinel"):
+            setattr(self, f"{side}_node", array('i'))
+            setattr(self, f"{side}_stamina", array('d'))
+            setattr(self, f"{side}_money", array('q'))
+            setattr(self, f"{side}_state", array('B'))
+            setattr(self, f"{side}_flag", array('B'))
+            setattr(self, f"{side}_memory_offsets", array('i', [0]))
+            setattr(self, f"{side}_memory", array('i'))
+
+    @classmethod
+    def of(cls, kore, copy=True):
+        """
+        Takes a snapshot of the current state of kore. With copy=False the
+        topology arrays are referenced rather than copied, for forks.
+        """
+        graph = kore.graph
+        if graph is None:
+            raise ValueError("Kore has no edges to snapshot yet; call create_connections() first")
+        snap = cls(kore.n, kore.m, kore.compact)
+        snap.offsets = graph.offsets[:] if copy else graph.offsets
+        snap.targets = graph.targets[:] if copy else graph.targets
+        snap.costs = graph.costs[:]
+        nodes = [node for row in kore.nodes for node in row]
+        snap.money = array('q', [node.money for node in nodes])
+        snap.position_x = array('i', [node.position_x for node in nodes])
+        snap.position_y = array('i', [node.position_y for node in nodes])
+        for index, node in enumerate(nodes):
+            for ghost in node.ghosts:
+                snap._add_agent("ghost", index, ghost, ghost.captured, ghost.known_loot_nodes, graph)
+            for sentinel in node.sentinels:
+                snap._add_agent("sentinel", index, sentinel, sentinel.capturing, sentinel.visited_nodes, graph)
+        return snap
+
+    def _add_agent(self, side, index, agent, flag, memory, graph):
+        getattr(self, f"{side}_ids").append(agent.id)
+        getattr(self, f"{side}_node").append(index)
+        getattr(self, f"{side}_stamina").append(agent.stamina)
+        getattr(self, f"{side}_money").append(agent.money)
+        getattr(self, f"{side}_state").append(STATE_CODES[agent.state])
+        getattr(self, f"{side}_flag").append(1 if flag else 0)
+        remembered = getattr(self, f"{side}_memory")
+        remembered.extend(graph.index_of(node_id) for node_id in memory)
+        getattr(self, f"{side}_memory_offsets").append(len(remembered))
+
+    # --- Restore ---
+
+    def restore(self, share_arrays=False):
+        """
+        Builds a new Kore with fresh agents. With share_arrays the read-only
+        topology arrays (offsets, targets) are shared instead of copied.
+        """
+        n, m = self.n, self.m
+        kore = Kore(n, m, compact=self.compact)
+        nodes = [node for row in kore.nodes for node in row]
+        for node, x, y in zip(nodes, self.position_x, self.position_y):
+            node.position_x, node.position_y = x, y
+        kore.reindex_positions()
+
+        offsets = self.offsets if share_arrays else self.offsets[:]
+        targets = self.targets if share_arrays else self.targets[:]
+        if not self.compact:
+            kore.graph = CompactGraph(n, m)
+            ids = kore.graph.ids
+            costs = self.costs
+            for index, node in enumerate(nodes):
+                node.money = self.money[index]
+                node.connections = [Connection(node.id, ids[targets[i]], costs[i])
+                                    for i in range(offsets[index], offsets[index + 1])]
+        graph = kore.graph
+        graph.offsets, graph.targets, graph.costs = offsets, targets, self.costs[:]
+        graph.money = _as_long(self.money)
+        kore.reindex_money()
+
+        for index, (agent_id, node) in enumerate(zip(self.ghost_ids, self.ghost_node)):
+            ghost = Ghost(agent_id, 0, 0, self.ghost_money[index], bool(self.ghost_flag[index]))
+            self._restore_agent("ghost", index, ghost, nodes[node], ghost.known_loot_nodes, kore)
+        for index, (agent_id, node) in enumerate(zip(self.sentinel_ids, self.sentinel_node)):
+            sentinel = Sentinel(agent_id, 0, 0, self.sentinel_money[index], bool(self.sentinel_flag[index]))
+            self._restore_agent("sentinel", index, sentinel, nodes[node], sentinel.visited_nodes, kore)
+        return kore
+
+    def _restore_agent(self, side, index, agent, node, memory, kore):
+        agent.position_x, agent.position_y = node.position_x, node.position_y
+        stamina = getattr(self, f"{side}_stamina")[index]
+        agent.stamina = int(stamina) if stamina.is_integer() else stamina
+        agent.state = STATES[getattr(self, f"{side}_state")[index]]
+        offsets = getattr(self, f"{side}_memory_offsets")
+        remembered = getattr(self, f"{side}_memory")
+        ids = kore.graph.ids
+        memory.update(ids[i] for i in remembered[offsets[index]:offsets[index + 1]])
+        kore.add_agent(agent, node)
+
+    # --- Binary form ---
+
+    def to_bytes(self):
+        parts = [HEADER.pack(MAGIC, self.n, self.m, 1 if self.compact else 0)]
+        for name in self.ARRAYS:
+            values = getattr(self, name)
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            parts.append(ARRAY_HEADER.pack(values.typecode.encode(), len(values)))
+            parts.append(values.tobytes())
+        for ids in (self.ghost_ids, self.sentinel_ids):
+            blob = "\0".join(ids).encode("utf-8")
+            parts.append(ARRAY_HEADER.pack(b"s", len(blob)))
+            parts.append(blob)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Reads a snapshot from bytes or any buffer (e.g. an mmap). Each array is
+        filled with one array.frombytes call.
+        """
+        view = memoryview(data)
+        magic, n, m, compact = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a GhostGrid snapshot")
+        snap = cls(n, m, bool(compact))
+        offset = HEADER.size
+        for name in cls.ARRAYS:
+            typecode, count = ARRAY_HEADER.unpack_from(view, offset)
+            offset += ARRAY_HEADER.size
+            values = array(typecode.decode())
+            size = count * values.itemsize
+            values.frombytes(view[offset:offset + size])
+            if sys.byteorder == "big":
+                values.byteswap()
+            offset += size
+            setattr(snap, name, values)
+        for name in ("ghost_ids", "sentinel_ids"):
+            _, size = ARRAY_HEADER.unpack_from(view, offset)
+            offset += ARRAY_HEADER.size
+            blob = bytes(view[offset:offset + size]).decode("utf-8")
+            offset += size
+            setattr(snap, name, blob.split("\0") if blob else [])
+        return snap
+
+def _as_long(values):
+    # CompactGraph keeps money as 'l', which is 4 bytes on some platforms
+    result = array('l')
+    if result.itemsize == values.itemsize:
+        result.frombytes(memoryview(values).cast('B'))
+    else:
+        result.extend(values)
+    return result
+
+def save(kore, path):
+    with open(path, "wb") as f:
+        f.write(Snapshot.of(kore).to_bytes())
+
+def load(path):
+    """Restores a Kore from a file written by save(), reading it through mmap."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            snap = Snapshot.from_bytes(data)
+    return snap.restore()
+
+def fork(kore):
+    """
+    Independent copy of a game for lookahead. Topology arrays are shared, and
+    the fork's distance cache starts with the trees the parent has built.
+    """
+    child = Snapshot.of(kore, copy=False).restore(share_arrays=True)
+    cache = kore.get_path_cache()
+    if cache is not None:
+        child.share_paths(cache)
+    return child
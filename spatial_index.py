@@ -0,0 +1,89 @@
+class GridBuckets:
+    """
+    Bucket grid over (col, layer) coordinates for nearest-item queries by
+    Manhattan distance. Items are hashable keys (node ids in Kore) placed at
+    integer coordinates; ties are broken by (layer, col), the order of a
+    row-by-row scan of the grid.
+    """
+    def __init__(self, n, m, bucket_size=8):
+        self.n = n
+        self.m = m
+        self.bucket_size = bucket_size
+        self.columns = (n + bucket_size - 1) // bucket_size
+        self.rows = (m + bucket_size - 1) // bucket_size
+        self.buckets = {}  # (bucket_x, bucket_y) -> {item: (x, y)}
+        self.items = {}    # item -> (x, y)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.items
+
+    def add(self, item, x, y):
+        position = self.items.get(item)
+        if position == (x, y):
+            return
+        if position is not None:
+            self.remove(item)
+        self.items[item] = (x, y)
+        key = (x // self.bucket_size, y // self.bucket_size)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = {}
+        bucket[item] = (x, y)
+
+    def remove(self, item):
+        position = self.items.pop(item, None)
+        if position is None:
+            return
+        key = (position[0] // self.bucket_size, position[1] // self.bucket_size)
+        bucket = self.buckets[key]
+        del bucket[item]
+        if not bucket:
+            del self.buckets[key]
+
+    def clear(self):
+        self.buckets.clear()
+        self.items.clear()
+
+    def _ring(self, center_x, center_y, radius):
+        # Bucket keys at Chebyshev distance radius from the center bucket
+        if radius == 0:
+            yield center_x, center_y
+            return
+        for bx in range(center_x - radius, center_x + radius + 1):
+            yield bx, center_y - radius
+            yield bx, center_y + radius
+        for by in range(center_y - radius + 1, center_y + radius):
+            yield center_x - radius, by
+            yield center_x + radius, by
+
+    def k_nearest(self, x, y, k=1):
+        """
+        Up to k items ordered by (distance, layer, col). Rings of buckets are
+        scanned outwards until no farther bucket can hold a closer item.
+        """
+        if not self.items or k <= 0:
+            return []
+        size = self.bucket_size
+        center_x, center_y = x // size, y // size
+        max_radius = max(center_x, self.columns - 1 - center_x, center_y, self.rows - 1 - center_y)
+        found = []
+        for radius in range(max_radius + 1):
+            for key in self._ring(center_x, center_y, radius):
+                bucket = self.buckets.get(key)
+                if bucket:
+                    for item, (ix, iy) in bucket.items():
+                        found.append((abs(ix - x) + abs(iy - y), iy, ix, item))
+            if len(found) >= k:
+                found.sort(key=lambda entry: entry[:3])
+                # Items in the next ring are at least radius * size + 1 away
+                if found[k - 1][0] <= radius * size:
+                    break
+        found.sort(key=lambda entry: entry[:3])
+        return [entry[3] for entry in found[:k]]
+
+    def nearest(self, x, y):
+        result = self.k_nearest(x, y, 1)
+        return result[0] if result else None
@@ -0,0 +1,78 @@
+import random
+import unittest
+import simulation
+from Ghost import Ghost
+from Sentinel import Sentinel
+from batch_engine import BatchEngine, np
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBatchEngine(unittest.TestCase):
+
+    def setUp(self):
+        """A seeded 8x5 map without agents."""
+        self.kore = simulation.build_kore(8, 5, random.Random(3))
+
+    def add(self, agent_class, agent_id, node_id, money=0):
+        node = self.kore.get_node_by_id(node_id)
+        agent = agent_class(agent_id, node.position_x, node.position_y, money)
+        self.kore.add_agent(agent, node)
+        return agent
+
+    def test_single_ghost_matches_simulation(self):
+        """A lone ghost follows the same route as the sequential engine, drop and take included."""
+        twin = simulation.build_kore(8, 5, random.Random(3))
+        for kore in (self.kore, twin):
+            node = kore.get_node_by_id("0,2")
+            kore.add_agent(Ghost("G1", node.position_x, node.position_y, 1), node)
+        engine = BatchEngine(self.kore, max_turns=30)
+        sim = simulation.Simulation(twin, max_turns=30, seed=1)
+        for _ in range(12):
+            engine.step()
+            sim.step()
+            engine.sync()
+            ghost, expected = self.kore.get_agent_by_id("G1"), twin.get_agent_by_id("G1")
+            self.assertEqual(self.kore.get_agent_node("G1").id, twin.get_agent_node("G1").id)
+            self.assertEqual((ghost.money, ghost.stamina), (expected.money, expected.stamina))
+
+    def test_replicate_take_and_capture(self):
+        """Turn 1 replicates, only the first ghost on a node takes its loot, sentinels capture in bulk."""
+        self.add(Ghost, "G1", "0,0", money=10)
+        self.add(Ghost, "G2", "3,3")
+        self.add(Ghost, "G3", "3,3")
+        self.kore.add_money(self.kore.get_node_by_id("3,3"), 7)
+        engine = BatchEngine(self.kore)
+        engine.ghost_phase()
+        self.assertEqual(engine.ghost_ids, ["G1", "G2", "G3", "G1_r1"])
+        self.assertEqual(engine.ghost_money.tolist(), [5, 7, 0, 5])
+
+        self.add(Sentinel, "S1", "0,0")
+        engine = BatchEngine(self.kore)
+        engine.sentinel_phase()
+        self.assertEqual(engine.ghost_ids, ["G2", "G3"])
+        engine.sync()
+        self.assertIsNone(self.kore.get_agent_by_id("G1"))
+        self.assertEqual(self.kore.get_agent_by_id("S1").money, 10)
+        self.assertEqual(set(self.kore.ghost_nodes), {"3,3"})
+
+    def test_stuck_ghost_escapes(self):
+        """A ghost on the goal column with nothing to drop or take makes a random affordable move."""
+        self.add(Ghost, "G1", "7,2")
+        engine = BatchEngine(self.kore, rng=random.Random(2))
+        engine.ghost_phase()
+        moved_to = int(engine.ghost_pos[0])
+        self.assertIn(moved_to, [v for v, _ in self.kore.graph.neighbors(self.kore.graph.index_of("7,2"))])
+        self.assertEqual(engine.ghost_stamina[0], 100 - self.kore.graph.edge_cost(self.kore.graph.index_of("7,2"), moved_to))
+
+    def test_runs_to_the_end(self):
+        """A seeded testing_set game finishes with a Simulation-shaped result."""
+        rng = random.Random(8)
+        kore = simulation.build_kore(15, 10, rng)
+        simulation.testing_set(kore, rng)
+        engine = BatchEngine(kore, max_turns=50)
+        engine.run()
+        result = engine.result()
+        self.assertIn(result["winner"], ("ghosts", "sentinels", "draw"))
+        self.assertLessEqual(result["turns"], 50)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+import benchmark
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_suite_covers_every_entry_point(self):
+        """A tiny suite run times every benchmarked call on the map it names."""
+        results = benchmark.run_suite(sizes=[(6, 4)], agent_counts=[(2, 1)], repeat=1)
+        for name in ("kore_init/6x4", "move/6x4", "a_star_search/6x4", "ghost_turn/6x4/2g1s",
+                     "sentinel_turn/6x4/2g1s", "check_game_over/6x4/2g1s", "turn/6x4/2g1s"):
+            self.assertGreater(results[name]["seconds"], 0)
+        self.assertEqual(len({result["map"] for result in results.values()}), 1)
+
+    def test_compare_flags_only_slowdowns_past_the_threshold(self):
+        """Slower-than-threshold results are regressions; other maps are skipped."""
+        baseline = {"results": {
+            "a": {"seconds": 1.0, "map": "x"},
+            "b": {"seconds": 1.0, "map": "x"},
+            "c": {"seconds": 1.0, "map": "y"},
+        }}
+        results = {
+            "a": {"seconds": 1.2, "map": "x"},
+            "b": {"seconds": 1.5, "map": "x"},
+            "c": {"seconds": 9.0, "map": "z"},
+            "d": {"seconds": 9.0, "map": "x"},
+        }
+        self.assertEqual(benchmark.compare(results, baseline, 0.25), [("b", 1.0, 1.5, 1.5)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import itertools
+import random
+import unittest
+import simulation
+from Ghost import Ghost
+from Sentinel import Sentinel
+from coordination import hungarian, assign_targets, cost_matrix
+
+class TestHungarian(unittest.TestCase):
+
+    def brute_force(self, cost):
+        rows, cols = len(cost), len(cost[0])
+        if rows <= cols:
+            return min(sum(cost[r][c] for r, c in enumerate(p)) for p in itertools.permutations(range(cols), rows))
+        return min(sum(cost[r][c] for c, r in enumerate(p)) for p in itertools.permutations(range(rows), cols))
+
+    def test_optimal_on_random_matrices(self):
+        """Square and rectangular matrices reach the brute-force optimum."""
+        rng = random.Random(2)
+        for rows, cols in [(4, 4), (3, 5), (5, 3), (1, 4), (6, 6)]:
+            cost = [[rng.randint(0, 20) for _ in range(cols)] for _ in range(rows)]
+            assignment = hungarian(cost)
+            used = [c for c in assignment if c >= 0]
+            self.assertEqual(len(used), len(set(used)))
+            self.assertEqual(len(used), min(rows, cols))
+            self.assertEqual(sum(cost[r][c] for r, c in enumerate(assignment) if c >= 0), self.brute_force(cost))
+
+class TestAssignTargets(unittest.TestCase):
+
+    def setUp(self):
+        """Seeded 10x6 map with three ghosts and four sentinels."""
+        self.kore = simulation.build_kore(10, 6, random.Random(4))
+        for i, node_id in enumerate(["1,1", "8,4", "5,0"]):
+            self.add(Ghost(f"G{i}", 0, 0, 10), node_id)
+        for i, node_id in enumerate(["0,0", "9,5", "4,1", "2,2"]):
+            self.add(Sentinel(f"S{i}", 0, 0), node_id)
+
+    def add(self, agent, node_id):
+        node = self.kore.get_node_by_id(node_id)
+        agent.position_x, agent.position_y = node.position_x, node.position_y
+        self.kore.add_agent(agent, node)
+
+    def test_beats_round_robin(self):
+        """Every ghost node is covered and the total cost is no worse than round-robin."""
+        starts = [self.kore.get_agent_node(f"S{i}") for i in range(4)]
+        targets = self.kore.grid_order(self.kore.ghost_nodes.values())
+        assigned = assign_targets(self.kore, starts, targets)
+        self.assertEqual({n.id for n in assigned}, {n.id for n in targets})
+        matrix = cost_matrix(self.kore, starts, targets)
+        total = sum(matrix[r][c] for r, c in enumerate(hungarian(matrix)) if c >= 0)
+        round_robin = sum(matrix[i][i % 3] for i in range(3))
+        self.assertLessEqual(total, round_robin)
+
+    def test_sentinel_on_target_captures(self):
+        """A sentinel standing on its assigned ghost node captures instead of resting."""
+        self.add(Sentinel("S9", 0, 0), "8,4")
+        sim = simulation.Simulation(self.kore, max_turns=10, seed=1)
+        sim.sentinel_phase()
+        self.assertIsNone(self.kore.get_agent_by_id("G1"))
+        self.assertEqual(self.kore.get_agent_by_id("S9").money, 10)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import random
+import unittest
+import simulation
+from deadline import Deadline
+from search import a_star, anytime_a_star, kore_neighbors, manhattan_to, path_cost
+from sentinel_method import find_path
+
+class TestAnytimeSearch(unittest.TestCase):
+
+    def setUp(self):
+        """Seeded 30x20 map; searches run corner to corner."""
+        self.kore = simulation.build_kore(30, 20, random.Random(6))
+        self.neighbors = kore_neighbors(self.kore)
+        self.heuristic = manhattan_to("29,19")
+
+    def is_goal(self, node_id):
+        return node_id == "29,19"
+
+    def test_expired_deadline_returns_best_so_far(self):
+        """An expired deadline cuts A* short with a partial path from the start."""
+        path = a_star("0,0", self.is_goal, self.neighbors, self.heuristic, deadline=Deadline(0))
+        self.assertEqual(path[0], "0,0")
+        self.assertNotEqual(path[-1], "29,19")
+        self.assertLess(self.heuristic(path[-1]), self.heuristic("0,0"))
+
+    def test_anytime_reaches_the_optimum_with_time(self):
+        """Given time, the last anytime pass is plain A* and the cost is optimal."""
+        optimal = a_star("0,0", self.is_goal, self.neighbors, self.heuristic)
+        path = anytime_a_star("0,0", self.is_goal, self.neighbors, self.heuristic, Deadline(10000))
+        self.assertEqual(path_cost(path, self.neighbors), path_cost(optimal, self.neighbors))
+
+    def test_find_path_does_not_build_trees_under_a_deadline(self):
+        """With a deadline and a cold cache, find_path answers without a Dijkstra."""
+        start, goal = self.kore.get_node_by_id("0,0"), self.kore.get_node_by_id("29,19")
+        path = find_path(self.kore, start, goal, Deadline(10000))
+        self.assertEqual(path[-1], "29,19")
+        cache = self.kore.get_path_cache()
+        self.assertFalse(cache.to_trees or cache.from_trees)
+
+class TestBudgetedSimulation(unittest.TestCase):
+
+    def play(self, **budgets):
+        rng = random.Random(11)
+        kore = simulation.build_kore(15, 10, rng)
+        simulation.testing_set(kore, rng)
+        sim = simulation.Simulation(kore, max_turns=15, seed=rng, **budgets)
+        sim.run()
+        return sim
+
+    def test_overruns_are_counted(self):
+        """A zero budget makes every decision late, and the game still plays out."""
+        sim = self.play(decision_budget_ms=0)
+        summary = sim.metrics.summary()
+        self.assertEqual(summary["ghost"]["overruns"], summary["ghost"]["decisions"])
+        self.assertGreater(sim.metrics.overruns, 0)
+        self.assertIsNotNone(sim.winner)
+
+    def test_unbudgeted_games_are_not_timed(self):
+        """Without budgets the metrics stay empty."""
+        self.assertEqual(self.play().metrics.summary(), {})
+
+    def test_deadline_passed_only_with_budgets(self):
+        """Ghost policies get deadline= only when a budget is set, so four-argument policies still run."""
+        calls = []
+
+        def policy(ghost_id, kore, turn, rng, **kwargs):
+            calls.append(kwargs)
+            return "rest"
+
+        for budgets in ({}, {"decision_budget_ms": 50}):
+            rng = random.Random(11)
+            kore = simulation.build_kore(15, 10, rng)
+            simulation.testing_set(kore, rng)
+            simulation.Simulation(kore, max_turns=2, seed=rng, ghost_policy=policy, **budgets).step()
+        self.assertIn({}, calls)
+        self.assertTrue(any("deadline" in kwargs for kwargs in calls))
+        self.assertFalse(any(kwargs and "deadline" not in kwargs for kwargs in calls))
+
+if __name__ == "__main__":
+    unittest.main()
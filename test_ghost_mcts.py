@@ -0,0 +1,54 @@
+import random
+import unittest
+import simulation
+from Ghost import Ghost
+from Sentinel import Sentinel
+from ghost_mcts import MCTSPlanner, GhostModel, observe, TreeNode, search, DROP
+
+class TestMCTSPlanner(unittest.TestCase):
+
+    def setUp(self):
+        """A ghost with loot next to the goal column and a sentinel far behind it."""
+        self.kore = simulation.build_kore(8, 5, random.Random(6))
+        self.ghost = self.add(Ghost("G1", 0, 0, 30), "6,2")
+        self.add(Sentinel("S1", 0, 0), "0,0")
+
+    def add(self, agent, node_id):
+        node = self.kore.get_node_by_id(node_id)
+        agent.position_x, agent.position_y = node.position_x, node.position_y
+        self.kore.add_agent(agent, node)
+        return agent
+
+    def test_drops_at_goal(self):
+        """On the goal column with loot, dropping it is the clear best line."""
+        self.kore.move("6,2", "7,2", "G1")
+        model = GhostModel(self.kore)
+        root = TreeNode(observe(self.kore, self.ghost, model), None, 0)
+        root.untried = model.actions(root.state)
+        search(model, root, float("inf"), random.Random(1), max_iterations=2000)
+        best = max(root.children, key=lambda a: root.children[a].visits)
+        self.assertEqual(best, DROP)
+
+    def test_policy_commands_and_tree_reuse(self):
+        """The planner returns game commands and carries its subtree over to the next turn."""
+        planner = MCTSPlanner(budget_ms=20, seed=1)
+        sim = simulation.Simulation(self.kore, max_turns=10, seed=2, ghost_policy=planner)
+        sim.turn = 2
+        sim.step()
+        command = sim.commands[0][2]
+        self.assertTrue(command == "rest" or command.startswith(("move-", "take-", "drop-")))
+        self.assertIn("G1", planner.trees)
+        self.assertGreater(planner.rollouts, 0)
+
+    def test_root_parallel(self):
+        """With a process pool the planner merges root statistics from every worker."""
+        planner = MCTSPlanner(budget_ms=20, workers=2, seed=1)
+        try:
+            command = planner("G1", self.kore, 2)
+        finally:
+            planner.close()
+        self.assertTrue(command.startswith(("move-", "drop-", "take-")) or command == "rest")
+        self.assertGreater(planner.rollouts, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import random
+import unittest
+from kore import Kore
+from Ghost import Ghost
+from ghost_method import ghost_turn, get_move_command, a_star_search_for_ghost, next_step_to_goal
+
+class TestGhostLogic(unittest.TestCase):
+
+    def setUp(self):
+        """Build a seeded map; the goal layer is the last column (x = 5)."""
+        random.seed(5)
+        self.kore = Kore(6, 4)
+        self.kore.create_connections()
+
+    def add_ghost(self, node_id, money=10):
+        node = self.kore.get_node_by_id(node_id)
+        ghost = Ghost("G1", node.position_x, node.position_y, money)
+        self.kore.add_agent(ghost, node)
+        return ghost
+
+    def test_goal_field_matches_a_star(self):
+        """The goal field reaches the goal layer at the same cost as A*."""
+        dist, _ = self.kore.get_goal_field()
+        graph = self.kore.graph
+        for node_id in ["0,0", "0,3", "2,1", "4,2"]:
+            path = a_star_search_for_ghost(self.kore, self.kore.get_node_by_id(node_id), 5)
+            self.assertEqual(path[-1].split(',')[0], "5")
+            cost = sum(next(c.cost for c in self.kore.get_node_by_id(a).connections if c.node_b == b)
+                       for a, b in zip(path, path[1:]))
+            self.assertEqual(cost, dist[graph.index_of(node_id)])
+
+    def test_next_step_in_goal_layer(self):
+        """There is no next step once the ghost stands in the goal layer."""
+        self.assertEqual(next_step_to_goal(self.kore, self.kore.get_node_by_id("5,2"), 5), (None, None))
+
+    def test_ghost_with_money_follows_goal_field(self):
+        """A ghost carrying loot moves along the goal field."""
+        self.add_ghost("1,1")
+        next_node_id, _ = next_step_to_goal(self.kore, self.kore.get_node_by_id("1,1"), 5)
+        command = ghost_turn("G1", self.kore, current_turn=2)
+        self.assertEqual(command, get_move_command(self.kore.get_node_by_id("1,1"), next_node_id))
+        self.assertNotEqual(command, "rest")
+
+    def test_ghost_drops_loot_in_goal_layer(self):
+        """A ghost in the goal layer drops everything it carries."""
+        self.add_ghost("5,0", money=30)
+        self.assertEqual(ghost_turn("G1", self.kore, current_turn=2), "drop-30")
+
+if __name__ == '__main__':
+    unittest.main()
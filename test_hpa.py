@@ -0,0 +1,47 @@
+import random
+import unittest
+from kore import Kore
+from hpa import hpa_search
+from search import kore_neighbors, path_cost
+from sentinel_method import a_star_search
+
+class TestHPA(unittest.TestCase):
+
+    def setUp(self):
+        """Seeded 50x40 map: several clusters in both directions."""
+        self.kore = Kore(50, 40)
+        self.kore.create_connections(random.Random(9))
+        self.neighbors = kore_neighbors(self.kore)
+
+    def test_paths_are_valid_and_near_optimal(self):
+        """Every HPA* path follows real edges and costs at most 1.5 times the optimum."""
+        rng = random.Random(1)
+        cache = self.kore.get_path_cache()
+        graph = self.kore.graph
+        for _ in range(20):
+            start = self.kore.get_node_by_coords(rng.randrange(50), rng.randrange(40))
+            goal = self.kore.get_node_by_coords(rng.randrange(50), rng.randrange(40))
+            path = hpa_search(self.kore, start, goal)
+            self.assertEqual((path[0], path[-1]), (start.id, goal.id))
+            for a, b in zip(path, path[1:]):
+                self.assertIn(b, dict(self.neighbors(a)))
+            optimum = cache.distance(graph.index_of(start.id), graph.index_of(goal.id))
+            self.assertLessEqual(path_cost(path, self.neighbors), 1.5 * optimum)
+
+    def test_same_node_and_same_cluster(self):
+        """Trivial and in-cluster queries answer like A*."""
+        node = self.kore.get_node_by_id("3,3")
+        self.assertEqual(hpa_search(self.kore, node, node), ["3,3"])
+        goal = self.kore.get_node_by_id("5,6")
+        path = hpa_search(self.kore, node, goal)
+        self.assertEqual(path_cost(path, self.neighbors),
+                         path_cost(a_star_search(self.kore, node, goal), self.neighbors))
+
+    def test_cost_change_drops_the_hierarchy(self):
+        """Editing an edge cost rebuilds the abstraction on the next query."""
+        hierarchy = self.kore.get_hierarchy()
+        self.kore.set_edge_cost("0,0", "1,0", 7)
+        self.assertIsNot(self.kore.get_hierarchy(), hierarchy)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import random
+import tempfile
+import unittest
+import instrumentation
+import simulation
+from instrumentation import Instruments, NULL_INSTRUMENTS
+
+class TestInstrumentation(unittest.TestCase):
+
+    def play(self, instruments, turns=6):
+        rng = random.Random(3)
+        kore = simulation.build_kore(15, 10, rng)
+        simulation.testing_set(kore, rng)
+        sim = simulation.Simulation(kore, max_turns=50, seed=rng, instruments=instruments)
+        sim.run(turns)
+        return kore
+
+    def test_turns_are_timed_and_counted(self):
+        """Every turn gets phase timers, decision timers and lookup counters."""
+        instruments = Instruments()
+        kore = self.play(instruments)
+        instruments.close()
+        self.assertEqual([record["turn"] for record in instruments.turns], list(range(1, 7)))
+        for record in instruments.turns:
+            self.assertIn("ghost_phase", record["ms"])
+            self.assertIn("sentinel_phase", record["ms"])
+            self.assertEqual(record["calls"]["game_over"], 1)
+            self.assertGreater(record["counts"]["get_node_by_id"], 0)
+        self.assertEqual(sum(count for _, _, count in instruments.histogram("ghost_phase")), 6)
+        self.assertNotIn("get_node_by_id", vars(kore))
+        self.assertIs(instrumentation.ACTIVE, NULL_INSTRUMENTS)
+
+    def test_scoped_to_turns(self):
+        """Instruments are only ACTIVE during a step, and frame timings stay out of the turn records."""
+        instruments = Instruments()
+        self.play(instruments, turns=2)
+        self.assertIs(instrumentation.ACTIVE, NULL_INSTRUMENTS)
+        self.assertIsNone(instruments.record)
+        with instruments.frame_timer("render"):
+            pass
+        self.assertEqual(len(instruments.frames["render"]), 1)
+        self.assertNotIn("render", instruments.turns[-1]["ms"])
+        self.assertIn("frames (ms per frame)", instruments.report())
+
+    def test_profile_of_one_turn(self):
+        """profile_turn writes a cProfile dump of that turn only."""
+        path = os.path.join(tempfile.mkdtemp(), "turn.prof")
+        instruments = Instruments(profile_turn=2, profile_path=path)
+        self.play(instruments, turns=3)
+        instruments.close()
+        self.assertTrue(os.path.getsize(path) > 0)
+
+    def test_disabled_by_default(self):
+        """Without instruments nothing is recorded and the Kore is left alone."""
+        kore = self.play(NULL_INSTRUMENTS)
+        self.assertEqual(NULL_INSTRUMENTS.turns, [])
+        self.assertNotIn("get_node_by_id", vars(kore))
+        self.assertIs(NULL_INSTRUMENTS.timer("x"), instrumentation.NULL_TIMER)
+
+if __name__ == "__main__":
+    unittest.main()
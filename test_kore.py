@@ -0,0 +1,275 @@
+import random
+import unittest
+from kore import Kore
+from Ghost import Ghost
+from Sentinel import Sentinel
+from Node import Connection, parse_node_id
+
+class TestKoreIndexes(unittest.TestCase):
+
+    def setUp(self):
+        """Build a small connected map with one ghost and one sentinel."""
+        random.seed(7)
+        self.kore = Kore(6, 4)
+        self.kore.create_connections()
+        self.ghost = Ghost("G1", 1, 1, money=10)
+        self.sentinel = Sentinel("S1", 4, 2)
+        self.kore.add_agent(self.ghost, self.kore.get_node_by_id("1,1"))
+        self.kore.add_agent(self.sentinel, self.kore.get_node_by_id("4,2"))
+
+    def test_node_lookups(self):
+        """Nodes are found by id, by position and by grid coordinates."""
+        node = self.kore.get_node_by_id("3,2")
+        self.assertIs(self.kore.get_node_by_position(3, 2), node)
+        self.assertIs(self.kore.get_node_by_coords(3, 2), node)
+        self.assertIsNone(self.kore.get_node_by_id("9,9"))
+        self.assertIsNone(self.kore.get_node_by_coords(6, 0))
+
+    def test_position_index_follows_rewritten_positions(self):
+        """After rewriting node positions (as the renderer does) reindex_positions() updates lookups."""
+        for row in self.kore.nodes:
+            for node in row:
+                node.position_x = node.position_x * 10 + 5
+                node.position_y = node.position_y * 10 + 5
+        self.kore.reindex_positions()
+        self.assertEqual(self.kore.get_node_by_position(35, 25).id, "3,2")
+        self.assertIsNone(self.kore.get_node_by_position(3, 2))
+
+    def test_move_updates_agent_registry(self):
+        """Moving an agent updates both the grid and the agent registry."""
+        self.ghost.stamina = 100
+        self.assertTrue(self.kore.move("1,1", "2,1", "G1"))
+        self.assertIs(self.kore.get_agent_node("G1"), self.kore.get_node_by_id("2,1"))
+        self.assertIn(self.ghost, self.kore.get_node_by_id("2,1").ghosts)
+        self.assertFalse(self.kore.move("1,1", "2,1", "G1"))  # no longer in origin
+
+    def test_move_rejects_missing_connection_and_stamina(self):
+        """Moves need a connection and enough stamina."""
+        self.assertFalse(self.kore.move("1,1", "3,1", "G1"))
+        self.ghost.stamina = 0
+        self.assertFalse(self.kore.move("1,1", "2,1", "G1"))
+
+    def test_move_without_graph_uses_connections(self):
+        """A map connected by hand, before rebuild_graph(), moves along its Connection objects."""
+        kore = Kore(3, 1)
+        kore.get_node_by_id("0,0").connections.append(Connection("0,0", "1,0", 4))
+        ghost = Ghost("G9", 0, 0)
+        ghost.stamina = 5
+        kore.add_agent(ghost, kore.get_node_by_id("0,0"))
+        self.assertIsNone(kore.graph)
+        self.assertFalse(kore.move("0,0", "2,0", "G9"))
+        self.assertTrue(kore.move("0,0", "1,0", "G9"))
+        self.assertEqual(ghost.stamina, 1)
+        self.assertIs(kore.get_agent_node("G9"), kore.get_node_by_id("1,0"))
+
+    def test_remove_agent(self):
+        """Removed agents disappear from the grid and the registry."""
+        self.assertIs(self.kore.remove_agent("G1"), self.ghost)
+        self.assertIsNone(self.kore.get_agent_by_id("G1"))
+        self.assertEqual(self.kore.get_node_by_id("1,1").ghosts, [])
+
+    def test_agents_placed_directly_are_found(self):
+        """Agents appended straight onto a node are picked up by an explicit reindex, not by a miss."""
+        late = Ghost("G2", 0, 0)
+        self.kore.get_node_by_id("0,0").ghosts.append(late)
+        self.assertIsNone(self.kore.get_agent_by_id("G2"))
+        self.kore.reindex_agents()
+        self.assertIs(self.kore.get_agent_by_id("G2"), late)
+        self.assertIs(self.kore.get_agent_by_id("S1"), self.sentinel)
+
+class TestLiveSummaries(unittest.TestCase):
+
+    def test_summaries_match_full_scan(self):
+        """Ghost/money node sets and sentinel memory stay equal to a rescan during a game."""
+        import simulation
+        from sentinel_method import perceive_world
+        rng = random.Random(12)
+        kore = simulation.build_kore(15, 10, rng)
+        simulation.testing_set(kore, rng)
+        sim = simulation.Simulation(kore, max_turns=15, seed=rng)
+        sentinel = next(s for row in kore.nodes for node in row for s in node.sentinels)
+        while not sim.finished:
+            sim.step()
+            all_nodes = [node for row in kore.nodes for node in row]
+            self.assertEqual(set(kore.ghost_nodes), {n.id for n in all_nodes if n.ghosts})
+            self.assertEqual(set(kore.money_nodes), {n.id for n in all_nodes if n.money > 0})
+            _, _, ghosts, money, unexplored = perceive_world(sentinel.id, kore)
+            self.assertEqual({n.id for n in ghosts}, {n.id for n in all_nodes if n.ghosts})
+            self.assertEqual({n.id for n in money}, {n.id for n in all_nodes if n.money > 0})
+            self.assertEqual({n.id for n in unexplored},
+                             {n.id for n in all_nodes if n.id not in sentinel.visited_nodes})
+            self.assertEqual(set(kore.ghost_index.items), set(kore.ghost_nodes))
+            self.assertEqual(set(kore.money_index.items), set(kore.money_nodes))
+
+class TestSpatialIndex(unittest.TestCase):
+
+    def test_nearest_matches_scan(self):
+        """Index answers equal a min() scan in grid order, ties included."""
+        from sentinel_method import find_best_target
+        from spatial_index import GridBuckets
+        rng = random.Random(5)
+        kore = Kore(40, 30)
+        index = GridBuckets(40, 30, bucket_size=4)
+        nodes = [node for row in kore.nodes for node in row]
+        chosen = rng.sample(nodes, 25)
+        for node in chosen:
+            index.add(node.id, *parse_node_id(node.id))
+        chosen = kore.grid_order(chosen)
+        for origin in rng.sample(nodes, 60):
+            expected = find_best_target(origin, chosen, [], [])
+            self.assertEqual(index.nearest(*parse_node_id(origin.id)), expected.id)
+            x, y = parse_node_id(origin.id)
+            by_distance = sorted(chosen, key=lambda n: (abs(parse_node_id(n.id)[0] - x) + abs(parse_node_id(n.id)[1] - y)))
+            self.assertEqual(index.k_nearest(x, y, 5), [n.id for n in by_distance[:5]])
+
+    def test_index_follows_moves(self):
+        """Moving a ghost and spending money update the indexes in place."""
+        random.seed(4)
+        kore = Kore(6, 6)
+        kore.create_connections()
+        ghost = Ghost("G1", 0, 0)
+        kore.add_agent(ghost, kore.get_node_by_id("0,0"))
+        kore.add_money(kore.get_node_by_id("5,5"), 10)
+        self.assertEqual(kore.ghost_index.nearest(5, 5), "0,0")
+        kore.move("0,0", "1,1", "G1")
+        self.assertEqual(list(kore.ghost_index.items), ["1,1"])
+        kore.add_money(kore.get_node_by_id("5,5"), -10)
+        self.assertIsNone(kore.money_index.nearest(0, 0))
+        node = kore.nearest_node(0, 0, lambda n: n.id == "3,2")
+        self.assertEqual(node.id, "3,2")
+
+class TestCompactKore(unittest.TestCase):
+
+    def setUp(self):
+        """Build the same seeded map with both backends."""
+        random.seed(11)
+        self.kore = Kore(5, 4)
+        self.kore.create_connections()
+        random.seed(11)
+        self.compact = Kore(5, 4, compact=True)
+        self.compact.create_connections()
+
+    def test_same_seed_same_edges(self):
+        """Both backends expose identical connections through the Node interface."""
+        for row_a, row_b in zip(self.kore.nodes, self.compact.nodes):
+            for node_a, node_b in zip(row_a, row_b):
+                edges_a = [(c.node_a, c.node_b, c.cost) for c in node_a.connections]
+                edges_b = [(c.node_a, c.node_b, c.cost) for c in node_b.connections]
+                self.assertEqual(edges_a, edges_b)
+
+    def test_graph_arrays(self):
+        """CSR arrays match the grid: corner nodes have 3 edges, inner nodes 8."""
+        graph = self.compact.graph
+        self.assertEqual(graph.num_edges(), sum(len(n.connections) for row in self.kore.nodes for n in row))
+        self.assertEqual(len(list(graph.neighbors(graph.index(0, 0)))), 3)
+        self.assertEqual(len(list(graph.neighbors(graph.index(2, 2)))), 8)
+        cost = graph.edge_cost(graph.index(0, 0), graph.index(1, 0))
+        self.assertEqual(cost, self.kore.get_node_by_id("0,0").connections[0].cost)
+
+    def test_money_and_occupancy_arrays(self):
+        """Money writes go to the arrays and agent moves update occupancy."""
+        node = self.compact.get_node_by_id("1,1")
+        node.money += 25
+        graph = self.compact.graph
+        self.assertEqual(graph.money[graph.index(1, 1)], 25)
+        ghost = Ghost("G1", 1, 1)
+        self.compact.add_agent(ghost, node)
+        self.assertEqual(graph.ghost_count[graph.index(1, 1)], 1)
+        self.assertTrue(self.compact.move("1,1", "2,1", "G1"))
+        self.assertEqual(graph.ghost_count[graph.index(1, 1)], 0)
+        self.assertEqual(graph.ghost_count[graph.index(2, 1)], 1)
+
+    def test_move_charges_graph_cost(self):
+        """Both backends charge the CSR edge cost, including one changed with set_edge_cost."""
+        for kore in (self.kore, self.compact):
+            graph = kore.graph
+            ghost = Ghost("G1", 1, 1)
+            ghost.stamina = 100
+            kore.add_agent(ghost, kore.get_node_by_id("1,1"))
+            cost = graph.edge_cost(graph.index(1, 1), graph.index(2, 1))
+            self.assertTrue(kore.move("1,1", "2,1", "G1"))
+            self.assertEqual(ghost.stamina, 100 - cost)
+            self.assertTrue(kore.set_edge_cost("2,1", "1,1", 7))
+            self.assertTrue(kore.move("2,1", "1,1", "G1"))
+            self.assertEqual(ghost.stamina, 100 - cost - 7)
+
+    def test_default_backend_money_array(self):
+        """On the default backend add_money keeps graph.money in step with the nodes."""
+        graph = self.kore.graph
+        node = self.kore.get_node_by_id("3,2")
+        self.kore.add_money(node, 40)
+        self.assertEqual(graph.money[graph.index(3, 2)], 40)
+        self.kore.add_money(node, -15)
+        self.assertEqual(graph.money[graph.index(3, 2)], 25)
+        node.money = 5
+        self.kore.reindex_money()
+        self.assertEqual(graph.money[graph.index(3, 2)], 5)
+
+def path_cost(kore, path):
+    total = 0
+    for a, b in zip(path, path[1:]):
+        total += next(c.cost for c in kore.get_node_by_id(a).connections if c.node_b == b)
+    return total
+
+class TestFingerprint(unittest.TestCase):
+
+    def build(self, seed, compact=False):
+        kore = Kore(6, 4, compact=compact)
+        kore.create_connections(random.Random(seed))
+        return kore
+
+    def test_same_seed_same_fingerprint(self):
+        """Seeded maps are reproducible and share a fingerprint across backends."""
+        self.assertEqual(self.build(1).fingerprint(), self.build(1).fingerprint())
+        self.assertEqual(self.build(1).fingerprint(), self.build(1, compact=True).fingerprint())
+        self.assertNotEqual(self.build(1).fingerprint(), self.build(2).fingerprint())
+
+    def test_cost_change_changes_fingerprint(self):
+        """Editing an edge cost gives a different map id."""
+        kore = self.build(1)
+        before = kore.fingerprint()
+        kore.set_edge_cost("0,0", "1,0", 99)
+        self.assertNotEqual(kore.fingerprint(), before)
+
+class TestDistanceCache(unittest.TestCase):
+
+    def setUp(self):
+        """Build a seeded map and its distance cache."""
+        random.seed(3)
+        self.kore = Kore(7, 5)
+        self.kore.create_connections()
+        self.cache = self.kore.get_path_cache()
+
+    def test_paths_are_shortest(self):
+        """Cached paths are valid, end at the goal and cost the tree distance."""
+        graph = self.kore.graph
+        for start, goal in [("0,0", "6,4"), ("3,2", "0,4"), ("6,0", "6,0")]:
+            path = self.cache.path_ids(start, goal)
+            self.assertEqual((path[0], path[-1]), (start, goal))
+            distance = self.cache.distance(graph.index_of(start), graph.index_of(goal))
+            self.assertEqual(path_cost(self.kore, path), distance)
+            forward = self.cache.tree_from(graph.index_of(start))[0][graph.index_of(goal)]
+            self.assertEqual(forward, distance)
+
+    def test_repeated_queries_hit_the_cache(self):
+        """Queries towards the same target reuse one tree."""
+        self.cache.path_ids("0,0", "6,4")
+        self.cache.path_ids("2,3", "6,4")
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 1))
+
+    def test_edge_cost_change_invalidates(self):
+        """Changing a cost drops cached trees and the new cost is used."""
+        path = self.cache.path_ids("0,0", "6,4")
+        self.assertTrue(self.kore.set_edge_cost(path[0], path[1], 1000))
+        self.assertEqual(len(self.cache.to_trees), 0)
+        self.assertNotEqual(self.cache.path_ids("0,0", "6,4")[:2], path[:2])
+
+    def test_capacity_follows_the_memory_budget(self):
+        """Small maps keep every tree; big ones keep as many as the byte budget allows."""
+        from path_cache import MEMORY_BUDGET, MIN_CAPACITY, TREE_BYTES_PER_NODE, default_capacity
+        self.assertEqual(self.cache.capacity, 35)
+        self.assertEqual(default_capacity(200 * 200), MEMORY_BUDGET // (TREE_BYTES_PER_NODE * 200 * 200))
+        self.assertEqual(default_capacity(10 ** 8), MIN_CAPACITY)
+
+if __name__ == '__main__':
+    unittest.main()
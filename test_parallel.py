@@ -0,0 +1,38 @@
+import random
+import unittest
+import simulation
+from Ghost import Ghost
+from parallel import ParallelDecider
+
+class TestSimultaneousMoves(unittest.TestCase):
+
+    def play(self, workers):
+        rng = random.Random(11)
+        kore = simulation.build_kore(30, 20, rng)
+        simulation.testing_set(kore, rng)
+        with ParallelDecider(workers) as decider:
+            sim = simulation.Simulation(kore, max_turns=20, seed=rng, decider=decider)
+            sim.run()
+        return sim
+
+    def test_pool_matches_inline_decisions(self):
+        """Commands and outcome do not depend on the number of worker processes."""
+        inline, pooled = self.play(1), self.play(2)
+        self.assertTrue(inline.commands)
+        self.assertEqual(inline.commands, pooled.commands)
+        self.assertEqual(inline.winner, pooled.winner)
+
+    def test_first_taker_wins_the_loot(self):
+        """Two ghosts taking the same loot: the first in order takes it, the second rests."""
+        kore = simulation.build_kore(5, 4, random.Random(1))
+        node = kore.get_node_by_id("1,1")
+        node.money = 3
+        for ghost_id in ("ghost_a", "ghost_b"):
+            kore.add_agent(Ghost(ghost_id, node.position_x, node.position_y), node)
+        applied = simulation.resolve_commands([("ghost_a", "take-3"), ("ghost_b", "take-3")], "ghost", kore)
+        self.assertEqual([command for _, _, command, _ in applied], ["take-3", "rest"])
+        self.assertEqual(kore.get_agent_by_id("ghost_a").money, 3)
+        self.assertEqual(kore.get_agent_by_id("ghost_b").money, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import random
+import unittest
+import simulation
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+CELL_WIDTH, CELL_HEIGHT = 64, 48
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestRenderer(unittest.TestCase):
+
+    def setUp(self):
+        """A seeded game laid out in pixel coordinates, as main.build_environment does."""
+        from renderer import Renderer
+        self.Renderer = Renderer
+        pygame.init()
+        self.font = pygame.font.SysFont(None, 24)
+        self.images = {}
+        for key in ["ghost", "sentinel", "deathghost", "greedysentinel", "money", "restingsentinel", "sleepingghost"]:
+            surface = pygame.Surface((CELL_WIDTH, CELL_HEIGHT))
+            surface.fill((len(key) * 20 % 256, 80, 160))
+            self.images[key] = surface
+        rng = random.Random(8)
+        self.kore = simulation.build_kore(8, 6, rng)
+        for row in self.kore.nodes:
+            for node in row:
+                col, layer = map(int, node.id.split(','))
+                node.position_x = col * CELL_WIDTH + CELL_WIDTH // 2
+                node.position_y = layer * CELL_HEIGHT + CELL_HEIGHT // 2
+        self.kore.reindex_positions()
+        simulation.testing_set(self.kore, rng)
+        self.sim = simulation.Simulation(self.kore, seed=rng)
+
+    def new_renderer(self):
+        return self.Renderer((8 * CELL_WIDTH, 6 * CELL_HEIGHT), self.kore, self.images,
+                             CELL_WIDTH, CELL_HEIGHT, self.font, 8, 6)
+
+    def test_incremental_frame_matches_full_redraw(self):
+        """After each turn, redrawing only changed cells gives the same picture."""
+        renderer = self.new_renderer()
+        self.sim.add_observer(renderer.update)
+        for _ in range(3):
+            self.sim.step()
+            expected = self.new_renderer().frame
+            self.assertEqual(pygame.image.tostring(renderer.frame, "RGB"),
+                             pygame.image.tostring(expected, "RGB"))
+
+    def test_only_changed_cells_are_redrawn(self):
+        """Nothing is redrawn when the state did not change."""
+        renderer = self.new_renderer()
+        self.assertEqual(renderer.update(), [])
+        self.kore.get_node_by_id("0,0").money += 5
+        self.assertEqual(renderer.update(), [(0, 0)])
+
+    def test_show_switches_to_a_restored_snapshot(self):
+        """Showing a snapshot of the game draws the same picture as the live map."""
+        from snapshot import Snapshot
+        renderer = self.new_renderer()
+        for _ in range(3):
+            self.sim.step()
+        renderer.show(Snapshot.of(self.kore).restore())
+        self.assertEqual(pygame.image.tostring(renderer.frame, "RGB"),
+                         pygame.image.tostring(self.new_renderer().frame, "RGB"))
+
+    def test_frame_matches_live_redraw(self):
+        """Showing the published Frame of each turn gives the same picture as a full redraw."""
+        from runner import Frame
+        renderer = self.new_renderer()
+        for _ in range(4):
+            self.sim.step()
+            renderer.show_frame(Frame.of(self.kore, self.sim.turn))
+            self.assertEqual(pygame.image.tostring(renderer.frame, "RGB"),
+                             pygame.image.tostring(self.new_renderer().frame, "RGB"))
+
+if __name__ == '__main__':
+    unittest.main()
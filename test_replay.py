@@ -0,0 +1,38 @@
+import os
+import random
+import tempfile
+import unittest
+import simulation
+from replay import ReplayRecorder, ReplayPlayer, zigzag, unzigzag
+
+def state(kore):
+    agents = sorted((a.id, kore.get_agent_node(a.id).id, a.stamina, a.money) for a, _ in kore.agent_index.values())
+    return agents, [node.money for row in kore.nodes for node in row]
+
+class TestReplay(unittest.TestCase):
+
+    def test_zigzag(self):
+        for value in (0, 1, -1, 5, -300):
+            self.assertEqual(unzigzag(zigzag(value)), value)
+
+    def test_seek_matches_live_game(self):
+        """Seeking to any turn, forwards or backwards, gives the state the live game had."""
+        rng = random.Random(1)
+        kore = simulation.build_kore(15, 10, rng)
+        simulation.testing_set(kore, rng)
+        sim = simulation.Simulation(kore, max_turns=40, seed=rng)
+        states = {0: state(kore)}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "game.replay")
+            recorder = ReplayRecorder(path, sim, seed=1, keyframe_every=4)
+            sim.add_observer(lambda s: states.__setitem__(s.turn - 1, state(s.kore)))
+            sim.run()
+            recorder.close()
+            player = ReplayPlayer(path)
+        self.assertEqual(player.seed, 1)
+        self.assertEqual(player.last_turn, sim.turn - 1)
+        for turn in [player.last_turn, 0, 5, 3, 9, 1, player.last_turn]:
+            self.assertEqual(state(player.seek(turn)), states[turn], turn)
+
+if __name__ == "__main__":
+    unittest.main()
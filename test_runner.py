@@ -0,0 +1,52 @@
+import random
+import time
+import unittest
+import simulation
+from runner import FrameBuffer, SimulationThread
+
+class TestSimulationThread(unittest.TestCase):
+
+    def new_simulation(self):
+        rng = random.Random(4)
+        kore = simulation.build_kore(15, 10, rng)
+        simulation.testing_set(kore, rng)
+        return simulation.Simulation(kore, max_turns=30, seed=rng)
+
+    def test_unthrottled_game_publishes_every_turn(self):
+        """Without a turn interval the game plays out and the last frame is the final state."""
+        sim = self.new_simulation()
+        thread = SimulationThread(sim, turn_interval=0)
+        thread.start()
+        thread.join(30)
+        self.assertTrue(thread.finished)
+        self.assertIsNotNone(sim.winner)
+        version, frame = thread.buffer.read()
+        self.assertGreater(version, 1)
+        self.assertEqual(frame.turn, sim.turn)
+        graph = sim.kore.graph
+        nodes = [node for row in sim.kore.nodes for node in row]
+        self.assertEqual(frame.loot, tuple((graph.index_of(node.id), node.money) for node in nodes if node.money > 0))
+        self.assertEqual(sorted(frame.ghosts),
+                         sorted((graph.index_of(node.id), g.state, g.stamina, g.money) for node in nodes for g in node.ghosts))
+
+    def test_stop_interrupts_the_turn_wait(self):
+        """A throttled thread stops without waiting out its interval."""
+        thread = SimulationThread(self.new_simulation(), turn_interval=60)
+        thread.start()
+        start = time.perf_counter()
+        thread.stop(5)
+        self.assertFalse(thread.is_alive())
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertEqual(thread.buffer.read()[1].turn, 1)
+
+    def test_buffer_skips_read_versions(self):
+        """Readers only get a frame when a newer one was published."""
+        buffer = FrameBuffer()
+        self.assertIsNone(buffer.read())
+        buffer.publish("a")
+        buffer.publish("b")
+        self.assertEqual(buffer.read(), (2, "b"))
+        self.assertIsNone(buffer.read(2))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -92,6 +92,19 @@ class TestSentinelLogic(unittest.TestCase):
         self.assertNotEqual(path, ["0,1", "1,1", "2,1", "3,1"]) # Should not be the straight path
         self.assertEqual(path[-1], "3,1") # Should still reach the goal
 
+    def test_a_star_updates_queued_nodes(self):
+        """Test A* keeps the cheaper route to a node that is already queued."""
+        print("TEST: A* algorithm replacing a worse queued route with a cheaper one")
+        node = self.kore.get_node_by_id("0,0")
+        node.connections = [c for c in node.connections if c.node_b != "1,0"]
+        node.connections.append(MockConnection("0,0", "1,0", 5))
+
+        start_node = self.kore.get_node_by_id("0,0")
+        goal_node = self.kore.get_node_by_id("2,0")
+        path = a_star_search(self.kore, start_node, goal_node)
+        self.assertEqual(path[1], "0,1") # The direct edge costs 5, going around costs 4
+        self.assertEqual(len(path), 5)
+
     def test_sentinel_turn_decision_move_to_ghost(self):
         """Test that the sentinel decides to move towards the closest ghost."""
         print("TEST: Check Sentinel decision move to ghost, should move to the closest ghost")
@@ -0,0 +1,209 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+import simulation
+import tournament
+from events import EventLog, JsonlSink, RingBufferSink, DEBUG, INFO, read_events
+from AgentState import AgentState
+from Ghost import Ghost
+from Sentinel import Sentinel
+
+class TestSimulation(unittest.TestCase):
+
+    def setUp(self):
+        """Build a seeded headless game with the standard testing set."""
+        random.seed(2)
+        self.kore = simulation.build_kore(15, 10)
+        simulation.testing_set(self.kore)
+        self.sim = simulation.Simulation(self.kore, max_turns=50)
+
+    def test_no_display_dependency(self):
+        """The engine runs without importing pygame."""
+        code = "import sys, simulation; sys.exit('pygame' in sys.modules)"
+        self.assertEqual(subprocess.run([sys.executable, "-c", code]).returncode, 0)
+
+    def test_step_advances_turn_and_notifies(self):
+        """Each step plays one turn and calls the observers."""
+        seen = []
+        self.sim.add_observer(lambda sim: seen.append(sim.turn))
+        self.sim.step()
+        self.sim.step()
+        self.assertEqual(seen, [2, 3])
+
+    def test_run_finishes_with_a_winner(self):
+        """A full game ends with a winner within max_turns."""
+        winner = self.sim.run()
+        self.assertIsNotNone(winner)
+        self.assertTrue(self.sim.finished)
+        self.assertLessEqual(self.sim.turn - 1, 50)
+
+    def test_run_respects_turn_budget(self):
+        """run(max_turns) stops after that many turns even if the game goes on."""
+        self.sim.run(max_turns=1)
+        self.assertEqual(self.sim.turn, 2)
+
+class TestSeededRuns(unittest.TestCase):
+
+    def play(self, seed):
+        rng = random.Random(seed)
+        kore = simulation.build_kore(15, 10, rng)
+        simulation.testing_set(kore, rng)
+        sim = simulation.Simulation(kore, max_turns=30, seed=rng)
+        random.seed()  # the global generator must not matter
+        sim.run()
+        return sim.result(), sorted(g.id for row in kore.nodes for node in row for g in node.ghosts)
+
+    def test_same_seed_same_game(self):
+        """A seed fully determines map, agents, replica ids and outcome."""
+        self.assertEqual(self.play(21), self.play(21))
+
+class TestCommands(unittest.TestCase):
+
+    def setUp(self):
+        """One ghost and one sentinel on a seeded map."""
+        random.seed(4)
+        self.kore = simulation.build_kore(5, 5)
+        self.ghost = Ghost("G1", 2, 2, money=20)
+        self.sentinel = Sentinel("S1", 2, 2)
+        self.kore.add_agent(self.ghost, self.kore.get_node_by_id("2,2"))
+        self.kore.add_agent(self.sentinel, self.kore.get_node_by_id("2,2"))
+
+    def test_move_down_left(self):
+        """The move-dl command produced by get_move_command is understood."""
+        simulation.command_processor("G1", "ghost", "move-dl", self.kore)
+        self.assertIs(self.kore.get_agent_node("G1"), self.kore.get_node_by_id("1,3"))
+
+    def test_replicate_splits_loot(self):
+        """Replication halves the loot and registers the replica."""
+        simulation.command_processor("G1", "ghost", "replicate", self.kore)
+        ghosts = self.kore.get_node_by_id("2,2").ghosts
+        self.assertEqual(len(ghosts), 2)
+        self.assertEqual(sum(g.money for g in ghosts), 20)
+        self.assertIs(self.kore.get_agent_by_id(ghosts[1].id), ghosts[1])
+
+    def test_capture(self):
+        """A capture removes the ghost and hands its loot to the sentinel."""
+        simulation.command_processor("S1", "sentinel", "capture", self.kore)
+        self.assertTrue(self.ghost.captured)
+        self.assertEqual(self.sentinel.money, 20)
+        self.assertIsNone(self.kore.get_agent_by_id("G1"))
+        self.assertIn("SENTINELS", simulation.check_game_over(self.kore, 1))
+
+    def test_capture_takes_every_ghost_on_the_node(self):
+        """All ghosts on the sentinel's node are captured; ghosts elsewhere are not."""
+        other = Ghost("G2", 2, 2, money=5)
+        away = Ghost("G3", 0, 0, money=7)
+        self.kore.add_agent(other, self.kore.get_node_by_id("2,2"))
+        self.kore.add_agent(away, self.kore.get_node_by_id("0,0"))
+        simulation.command_processor("S1", "sentinel", "capture", self.kore)
+        self.assertEqual(self.sentinel.money, 25)
+        self.assertEqual((self.ghost.money, other.money), (0, 0))
+        self.assertEqual(self.kore.get_node_by_id("2,2").ghosts, [])
+        self.assertIs(self.kore.get_agent_by_id("G3"), away)
+        self.assertFalse(away.captured)
+        self.assertIsNone(simulation.check_game_over(self.kore, 1))
+
+    def test_capture_on_empty_node_does_nothing(self):
+        """A capture with no ghost on the node changes nothing."""
+        self.kore.remove_agent("G1")
+        simulation.command_processor("S1", "sentinel", "capture", self.kore)
+        self.assertEqual(self.sentinel.money, 0)
+        self.assertIs(self.kore.get_agent_node("S1"), self.kore.get_node_by_id("2,2"))
+
+    def test_agent_state_fields(self):
+        """Agents carry a state enum and reject attributes they do not declare."""
+        self.sentinel.rest()
+        self.assertIs(self.sentinel.state, AgentState.RESTING)
+        self.assertTrue(self.sentinel.resting)
+        self.assertIs(self.ghost.state, AgentState.ACTIVE)
+        self.assertEqual(self.ghost.known_loot_nodes, set())
+        with self.assertRaises(AttributeError):
+            self.ghost.sleeping = True
+
+class TestEventLog(unittest.TestCase):
+
+    def play(self, log):
+        rng = random.Random(6)
+        kore = simulation.build_kore(15, 10, rng)
+        simulation.testing_set(kore, rng)
+        sim = simulation.Simulation(kore, max_turns=20, seed=rng, log=log)
+        sim.run()
+        return sim
+
+    def test_events_cover_the_game(self):
+        """Turns, moves and the game-over reason are recorded as events."""
+        ring = RingBufferSink()
+        sim = self.play(EventLog([ring], level=DEBUG))
+        kinds = {event["kind"] for event in ring.events}
+        self.assertTrue({"turn", "phase", "decision", "move", "game_over"} <= kinds)
+        game_over = ring.events[-1]
+        self.assertEqual(game_over["kind"], "game_over")
+        self.assertEqual(game_over["message"], sim.winner)
+        self.assertEqual(game_over["turn"], sim.turn - 1)
+
+    def test_level_filters_events(self):
+        """Debug events are skipped at INFO level."""
+        ring = RingBufferSink()
+        self.play(EventLog([ring], level=INFO))
+        self.assertNotIn("decision", {event["kind"] for event in ring.events})
+
+    def test_shared_null_log_untouched(self):
+        """Engines without a log play on a null log of their own, never the shared NULL_LOG."""
+        from events import NULL_LOG
+        sim = self.play(NULL_LOG)
+        self.assertIsNot(sim.log, NULL_LOG)
+        self.assertFalse(sim.log.enabled(simulation.WARNING))
+        self.assertEqual(NULL_LOG.turn, 0)
+
+    def test_jsonl_sink_round_trip(self):
+        """Batched JSON lines read back as the same events."""
+        ring = RingBufferSink()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.jsonl")
+            log = EventLog([ring, JsonlSink(path, batch_size=7)], level=DEBUG)
+            self.play(log)
+            log.close()
+            self.assertEqual(read_events(path), list(ring.events))
+
+class TestTournament(unittest.TestCase):
+
+    def test_same_seed_same_match(self):
+        """A match config fully determines its result."""
+        config = tournament.match_configs(1, seed=9)[0]
+        self.assertEqual(tournament.play_match(config), tournament.play_match(config))
+
+    def test_results_are_streamed_and_summarized(self):
+        """Every finished match is written to the results file and counted."""
+        configs = tournament.match_configs(3, seed=1, setup="test_agent", ghosts=2, sentinels=2, max_turns=30)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.jsonl")
+            results = tournament.run_tournament(configs, workers=2, output_path=path)
+            with open(path, encoding="utf-8") as f:
+                streamed = [json.loads(line) for line in f]
+        self.assertEqual(sorted(r["match"] for r in streamed), [0, 1, 2])
+        summary = tournament.summarize(results)
+        self.assertEqual(summary["matches"], 3)
+        self.assertAlmostEqual(sum(summary["win_rate"].values()), 1.0)
+
+    def test_failed_match_becomes_error_row(self):
+        """A match that raises is recorded with its error; the file is rewritten, not appended to."""
+        configs = tournament.match_configs(2, seed=1, setup="test_agent", max_turns=10)
+        with tempfile.TemporaryDirectory() as tmp:
+            configs[1].update(setup="snapshot", map_path=os.path.join(tmp, "missing.snap"))
+            path = os.path.join(tmp, "results.jsonl")
+            tournament.run_tournament(configs, workers=2, output_path=path)
+            results = tournament.run_tournament(configs, workers=2, output_path=path)
+            with open(path, encoding="utf-8") as f:
+                streamed = [json.loads(line) for line in f]
+        self.assertEqual(len(streamed), 2)
+        self.assertNotIn("error", results[0])
+        self.assertIn("FileNotFoundError", results[1]["error"])
+        summary = tournament.summarize(results)
+        self.assertEqual((summary["matches"], summary["errors"]), (1, 1))
+
+if __name__ == '__main__':
+    unittest.main()
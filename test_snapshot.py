@@ -0,0 +1,95 @@
+import os
+import random
+import tempfile
+import unittest
+import simulation
+import snapshot
+import tournament
+from kore import Kore
+from snapshot import Snapshot
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """A seeded testing_set game played for a few turns."""
+        rng = random.Random(9)
+        self.kore = simulation.build_kore(15, 10, rng)
+        simulation.testing_set(self.kore, rng)
+        simulation.Simulation(self.kore, max_turns=100, seed=rng).run(3)
+
+    def state(self, kore):
+        agents = sorted((a.id, kore.get_agent_node(a.id).id, a.stamina, a.money, a.state)
+                        for a, _ in kore.agent_index.values())
+        money = [(node.id, node.money) for row in kore.nodes for node in row]
+        return kore.fingerprint(), agents, money
+
+    def test_round_trip_continues_identically(self):
+        """A restored game has the same state and plays on exactly like the original."""
+        restored = Snapshot.from_bytes(Snapshot.of(self.kore).to_bytes()).restore()
+        self.assertEqual(self.state(restored), self.state(self.kore))
+        original = simulation.Simulation(self.kore, max_turns=100, seed=3)
+        copy = simulation.Simulation(restored, max_turns=100, seed=3)
+        original.run()
+        copy.run()
+        self.assertEqual(copy.result(), original.result())
+
+    def test_compact_file_round_trip(self):
+        """Compact maps survive a save/load through a file, agent states included."""
+        compact = Kore(12, 8, compact=True)
+        compact.create_connections(random.Random(1))
+        simulation.testing_set(compact, random.Random(1))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "game.snap")
+            snapshot.save(compact, path)
+            restored = snapshot.load(path)
+        self.assertTrue(restored.compact)
+        self.assertEqual(self.state(restored), self.state(compact))
+
+    def test_fork_is_independent(self):
+        """A fork shares topology and built trees but not agents, money or later cost edits."""
+        cache = self.kore.get_path_cache()
+        before = cache.tree_to(0)
+        child = snapshot.fork(self.kore)
+        self.assertTrue(child.graph.targets is self.kore.graph.targets)
+        self.assertIs(child.get_path_cache().tree_to(0), before)
+        simulation.Simulation(child, max_turns=100, seed=1).run(5)
+        self.assertNotEqual(self.state(child)[1:], self.state(self.kore)[1:])
+        child.set_edge_cost("0,0", "1,0", 10)
+        self.assertIs(cache.tree_to(0), before)
+
+    def test_cost_changes_stay_on_their_side(self):
+        """After a cost edit on either side, each Kore's distances follow its own costs."""
+        child = snapshot.fork(self.kore)
+        child.get_path_cache().tree_from(0)
+        graph = self.kore.graph
+        a, b = graph.index_of("0,0"), graph.index_of("1,0")
+        self.kore.set_edge_cost("0,0", "1,0", 1000)
+        child_cost = child.graph.edge_cost(a, b)
+        self.assertNotEqual(child_cost, 1000)
+        self.assertLessEqual(child.get_path_cache().tree_from(a)[0][b], child_cost)
+        self.assertEqual(child.get_path_cache().distance(a, b), child.get_path_cache().tree_from(a)[0][b])
+        self.assertLessEqual(self.kore.get_path_cache().tree_from(a)[0][b], 1000)
+        child.set_edge_cost("0,0", "1,0", 1)
+        self.assertEqual(child.get_path_cache().tree_from(a)[0][b], 1)
+        self.assertNotEqual(self.kore.get_path_cache().tree_from(a)[0][b], 1)
+
+    def test_tournament_from_snapshot(self):
+        """Matches can start from a shared snapshot file, agents included."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "map.snap")
+            snapshot.save(self.kore, path)
+            config = tournament.match_configs(1, seed=4, setup="snapshot", map_path=path)[0]
+            result = tournament.play_match(config)
+        self.assertEqual(result["map"], self.kore.fingerprint())
+
+    def test_invalid_setups_are_rejected(self):
+        """Unconnected maps cannot be snapshotted; snapshot setups need a map and vice versa."""
+        with self.assertRaises(ValueError):
+            Snapshot.of(Kore(4, 3))
+        with self.assertRaises(ValueError):
+            tournament.match_configs(1, setup="snapshot")
+        with self.assertRaises(ValueError):
+            tournament.match_configs(1, setup="testing_set", map_path="map.snap")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import random
+import unittest
+from kore import Kore
+from path_cache import dijkstra
+
+class TestVisibility(unittest.TestCase):
+
+    def setUp(self):
+        """Seeded 12x8 map with money on one node."""
+        self.kore = Kore(12, 8)
+        self.kore.create_connections(random.Random(3))
+        self.kore.add_money(self.kore.get_node_by_id("5,4"), 7)
+
+    def test_budget_matches_dijkstra(self):
+        """A cost budget sees exactly the nodes whose shortest path fits in it."""
+        graph = self.kore.graph
+        dist, _ = dijkstra(graph, [graph.index_of("4,4")])
+        views = self.kore.visible("4,4", budget=6)
+        expected = [(graph.ids[i], d) for i, d in enumerate(dist) if d <= 6]
+        self.assertEqual([(view.id, view.cost) for view in views], expected)
+
+    def test_hops_and_live_views(self):
+        """One hop sees the 8-neighbourhood plus the node itself, through views of the live nodes."""
+        views = self.kore.visible("4,4", hops=1)
+        self.assertEqual(len(views), 9)
+        money = next(view for view in views if view.id == "5,4")
+        self.assertEqual(money.money, 7)
+        self.assertIs(money.node, self.kore.get_node_by_id("5,4"))
+        self.assertIsInstance(money.ghosts, tuple)
+        self.assertEqual([view.id for view in self.kore.visible("4,4")], [view.id for view in views])
+        with self.assertRaises(ValueError):
+            self.kore.visible("4,4", hops=1, budget=3)
+
+    def test_batch_searches_each_node_once(self):
+        """Agents on the same node share one search, and later turns reuse it until costs change."""
+        areas = self.kore.visible_batch(["1,1", "1,1", "6,2"], hops=2)
+        self.assertEqual([view.id for view in areas[0]], [view.id for view in areas[1]])
+        visibility = self.kore.get_visibility()
+        self.assertEqual((visibility.hits, visibility.misses), (0, 2))
+        self.kore.visible("6,2", hops=2)
+        self.assertEqual(visibility.hits, 1)
+        self.kore.set_edge_cost("0,0", "1,0", 9)
+        self.assertIsNot(self.kore.get_visibility(), visibility)
+
+    def test_get_position_fogs_expensive_neighbours(self):
+        """Neighbours behind an edge dearer than the limit show their position but no contents."""
+        views = {view.id: view for view in self.kore.get_position("4,4", 0)}
+        self.assertEqual(len(views), 8)
+        self.assertFalse(views["5,4"].visible)
+        self.assertEqual(views["5,4"].money, 0)
+        views = {view.id: view for view in self.kore.get_position("4,4", 10)}
+        self.assertEqual(views["5,4"].money, 7)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import snapshot
+from seeding import make_rng
+from ghost_method import ghost_turn
+from ghost_mcts import MCTSPlanner
+from simulation import Simulation, build_kore, testing_set, test_agent
+
+def match_configs(matches, seed=0, grid_cols=15, grid_rows=10, setup="testing_set",
+                  ghosts=1, sentinels=1, max_turns=100, map_path=None, ghost_policy="rules", budget_ms=50,
+                  decision_budget_ms=None, phase_budget_ms=None):
+    """
+    One config per match; match i uses seed + i so every match can be replayed alone.
+    With map_path every match starts from that snapshot file instead of a new map.
+    ghost_policy is "rules" (ghost_turn) or "mcts" with budget_ms per ghost decision.
+    decision_budget_ms and phase_budget_ms are the engine's deadlines (see Simulation).
+    Setup "snapshot" and map_path go together: a stored map brings its own
+    agents, and other setups would add theirs on top.
+    """
+    check_setup(setup, map_path)
+    return [
+        {
+            "match": i,
+            "seed": seed + i,
+            "grid_cols": grid_cols,
+            "grid_rows": grid_rows,
+            "setup": setup,
+            "ghosts": ghosts,
+            "sentinels": sentinels,
+            "max_turns": max_turns,
+            "map_path": map_path,
+            "ghost_policy": ghost_policy,
+            "budget_ms": budget_ms,
+            "decision_budget_ms": decision_budget_ms,
+            "phase_budget_ms": phase_budget_ms,
+        }
+        for i in range(matches)
+    ]
+
+def check_setup(setup, map_path):
+    if setup == "snapshot" and not map_path:
+        raise ValueError("Setup 'snapshot' needs a map file")
+    if map_path and setup != "snapshot":
+        raise ValueError(f"A map file keeps its stored agents; use setup 'snapshot' instead of '{setup}'")
+
+def play_match(config):
+    """
+    Plays one headless match and returns its config merged with Simulation.result().
+    Runs in a worker process, so it only takes and returns plain data.
+    """
+    rng = make_rng(config["seed"])
+    if config.get("map_path"):
+        kore = snapshot.load(config["map_path"])
+    else:
+        kore = build_kore(config["grid_cols"], config["grid_rows"], rng)
+    # With setup "snapshot" the agents come with the map
+    if config["setup"] == "testing_set":
+        testing_set(kore, rng)
+    elif config["setup"] == "test_agent":
+        test_agent(kore, "ghost", config["ghosts"], rng)
+        test_agent(kore, "sentinel", config["sentinels"], rng)
+    ghost_policy = ghost_turn
+    if config.get("ghost_policy") == "mcts":
+        ghost_policy = MCTSPlanner(config["budget_ms"], seed=config["seed"])
+    simulation = Simulation(kore, max_turns=config["max_turns"], seed=rng, ghost_policy=ghost_policy,
+                            decision_budget_ms=config.get("decision_budget_ms"),
+                            phase_budget_ms=config.get("phase_budget_ms"))
+    simulation.run()
+    result = dict(config)
+    result.update(simulation.result())
+    result["overruns"] = simulation.metrics.overruns
+    return result
+
+def summarize(results):
+    """
+    Aggregates win rates, turns to finish and loot totals over finished matches;
+    matches that failed (rows with an "error") are only counted.
+    """
+    errors = sum(1 for result in results if "error" in result)
+    results = [result for result in results if "error" not in result]
+    count = len(results)
+    if not count:
+        return {"matches": 0, "errors": errors}
+    wins = {"ghosts": 0, "sentinels": 0, "draw": 0}
+    for result in results:
+        wins[result["winner"]] = wins.get(result["winner"], 0) + 1
+    return {
+        "matches": count,
+        "errors": errors,
+        "win_rate": {side: wins[side] / count for side in wins},
+        "mean_turns": sum(r["turns"] for r in results) / count,
+        "mean_loot_recovered": sum(r["loot_recovered"] for r in results) / count,
+        "mean_loot_secured": sum(r["loot_secured"] for r in results) / count,
+        "overruns": sum(r.get("overruns", 0) for r in results),
+    }
+
+def run_tournament(configs, workers=None, output_path=None):
+    """
+    Fans the matches out over a process pool. Each result is written to
+    output_path (JSON lines, replaced on every run) as soon as its match
+    finishes. A match that raises becomes its config plus an "error" field,
+    so one bad match does not lose the others.
+    """
+    results = []
+    output = open(output_path, "w", encoding="utf-8") if output_path else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(play_match, config): config for config in configs}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as error:
+                    result = dict(futures[future])
+                    result["error"] = repr(error)
+                results.append(result)
+                if output:
+                    output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    output.flush()
+    finally:
+        if output:
+            output.close()
+    results.sort(key=lambda r: r["match"])
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many seeded headless GhostGrid matches in parallel.")
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cols", type=int, default=15)
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--setup", choices=["testing_set", "test_agent", "snapshot"], default="testing_set",
+                        help="'snapshot' keeps the agents stored in --map")
+    parser.add_argument("--map", help="start every match from this snapshot file (see snapshot.save)")
+    parser.add_argument("--ghosts", type=int, default=1, help="ghosts per match with --setup test_agent")
+    parser.add_argument("--sentinels", type=int, default=1, help="sentinels per match with --setup test_agent")
+    parser.add_argument("--max-turns", type=int, default=100)
+    parser.add_argument("--ghost-policy", choices=["rules", "mcts"], default="rules")
+    parser.add_argument("--budget-ms", type=int, default=50, help="MCTS time per ghost decision")
+    parser.add_argument("--decision-budget-ms", type=float, help="deadline for every agent decision")
+    parser.add_argument("--phase-budget-ms", type=float, help="deadline for each ghost or sentinel phase")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="tournament_results.jsonl")
+    args = parser.parse_args()
+    try:
+        check_setup(args.setup, args.map)
+    except ValueError as error:
+        parser.error(str(error))
+
+    configs = match_configs(args.matches, args.seed, args.cols, args.rows, args.setup,
+                            args.ghosts, args.sentinels, args.max_turns, args.map,
+                            args.ghost_policy, args.budget_ms, args.decision_budget_ms, args.phase_budget_ms)
+    results = run_tournament(configs, args.workers, args.out)
+    print(json.dumps(summarize(results), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import heapq
+from collections import OrderedDict
+
+# Visible areas kept per Kore before the least recently used are dropped
+DEFAULT_CAPACITY = 4096
+# Radius in edges when a query gives neither hops nor a cost budget
+DEFAULT_HOPS = 1
+
+class CellView:
+    """
+    Read-only view of a node as an agent sees it. Position is always known;
+    money and agents only when the node is visible (fog of war hides them
+    otherwise). The view itself copies nothing, but every read of ghosts or
+    sentinels builds a new tuple, so the world cannot be changed through a
+    view; read them once per view in hot loops.
+    """
+    __slots__ = ("node", "cost", "visible")
+
+    def __init__(self, node, cost, visible=True):
+        self.node = node
+        self.cost = cost
+        self.visible = visible
+
+    @property
+    def id(self):
+        return self.node.id
+
+    @property
+    def position_x(self):
+        return self.node.position_x
+
+    @property
+    def position_y(self):
+        return self.node.position_y
+
+    @property
+    def money(self):
+        return self.node.money if self.visible else 0
+
+    @property
+    def ghosts(self):
+        return tuple(self.node.ghosts) if self.visible else ()
+
+    @property
+    def sentinels(self):
+        return tuple(self.node.sentinels) if self.visible else ()
+
+    def __repr__(self):
+        return f"CellView(id={self.id}, cost={self.cost}, visible={self.visible})"
+
+def within_hops(graph, source, hops):
+    """(index, hops) of every node at most hops edges away from source, source included."""
+    offsets, targets = graph.offsets, graph.targets
+    seen = {source: 0}
+    frontier = [source]
+    for depth in range(1, hops + 1):
+        reached = []
+        for u in frontier:
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if v not in seen:
+                    seen[v] = depth
+                    reached.append(v)
+        frontier = reached
+    return tuple(sorted(seen.items()))
+
+def within_cost(graph, source, budget):
+    """
+    (index, cost) of every node whose cheapest path from source costs at
+    most budget: a Dijkstra that stops expanding past the budget.
+    """
+    offsets, targets, costs = graph.offsets, graph.targets, graph.costs
+    dist = {source: 0}
+    heap = [(0, source)]
+    heappop, heappush = heapq.heappop, heapq.heappush
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue  # stale entry
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            nd = d + costs[i]
+            if nd <= budget and nd < dist.get(v, nd + 1):
+                dist[v] = nd
+                heappush(heap, (nd, v))
+    return tuple(sorted(dist.items()))
+
+class Visibility:
+    """
+    Visible areas over a CompactGraph as (index, cost) tuples sorted by
+    index, for a radius of hops or a cost budget. Areas depend only on the
+    topology and edge costs, so they are kept in LRU order and reused every
+    turn until the Kore drops this object on a cost change.
+    """
+    def __init__(self, graph, capacity=DEFAULT_CAPACITY):
+        self.graph = graph
+        self.capacity = capacity
+        self.areas = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def area(self, source, hops=None, budget=None):
+        """Area seen from source; DEFAULT_HOPS edges when neither hops nor budget is given."""
+        if hops is not None and budget is not None:
+            raise ValueError("Give either hops or budget, not both")
+        if budget is None and hops is None:
+            hops = DEFAULT_HOPS
+        key = (source, hops, budget)
+        area = self.areas.get(key)
+        if area is not None:
+            self.areas.move_to_end(key)
+            self.hits += 1
+            return area
+        self.misses += 1
+        if hops is not None:
+            area = within_hops(self.graph, source, hops)
+        else:
+            area = within_cost(self.graph, source, budget)
+        self.areas[key] = area
+        if len(self.areas) > self.capacity:
+            self.areas.popitem(last=False)
+        return area
+
+    def batch(self, sources, hops=None, budget=None):
+        """Areas for many sources at once; agents sharing a node share one search."""
+        done = {}
+        for source in sources:
+            if source not in done:
+                done[source] = self.area(source, hops, budget)
+        return [done[source] for source in sources]